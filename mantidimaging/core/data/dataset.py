@@ -2,10 +2,12 @@
 # SPDX - License - Identifier: GPL-3.0-or-later
 from __future__ import annotations
 import uuid
+import weakref
 
 import numpy as np
 
 from mantidimaging.core.data.imagestack import StackNotFoundError, ImageStack
+from mantidimaging.core.operation_history import const
 from mantidimaging.core.data.reconlist import ReconList
 from mantidimaging.core.utility.data_containers import FILE_TYPES
 
@@ -42,6 +44,7 @@ class Dataset:
         self._sinograms: ImageStack | None = None
         stacks = [] if stacks is None else stacks
         self._stacks: list[ImageStack] = stacks
+        self._combined_images: dict[tuple[uuid.UUID, str], tuple[weakref.ref, int, np.ndarray]] = {}
 
         self.sample = sample
         self.flat_before = flat_before
@@ -72,7 +75,37 @@ class Dataset:
         ]
         return self.recons.stacks + self._stacks + remove_nones(named_stacks)
 
+    def get_combined_image(self, stack: ImageStack, mode: str) -> np.ndarray | None:
+        """
+        Get a cached combination of the images of a stack, such as the flat field reference made from a flat stack.
+
+        :param stack: The stack the image was combined from
+        :param mode: How the images were combined
+        :return: The combined image, or None if it has not been cached or the stack has changed since
+        """
+        cached = self._combined_images.get((stack.id, mode))
+        if cached is None:
+            return None
+        shared_array_ref, num_operations, image = cached
+        # Operations record themselves in the history, and replacing the data replaces the shared array
+        if shared_array_ref() is not stack.shared_array or num_operations != _num_operations(stack):
+            del self._combined_images[(stack.id, mode)]
+            return None
+        return image
+
+    def set_combined_image(self, stack: ImageStack, mode: str, image: np.ndarray) -> None:
+        """
+        Cache a combination of the images of a stack, until the stack changes or is deleted.
+
+        :param stack: The stack the image was combined from
+        :param mode: How the images were combined
+        :param image: The combined image, which must not be modified afterwards
+        """
+        self._combined_images[(stack.id, mode)] = (weakref.ref(stack.shared_array), _num_operations(stack), image)
+
     def delete_stack(self, images_id: uuid.UUID) -> None:
+        for key in [key for key in self._combined_images if key[0] == images_id]:
+            del self._combined_images[key]
         if isinstance(self.sample, ImageStack) and self.sample.id == images_id:
             self.sample = None
         elif isinstance(self.flat_before, ImageStack) and self.flat_before.id == images_id:
@@ -201,6 +234,10 @@ class Dataset:
         return False
 
 
+def _num_operations(stack: ImageStack) -> int:
+    return len(stack.metadata.get(const.OPERATION_HISTORY, []))
+
+
 def _get_stack_data_type(stack_id: uuid.UUID, dataset: Dataset) -> str:
     """
     Find the data type as a string of a stack.
@@ -18,6 +18,7 @@ from mantidimaging.core.data.utility import mark_cropped
 from mantidimaging.core.operation_history import const
 from mantidimaging.core.parallel import utility as pu
 from mantidimaging.core.utility.data_containers import ProjectionAngles, Counts, Indices
+from mantidimaging.core.utility.progress_reporting import Progress
 from mantidimaging.core.utility.sensible_roi import SensibleROI
 from mantidimaging.core.utility.leak_tracker import leak_tracker
 
@@ -323,6 +324,48 @@ class ImageStack:
     def dtype(self) -> np.dtype:
         return self.data.dtype
 
+    @property
+    def is_compact(self) -> bool:
+        """
+        True if the data is still stored in the integer type it was loaded with
+        """
+        return not np.issubdtype(self.dtype, np.floating)
+
+    def promote_to_float(self, dtype: npt.DTypeLike = np.float32, progress: Progress | None = None) -> None:
+        """
+        Convert compact integer data to floating point, one projection at a time so the only extra memory needed is
+        the new array. Does nothing if the data is already floating point.
+        """
+        if not self.is_compact:
+            return
+        self._copy_to_new_array(dtype, "Converting to float", progress)
+
+    @property
+    def is_read_only(self) -> bool:
+        """
+        True if the data is a read-only memory map of the file it was loaded from
+        """
+        return not self.data.flags.writeable
+
+    def make_writable(self, progress: Progress | None = None) -> None:
+        """
+        Copy read-only memory-mapped data into shared memory, so that operations can modify it. Does nothing if the
+        data is already writable.
+        """
+        if not self.is_read_only:
+            return
+        self._copy_to_new_array(self.dtype, "Copying into memory", progress)
+
+    def _copy_to_new_array(self, dtype: npt.DTypeLike, task_name: str, progress: Progress | None) -> None:
+        progress = Progress.ensure_instance(progress, num_steps=self.num_images, task_name=task_name)
+        copied = pu.create_array(self.shape, dtype)
+        with progress:
+            for i in range(self.num_images):
+                copied.array[i] = self.data[i]
+                progress.update(msg=task_name)
+        LOG.info(f"Copied {self.name} from {self.dtype} to {copied.array.dtype}")
+        self.shared_array = copied
+
     @staticmethod
     def create_empty_image_stack(shape: tuple[int, ...], dtype: npt.DTypeLike, metadata: dict[str, Any]) -> ImageStack:
         arr = pu.create_array(shape, dtype)
@@ -463,6 +506,7 @@ class ImageStack:
         self.geometry.set_panel(num_pixels=num_pixels, pixel_size=pixel_size)
 
     def reorder_images_by_index(self, index: np.ndarray) -> None:
+        self.make_writable()
         n, *m = self.data.shape
         been_there = np.zeros(n, bool)
         keep = np.empty(m, self.data.dtype)
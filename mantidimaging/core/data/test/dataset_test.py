@@ -268,3 +268,41 @@ class DatasetTest(unittest.TestCase):
     def test_processed_is_false(self):
         ds = Dataset(sample=generate_images())
         self.assertFalse(ds.is_processed)
+
+    def test_combined_image_cached(self):
+        flat = generate_images()
+        ds = Dataset(sample=generate_images(), flat_before=flat)
+        combined = np.ones(flat.shape[1:])
+
+        self.assertIsNone(ds.get_combined_image(flat, "Median"))
+        ds.set_combined_image(flat, "Median", combined)
+
+        self.assertIs(ds.get_combined_image(flat, "Median"), combined)
+        self.assertIsNone(ds.get_combined_image(flat, "Mean"))
+
+    def test_combined_image_invalidated_by_operation(self):
+        flat = generate_images()
+        ds = Dataset(sample=generate_images(), flat_before=flat)
+        ds.set_combined_image(flat, "Median", np.ones(flat.shape[1:]))
+
+        flat.record_operation("", "")
+
+        self.assertIsNone(ds.get_combined_image(flat, "Median"))
+
+    def test_combined_image_invalidated_by_new_data(self):
+        flat = generate_images()
+        ds = Dataset(sample=generate_images(), flat_before=flat)
+        ds.set_combined_image(flat, "Median", np.ones(flat.shape[1:]))
+
+        flat.data = np.zeros(flat.shape, dtype=np.float32)
+
+        self.assertIsNone(ds.get_combined_image(flat, "Median"))
+
+    def test_combined_image_removed_with_stack(self):
+        flat = generate_images()
+        ds = Dataset(sample=generate_images(), flat_before=flat)
+        ds.set_combined_image(flat, "Median", np.ones(flat.shape[1:]))
+
+        ds.delete_stack(flat.id)
+
+        self.assertEqual(ds._combined_images, {})
@@ -18,6 +18,8 @@ from mantidimaging.core.data import ImageStack
 from mantidimaging.core.data.test.fake_logfile import generate_csv_logfile, generate_txt_logfile
 from mantidimaging.core.operations.crop_coords import CropCoordinatesFilter
 from mantidimaging.core.operation_history import const
+from mantidimaging.core.parallel import utility as pu
+from mantidimaging.core.utility.progress_reporting import Progress
 from mantidimaging.core.utility.sensible_roi import SensibleROI
 from mantidimaging.test_helpers.unit_test_helper import generate_images, generate_angles, generate_images_with_geometry
 
@@ -162,8 +164,8 @@ class ImageStackTest(unittest.TestCase):
         self.assertFalse(images.has_proj180deg())
 
     def test_data_set(self):
-        data = generate_images().data
-        images = ImageStack(data=data)
+        source = generate_images()
+        images = ImageStack(data=source.data)
         test_angles = generate_angles(360, images.num_projections)
         images.create_geometry(test_angles)
 
@@ -376,3 +378,51 @@ class ImageStackTest(unittest.TestCase):
         init_vals.sort()
         npt.assert_array_equal(images.data[:, 1, 1], init_vals)
         npt.assert_array_equal(images.data.shape, data.shape)
+
+    def test_promote_to_float(self):
+        data = np.arange(24, dtype=np.uint16).reshape((2, 3, 4))
+        images = ImageStack(data)
+        self.assertTrue(images.is_compact)
+        progress = Progress()
+
+        images.promote_to_float(progress=progress)
+
+        self.assertFalse(images.is_compact)
+        self.assertEqual(images.dtype, np.float32)
+        self.assertTrue(images.uses_shared_memory)
+        npt.assert_array_equal(images.data, data)
+        self.assertTrue(progress.complete)
+
+    def test_make_writable(self):
+        data = np.arange(24, dtype=np.uint16).reshape((2, 3, 4))
+        read_only = data.view()
+        read_only.flags.writeable = False
+        images = ImageStack(pu.SharedArray(read_only, None, free_mem_on_del=False))
+        self.assertTrue(images.is_read_only)
+
+        images.make_writable()
+
+        self.assertFalse(images.is_read_only)
+        self.assertEqual(images.dtype, np.uint16)
+        self.assertTrue(images.uses_shared_memory)
+        npt.assert_array_equal(images.data, data)
+
+    def test_reorder_read_only_images(self):
+        data = np.arange(24, dtype=np.float32).reshape((3, 2, 4))
+        read_only = data.copy()
+        read_only.flags.writeable = False
+        images = ImageStack(pu.SharedArray(read_only, None, free_mem_on_del=False))
+
+        images.reorder_images_by_index(np.array([2, 0, 1]))
+
+        npt.assert_array_equal(images.data, data[[2, 0, 1]])
+        npt.assert_array_equal(read_only, data)
+
+    def test_promote_to_float_does_nothing_for_float_data(self):
+        images = generate_images()
+        shared_array = images.shared_array
+
+        images.promote_to_float(np.float64)
+
+        self.assertIs(images.shared_array, shared_array)
+        self.assertEqual(images.dtype, np.float32)
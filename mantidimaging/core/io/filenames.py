@@ -2,9 +2,12 @@
 # SPDX - License - Identifier: GPL-3.0-or-later
 from __future__ import annotations
 
+import fnmatch
 import os
+from collections import OrderedDict
 from pathlib import Path
 import re
+import time
 from typing import Final
 from collections.abc import Iterator
 from logging import getLogger
@@ -15,6 +18,110 @@ LOG = getLogger(__name__)
 
 IMAGE_FORMAT_EXTENSIONS: Final = ['fits', 'fit', 'tif', 'tiff']
 
+# A directory changed this recently may be changed again without its modification time moving on, as the time has a
+# limited resolution on some file systems. Indexes of such directories are not reused.
+RACY_MTIME_NS: Final = 2_000_000_000
+# Number of directory indexes kept, the least recently used are dropped first
+DIRECTORY_INDEX_CACHE_SIZE: Final = 64
+
+
+class DirectoryIndex:
+    """
+    Names of the entries in a directory, read in one pass with os.scandir
+
+    Indexes are cached and shared by all lookups in the same directory, and read again when the modification time of
+    the directory changes. Only the DIRECTORY_INDEX_CACHE_SIZE most recently used indexes are kept. The file names
+    are also kept as one newline separated string, so that a pattern can be matched against all of them in a single
+    regex search.
+    """
+    _cache: OrderedDict[Path, DirectoryIndex] = OrderedDict()
+
+    def __init__(self, directory: Path, mtime_ns: int, scanned_ns: int, file_names: list[str], dir_names: list[str]):
+        self.directory = directory
+        self.mtime_ns = mtime_ns
+        self.scanned_ns = scanned_ns
+        self.file_names = file_names
+        self.dir_names = dir_names
+        self.joined_file_names = "\n".join(file_names)
+        self._file_name_set = set(file_names)
+        self._dir_name_set = set(dir_names)
+        self._names = self._file_name_set | self._dir_name_set
+        # Reversed so that the first of several names which only differ by case is kept
+        self._files_by_casefold = {name.casefold(): name for name in reversed(file_names)}
+        self._dirs_by_casefold = {name.casefold(): name for name in reversed(dir_names)}
+
+    @classmethod
+    def get(cls, directory: Path) -> DirectoryIndex:
+        mtime_ns = directory.stat().st_mtime_ns
+        index = cls._cache.get(directory)
+        if index is None or index.mtime_ns != mtime_ns or index.scanned_ns - mtime_ns < RACY_MTIME_NS:
+            index = cls._scan(directory, mtime_ns)
+            cls._cache[directory] = index
+            if len(cls._cache) > DIRECTORY_INDEX_CACHE_SIZE:
+                cls._cache.popitem(last=False)
+        cls._cache.move_to_end(directory)
+        return index
+
+    @classmethod
+    def _scan(cls, directory: Path, mtime_ns: int) -> DirectoryIndex:
+        scanned_ns = time.time_ns()
+        file_names = []
+        dir_names = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if "\n" in entry.name:
+                    # Would break matching against the joined names
+                    LOG.debug(f"Skipping file with a newline in its name: {entry.name!r}")
+                elif entry.is_dir():
+                    dir_names.append(entry.name)
+                else:
+                    file_names.append(entry.name)
+        file_names.sort()
+        dir_names.sort()
+        LOG.debug(f"Indexed {directory}: {len(file_names)} files, {len(dir_names)} directories")
+        return cls(directory, mtime_ns, scanned_ns, file_names, dir_names)
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        cls._cache.clear()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._names
+
+    def has_dir(self, name: str) -> bool:
+        """
+        Case insensitive check for a subdirectory, like Path.exists on Windows and macOS
+        """
+        return self.find_dir(name) is not None
+
+    def find_dir(self, name: str) -> Path | None:
+        """
+        Find a subdirectory by case insensitive name, preferring an exact match
+
+        :return: The path of the subdirectory with the capitalisation it has on disk, or None if there is none
+        """
+        return self._find(name, self._dir_name_set, self._dirs_by_casefold)
+
+    def find_file(self, name: str) -> Path | None:
+        """
+        Find a file by case insensitive name, preferring an exact match
+
+        :return: The path of the file with the capitalisation it has on disk, or None if there is none
+        """
+        return self._find(name, self._file_name_set, self._files_by_casefold)
+
+    def _find(self, name: str, names: set[str], names_by_casefold: dict[str, str]) -> Path | None:
+        found = name if name in names else names_by_casefold.get(name.casefold())
+        return None if found is None else self.directory / found
+
+    def glob(self, pattern: str) -> list[Path]:
+        """
+        Case insensitive match of the entries against a shell style pattern, like
+        Path.glob(pattern, case_sensitive=False) for a pattern without directories
+        """
+        regex = re.compile(fnmatch.translate(pattern), re.IGNORECASE)
+        return [self.directory / name for name in self.file_names + self.dir_names if regex.match(name)]
+
 
 class FilenamePattern:
     """
@@ -32,14 +139,16 @@ class FilenamePattern:
         self.digit_count = digit_count
         self.suffix = suffix
 
+        # Patterns are multiline, so they can be matched against a newline separated list of file names
         if digit_count == 0:
-            self.re_pattern = re.compile("^" + re.escape(prefix) + re.escape(suffix) + "$")
+            self.re_pattern = re.compile("^" + re.escape(prefix) + re.escape(suffix) + "$", re.MULTILINE)
         else:
             # Note: allow extra leading digits, for data sets that go 001 ... 998, 999, 1000, 1001
-            self.re_pattern = re.compile("^" + re.escape(prefix) + "(([1-9][0-9]*)?[0-9]{" + str(digit_count) + "})" +
-                                         re.escape(suffix) + "$")
+            self.re_pattern = re.compile(
+                "^" + re.escape(prefix) + "(([1-9][0-9]*)?[0-9]{" + str(digit_count) + "})" + re.escape(suffix) + "$",
+                re.MULTILINE)
 
-        self.re_pattern_metadata = re.compile("^" + re.escape(prefix.rstrip("_ ")) + ".json$")
+        self.re_pattern_metadata = re.compile("^" + re.escape(prefix.rstrip("_ ")) + ".json$", re.MULTILINE)
         self.template = prefix + "{:0" + str(digit_count) + "d}" + suffix
 
     @classmethod
@@ -70,13 +179,28 @@ class FilenamePattern:
         result = self.re_pattern.match(filename)
         if result is None:
             raise ValueError(f"Filename ({filename}) does not match pattern: {self.re_pattern}")
+        return self._index_from_match(result)
+
+    def _index_from_match(self, result: re.Match) -> int:
         if self.digit_count == 0:
             return 0
         return int(result.group(1))
 
+    def find_indexes(self, filenames: str) -> list[int]:
+        """
+        Find the indexes of all the matching names in a newline separated list of file names
+        """
+        return [self._index_from_match(result) for result in self.re_pattern.finditer(filenames)]
+
     def match_metadata(self, filename: str) -> bool:
         return self.re_pattern_metadata.match(filename) is not None
 
+    def find_metadata(self, filenames: str) -> list[str]:
+        """
+        Find all the metadata file names in a newline separated list of file names
+        """
+        return self.re_pattern_metadata.findall(filenames)
+
 
 class FilenamePatternGolden(FilenamePattern):
     """
@@ -96,10 +220,11 @@ class FilenamePatternGolden(FilenamePattern):
         self.suffix = suffix
         self.name_store: dict[int, str] = {}
 
-        self.re_pattern = re.compile("^" + re.escape(prefix) + self.PATTERN_a + "(([1-9][0-9]*)?[0-9]{" +
-                                     str(digit_count) + "})" + re.escape(suffix) + "$")
+        self.re_pattern = re.compile(
+            "^" + re.escape(prefix) + self.PATTERN_a + "(([1-9][0-9]*)?[0-9]{" + str(digit_count) + "})" +
+            re.escape(suffix) + "$", re.MULTILINE)
 
-        self.re_pattern_metadata = re.compile("^" + re.escape(prefix.rstrip("_ ")) + ".json$")
+        self.re_pattern_metadata = re.compile("^" + re.escape(prefix.rstrip("_ ")) + ".json$", re.MULTILINE)
 
     @classmethod
     def from_name(cls, filename: str) -> FilenamePattern:
@@ -112,12 +237,9 @@ class FilenamePatternGolden(FilenamePattern):
         ext = result.group(4)
         return cls(prefix, len(digits), ext)
 
-    def get_index(self, filename: str) -> int:
-        result = self.re_pattern.match(filename)
-        if result is None:
-            raise ValueError(f"Filename ({filename}) does not match pattern: {self.re_pattern}")
+    def _index_from_match(self, result: re.Match) -> int:
         index = int(result.group(2))
-        self.name_store[index] = filename
+        self.name_store[index] = result.group(0)
         return index
 
     def generate(self, index: int) -> str:
@@ -157,13 +279,14 @@ class FilenameGroup:
         if not path.is_dir():
             raise ValueError(f"path is a file: {path}")
 
-        files = (f for f in path.iterdir() if cls.valid_image_filename(f))
+        index = DirectoryIndex.get(path)
+        files = (name for name in index.file_names if cls.valid_image_filename(Path(name)))
 
-        try:
-            first_file = min(files)
-        except ValueError:
+        # The names are sorted, so the first valid one is the first file
+        first_file = next(files, None)
+        if first_file is None:
             return None
-        return cls.from_file(first_file)
+        return cls.from_file(path / first_file)
 
     @staticmethod
     def valid_image_filename(f: Path) -> bool:
@@ -187,16 +310,13 @@ class FilenameGroup:
         return next(self.all_files())
 
     def find_all_files(self) -> None:
-        self.all_indexes = []
-        for filename in self.directory.iterdir():
-            if self.pattern.match(filename.name):
-                self.all_indexes.append(self.pattern.get_index(filename.name))
+        index = DirectoryIndex.get(self.directory)
+        self.all_indexes = sorted(self.pattern.find_indexes(index.joined_file_names))
 
-            if self.pattern.match_metadata(filename.name):
-                if self.metadata_path is not None:
-                    LOG.warning(f"Multiple metadata files found: {filename}")
-                self.metadata_path = filename
-        self.all_indexes.sort()
+        for metadata_name in self.pattern.find_metadata(index.joined_file_names):
+            if self.metadata_path is not None:
+                LOG.warning(f"Multiple metadata files found: {metadata_name}")
+            self.metadata_path = self.directory / metadata_name
 
     def find_log_file(self) -> None:
         """
@@ -207,18 +327,19 @@ class FilenameGroup:
         possible_schemas = [self.directory.name + "*.txt", "*spectra.txt", "*.csv"]
         for directory in directories_to_search:
 
-            log_path_list: list[Path] = next(
-                (paths for schema in possible_schemas if (paths := list(directory.glob(schema, case_sensitive=False)))),
-                [])
+            index = DirectoryIndex.get(directory)
+            log_path_list: list[Path] = next((paths for schema in possible_schemas if (paths := index.glob(schema))),
+                                             [])
             if log_path_list:
                 break
 
         log_path_list = [log_path for log_path in log_path_list if "ShutterCount" not in log_path.name]
         if log_path_list:
-            for log_path in log_path_list:
-                if self.directory.name in log_path.name:
-                    self.log_path = log_path
-                    return
+            # Directory entries are not in a defined order, so take the shortest name rather than the first found
+            named_log_paths = [log_path for log_path in log_path_list if self.directory.name in log_path.name]
+            if named_log_paths:
+                self.log_path = min(named_log_paths, key=lambda log_path: len(log_path.name))
+                return
             self.log_path = self.directory / min(log_path_list, key=lambda log_path: len(log_path.name))
 
     def find_shutter_count_file(self) -> None:
@@ -227,13 +348,14 @@ class FilenameGroup:
         """
         directories_to_search = [self.directory, self.directory.parent]
         for directory in directories_to_search:
+            index = DirectoryIndex.get(directory)
             if self.directory.name.lower() in ["tomo", "sample", "GRtomo"]:
                 shutter_count_pattern = "*shuttercount.txt"
-                shutter_count_paths = list(directory.glob(shutter_count_pattern, case_sensitive=False))
+                shutter_count_paths = index.glob(shutter_count_pattern)
                 shutter_count_paths = [path for path in shutter_count_paths if "flat" not in path.name.lower()]
             else:
                 shutter_count_pattern = f"{self.directory.name}*shuttercount.txt"
-                shutter_count_paths = list(directory.glob(shutter_count_pattern, case_sensitive=False))
+                shutter_count_paths = index.glob(shutter_count_pattern)
 
             if shutter_count_paths:
                 shortest = min(shutter_count_paths, key=lambda p: len(p.name))
@@ -252,9 +374,10 @@ class FilenameGroup:
             test_names.append(file_type.tname)
         test_names.extend([s.lower() for s in test_names])
 
+        parent_index = DirectoryIndex.get(self.directory.parent)
         for test_name in test_names:
-            new_dir = self.directory.parent / test_name
-            if new_dir.exists():
+            new_dir = parent_index.find_dir(test_name)
+            if new_dir is not None:
                 fg = self.from_directory(new_dir)
                 if fg is not None:
                     return fg
@@ -272,8 +395,9 @@ class FilenameGroup:
 
         test_name = "180deg"
 
-        new_dir = self.directory.parent / test_name
-        if new_dir.exists():
+        new_dir = DirectoryIndex.get(self.directory.parent).find_dir(test_name)
+        if new_dir is not None:
+            new_dir_index = DirectoryIndex.get(new_dir)
             for trim_numbers in [True, False]:
                 if trim_numbers:
                     if "GRtomo" in sample_first_name:
@@ -285,9 +409,8 @@ class FilenameGroup:
                 for old_str in strs_to_replace:
                     new_name = new_name.replace(old_str, test_name)
 
-                new_path = new_dir / new_name
-
-                if new_path.exists():
+                new_path = new_dir_index.find_file(new_name)
+                if new_path is not None:
                     return self.from_file(new_path)
 
             # If 180 image cannot be found for GRtomo due to different naming scheme, loosen restrictions on matching
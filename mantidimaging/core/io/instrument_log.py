@@ -28,8 +28,9 @@ class ShutterCountColumn(Enum):
     SHUTTER_COUNT = auto()
 
 
-LogDataType = dict[LogColumn, list[float | int]]
-ShutterCountType = dict[ShutterCountColumn, list[float | int]]
+# Parsers can return lists or arrays, the logs store every column as an array
+LogDataType = dict[LogColumn, list[float | int] | np.ndarray]
+ShutterCountType = dict[ShutterCountColumn, list[float | int] | np.ndarray]
 
 
 class NoParserFound(RuntimeError):
@@ -120,7 +121,7 @@ class InstrumentLog:
     """
     parsers: ClassVar[list[type[InstrumentLogParser]]] = []
     parser: type[InstrumentLogParser]
-    data: LogDataType
+    data: dict[LogColumn, np.ndarray]
     length: int
 
     def __init__(self, lines: list[str], source_file: Path):
@@ -142,7 +143,7 @@ class InstrumentLog:
         )
 
     def parse(self) -> None:
-        self.data = self.parser(self.lines).parse()
+        self.data = {column: np.asarray(values) for column, values in self.parser(self.lines).parse().items()}
 
         lengths = [len(val) for val in self.data.values()]
         if len(set(lengths)) != 1:
@@ -153,7 +154,7 @@ class InstrumentLog:
     def register_parser(cls, parser: type[InstrumentLogParser]) -> None:
         cls.parsers.append(parser)
 
-    def get_column(self, key: LogColumn) -> list[float]:
+    def get_column(self, key: LogColumn) -> np.ndarray:
         return self.data[key]
 
     def projection_numbers(self) -> np.ndarray:
@@ -205,7 +206,7 @@ class ShutterCount:
         _find_parser(self) -> None: Finds the appropriate parser for the log.
         parse(self) -> None: Parses the log using the selected parser.
         register_parser(cls, parser: type[InstrumentShutterCountParser]) -> None: Registers a parser for the log.
-        get_column(self, key: ShutterCountColumn) -> list[float | int]: Returns the specified column from the log data.
+        get_column(self, key: ShutterCountColumn) -> np.ndarray: Returns the specified column from the log data.
         pulse_per_shutter_range_numbers(self) -> np.array: Returns an array of pulse per shutter range numbers.
         has_Pulse(self) -> bool: Checks if the log contains the 'PULSE' column.
         raise_if_counts_missing(self): Raises an exception if the counts are missing in the log.
@@ -213,7 +214,7 @@ class ShutterCount:
 
     parsers: ClassVar[list[type[InstrumentShutterCountParser]]] = []
     parser: type[InstrumentShutterCountParser]
-    data: ShutterCountType
+    data: dict[ShutterCountColumn, np.ndarray]
     length: int
 
     def __init__(self, lines: list[str], source_file: Path):
@@ -231,7 +232,7 @@ class ShutterCount:
         raise NoParserFound
 
     def parse(self) -> None:
-        self.data = self.parser(self.lines).parse()
+        self.data = {column: np.asarray(values) for column, values in self.parser(self.lines).parse().items()}
 
         lengths = [len(val) for val in self.data.values()]
         if len(set(lengths)) != 1:
@@ -242,7 +243,7 @@ class ShutterCount:
     def register_parser(cls, parser: type[InstrumentShutterCountParser]) -> None:
         cls.parsers.append(parser)
 
-    def get_column(self, key: ShutterCountColumn) -> list[float | int]:
+    def get_column(self, key: ShutterCountColumn) -> np.ndarray:
         return self.data[key]
 
     def pulse_per_shutter_range_numbers(self) -> np.ndarray[Any, Any]:
@@ -2,17 +2,28 @@
 # SPDX - License - Identifier: GPL-3.0-or-later
 from __future__ import annotations
 
-import csv
 import locale
 import re
 from datetime import datetime
 from pathlib import Path
 
+import numpy as np
+import numpy.typing as npt
+
 from mantidimaging.core.io.instrument_log import (InstrumentLogParser, InstrumentShutterCountParser, LogColumn,
                                                   ShutterCountColumn, LogDataType, ShutterCountType)
 from mantidimaging.core.utility.imat_log_file_parser import IMATLogFile, IMATLogColumn
 
 
+def _load_columns(lines: list[str], delimiter: str, dtypes: list[npt.DTypeLike]) -> list[np.ndarray]:
+    """
+    Parse delimited numeric columns in one pass with numpy, returning an array for each column
+    """
+    row_type = np.dtype([(f"f{i}", dtype) for i, dtype in enumerate(dtypes)])
+    rows = np.loadtxt(lines, delimiter=delimiter, dtype=row_type, ndmin=1)
+    return [rows[name] for name in row_type.names or ()]
+
+
 class LegacySpectraLogParser(InstrumentLogParser):
     """
     Parser for spectra files without a header
@@ -32,11 +43,8 @@ class LegacySpectraLogParser(InstrumentLogParser):
         return True
 
     def parse(self) -> LogDataType:
-        data: LogDataType = {LogColumn.TIME_OF_FLIGHT: [], LogColumn.SPECTRUM_COUNTS: []}
-        for row in csv.reader(self.cleaned_lines(), delimiter=self.delimiter):
-            data[LogColumn.TIME_OF_FLIGHT].append(float(row[0]))
-            data[LogColumn.SPECTRUM_COUNTS].append(int(row[1]))
-        return data
+        columns = _load_columns(self.cleaned_lines(), self.delimiter, [np.float64, np.int64])
+        return {LogColumn.TIME_OF_FLIGHT: columns[0], LogColumn.SPECTRUM_COUNTS: columns[1]}
 
 
 class LegacyShutterCountLogParser(InstrumentShutterCountParser):
@@ -57,11 +65,8 @@ class LegacyShutterCountLogParser(InstrumentShutterCountParser):
         return True
 
     def parse(self) -> ShutterCountType:
-        data: ShutterCountType = {ShutterCountColumn.PULSE: [], ShutterCountColumn.SHUTTER_COUNT: []}
-        for row in csv.reader(self.cleaned_lines(), delimiter=self.delimiter):
-            data[ShutterCountColumn.PULSE].append(int(row[0]))
-            data[ShutterCountColumn.SHUTTER_COUNT].append(int(row[1]))
-        return data
+        columns = _load_columns(self.cleaned_lines(), self.delimiter, [np.int64, np.int64])
+        return {ShutterCountColumn.PULSE: columns[0], ShutterCountColumn.SHUTTER_COUNT: columns[1]}
 
 
 class LegacyIMATLogFile(InstrumentLogParser):
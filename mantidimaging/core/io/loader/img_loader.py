@@ -4,19 +4,24 @@
 This module handles the loading of FIT, FITS, TIF, TIFF
 """
 from __future__ import annotations
-from typing import TYPE_CHECKING
-from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+from collections.abc import Callable, Iterator
 from pathlib import Path
 import logging
+import threading
+
+import numpy as np
+from tifffile import tifffile
 
 from mantidimaging.core.data import ImageStack
-from mantidimaging.core.parallel import utility as pu
+from mantidimaging.core.operation_history import const
+from mantidimaging.core.parallel import manager as pm, utility as pu
 from mantidimaging.core.utility.progress_reporting import Progress
 
 if TYPE_CHECKING:
-    import numpy as np
     import numpy.typing as npt
     from ...utility.data_containers import Indices
+    from ...utility.sensible_roi import SensibleROI
 
 LOG = logging.getLogger(__name__)
 
@@ -26,7 +31,11 @@ def execute(load_func: Callable[[Path], np.ndarray],
             img_format: str,
             dtype: npt.DTypeLike,
             indices: list[int] | Indices | None,
-            progress: Progress | None = None) -> ImageStack:
+            progress: Progress | None = None,
+            img_shape: tuple[int, ...] | None = None,
+            roi: SensibleROI | None = None,
+            binning: int = 1,
+            average: bool = False) -> ImageStack:
     """
     Reads a stack of images into memory, assuming dark and flat images
     are in separate directories.
@@ -36,6 +45,11 @@ def execute(load_func: Callable[[Path], np.ndarray],
         '>f2' - float16
         '>f4' - float32
 
+    :param img_shape: Shape of the images if already known, otherwise it is found by loading the first image
+    :param roi: Region of each image to keep, so that only the cropped stack is allocated
+    :param binning: Average blocks of binning x binning pixels of each image, after cropping
+    :param average: Only keep the mean of the images, as a stack with a single image. Used for flat and dark images,
+                    which are only needed averaged, so the full stack is never allocated
     :returns: ImageStack object
     """
     if not sample_path:
@@ -43,36 +57,148 @@ def execute(load_func: Callable[[Path], np.ndarray],
 
     # The following codes assume that all images have the same size and properties as the first.
     # This is always true in the case of raw data
-    first_sample_img = load_func(sample_path[0])
+    if img_shape is None:
+        img_shape = load_func(sample_path[0]).shape
 
     # select the files loaded based on the indices, if any are provided
     chosen_input_filenames = sample_path[indices[0]:indices[1]:indices[2]] if indices else sample_path
 
-    # get the shape of all images
-    img_shape = first_sample_img.shape
-
     # forward all arguments to internal class for easy re-usage
-    il = ImageLoader(load_func, img_format, img_shape, dtype, indices, progress)
-    sample_data = il.load_sample_data(chosen_input_filenames)
+    il = ImageLoader(load_func, img_format, img_shape, dtype, indices, progress, roi, binning)
+    if average:
+        sample_data, frame_means = il.average_files(chosen_input_filenames)
+        images = ImageStack(sample_data, indices=indices, name=chosen_input_filenames[0].stem)
+    else:
+        sample_data = il.load_sample_data(chosen_input_filenames)
+        images = ImageStack(sample_data, chosen_input_filenames, indices)
+    _record_reduction(images, roi, binning)
+    if average:
+        images.record_operation(const.OPERATION_NAME_AVERAGE_ON_LOAD,
+                                "Average on load",
+                                num_images=len(chosen_input_filenames),
+                                frame_means=frame_means.tolist())
+    return images
+
+
+def execute_stack(file_name: Path,
+                  dtype: npt.DTypeLike,
+                  indices: list[int] | Indices | None,
+                  progress: Progress | None = None,
+                  stack_shape: tuple[int, ...] | None = None,
+                  page_order: np.ndarray | None = None,
+                  roi: SensibleROI | None = None,
+                  binning: int = 1) -> ImageStack:
+    """
+    Reads the images from a single multi-page TIFF file, with one projection per page.
+
+    If the pixel data is uncompressed and contiguous in the file, and it is loaded without changing the type, order,
+    crop or binning, the file is memory mapped instead of read. The stack is then read-only, and is only copied into
+    shared memory when an operation first writes to it.
+
+    :param stack_shape: Shape of the stack in the file, as (pages, height, width)
+    :param page_order: Order to load the pages in, before the indices are applied
+    :returns: ImageStack object
+    """
+    with tifffile.TiffFile(file_name) as tif:
+        series = tif.series[0]
+        if stack_shape is None:
+            stack_shape = tuple(series.shape)
+        pages = np.arange(stack_shape[0])
+        if page_order is not None:
+            pages = pages[page_order]
+        if indices:
+            pages = pages[indices[0]:indices[1]:indices[2]]
+
+        il = ImageLoader(lambda page: tif.asarray(key=page, series=0), "tif", stack_shape[1:], dtype, indices, progress,
+                         roi, binning)
+        mapped = None
+        if page_order is None and not il._reduces and np.dtype(dtype) == series.dtype:
+            mapped = _memmap_pages(file_name, indices)
+        if mapped is not None:
+            LOG.info(f"Memory mapped {len(pages)} images from {file_name}, shape={mapped.shape}")
+            sample_data = pu.SharedArray(mapped, None, free_mem_on_del=False)
+        else:
+            sample_data = il.load_pages([int(page) for page in pages])
+
+    images = ImageStack(sample_data, indices=indices, name=file_name.stem)
+    _record_reduction(images, roi, binning)
+    return images
+
+
+def _memmap_pages(file_name: Path, indices: list[int] | Indices | None) -> np.ndarray | None:
+    """
+    Memory map the selected pages of a stack read-only, or return None if the pixel data can not be mapped
+    """
+    try:
+        mapped = tifffile.memmap(file_name, mode="r")
+    except ValueError as exc:
+        LOG.info(f"Can not memory map {file_name}, reading it instead: {exc}")
+        return None
+    return mapped[indices[0]:indices[1]:indices[2]] if indices else mapped
 
-    return ImageStack(sample_data, chosen_input_filenames, indices)
+
+def _record_reduction(images: ImageStack, roi: SensibleROI | None, binning: int) -> None:
+    """
+    Record the reduction as the operations it replaces, so the history matches loading the full images then cropping
+    and binning them
+    """
+    if roi is not None:
+        images.record_operation("CropCoordinatesFilter", "Crop Coordinates", region_of_interest=list(roi))
+    if binning > 1:
+        images.record_operation(const.OPERATION_NAME_BIN_ON_LOAD, "Bin on load", factor=binning)
 
 
 class ImageLoader:
 
     def __init__(self,
-                 load_func: Callable[[Path], np.ndarray],
+                 load_func: Callable[[Any], np.ndarray],
                  img_format: str,
                  img_shape: tuple[int, ...],
                  data_dtype: npt.DTypeLike,
                  indices: list[int] | Indices | None,
-                 progress: Progress | None = None):
+                 progress: Progress | None = None,
+                 roi: SensibleROI | None = None,
+                 binning: int = 1):
         self.load_func = load_func
         self.img_format = img_format
         self.img_shape = img_shape
         self.data_dtype = data_dtype
         self.indices = indices
         self.progress = progress
+        self.roi = roi
+        self.binning = binning
+        if binning < 1:
+            raise ValueError(f"Binning factor must be at least 1, got {binning}")
+        if roi is not None and (roi.left < 0 or roi.top < 0 or roi.right > img_shape[-1] or roi.bottom > img_shape[-2]
+                                or roi.width <= 0 or roi.height <= 0):
+            raise ValueError(f"Crop region {roi} is not inside the images, which have shape {img_shape}")
+
+    @property
+    def output_shape(self) -> tuple[int, int]:
+        """
+        Shape of each image once it has been cropped and binned
+        """
+        height, width = (self.roi.height, self.roi.width) if self.roi is not None else self.img_shape[-2:]
+        return height // self.binning, width // self.binning
+
+    @property
+    def _reduces(self) -> bool:
+        return self.roi is not None or self.binning > 1
+
+    def _reduce(self, image: np.ndarray) -> np.ndarray:
+        """
+        Crop and bin one decoded image
+        """
+        if self.roi is not None:
+            image = image[self.roi.top:self.roi.bottom, self.roi.left:self.roi.right]
+        if self.binning > 1:
+            height, width = self.output_shape
+            b = self.binning
+            # Pixels that do not fill a whole bin at the bottom and right edges are dropped
+            image = image[:height * b, :width * b].reshape(height, b, width, b).mean(axis=(1, 3), dtype=np.float64)
+            if not np.issubdtype(self.data_dtype, np.floating):
+                image = np.rint(image)
+        return image
 
     def load_sample_data(self, input_file_names: list[Path]) -> pu.SharedArray:
         # determine what the loaded data was
@@ -82,32 +208,142 @@ class ImageLoader:
         else:
             raise ValueError(f"Data loaded has invalid shape: {self.img_shape}")
 
+    def _load_file_into(self, data: pu.SharedArray, idx: int, in_file: Path) -> int:
+        """
+        Load one file into its row of data, returning the size of the file
+        """
+        data.array[idx, :] = self._read_file(in_file)
+        return in_file.stat().st_size
+
+    def _read_file(self, in_file: Path) -> np.ndarray:
+        """
+        Load one file, cropped and binned
+        """
+        try:
+            image = self.load_func(in_file)
+            if image.shape != tuple(self.img_shape):
+                raise ValueError(f"Image has shape {image.shape}")
+            return self._reduce(image) if self._reduces else image
+        except ValueError as exc:
+            raise ValueError("An image has different width and/or height "
+                             "dimensions! All images must have the same "
+                             f"dimensions. Expected dimensions: {self.img_shape} Error "
+                             f"message: {exc}") from exc
+        except OSError as exc:
+            raise RuntimeError(f"Could not load file {in_file}. Error details: {exc}") from exc
+
     def _do_files_load_seq(self, data: pu.SharedArray, files: list[Path]) -> pu.SharedArray:
         progress = Progress.ensure_instance(self.progress, num_steps=len(files), task_name='Loading')
         total_size = 0
 
         with progress:
             for idx, in_file in enumerate(files):
+                total_size += self._load_file_into(data, idx, in_file)
+                progress.update(msg='Image')
+
+        self._log_loaded(data, files, total_size)
+        return data
+
+    def _do_files_load_par(self, data: pu.SharedArray, files: list[Path]) -> pu.SharedArray:
+        """
+        Load the files using the thread pool. Decoding is mostly done in tifffile and astropy with the GIL released,
+        so threads can read and decode several files at once, each writing straight into its row of the shared array.
+        Falls back to loading sequentially if the pool is not configured.
+        """
+        # Set on error or cancel, so the files still queued are skipped
+        stop = threading.Event()
+
+        def load_one(idx: int) -> int:
+            if stop.is_set():
+                return 0
+            return self._load_file_into(data, idx, files[idx])
+
+        with pm.pool_in_use(len(files), use_threads=True):
+            if pm.thread_pool is None:
+                return self._do_files_load_seq(data, files)
+
+            progress = Progress.ensure_instance(self.progress, num_steps=len(files), task_name='Loading')
+            total_size = 0
+            LOG.info(f"Loading {len(files)} files on {pm.thread_pool_size} threads")
+            results = pm.thread_pool.imap(load_one, range(len(files)))
+            with progress:
                 try:
-                    data.array[idx, :] = self.load_func(in_file)
-                    total_size += in_file.stat().st_size
-                    progress.update(msg='Image')
-                except ValueError as exc:
-                    raise ValueError("An image has different width and/or height "
-                                     "dimensions! All images must have the same "
-                                     f"dimensions. Expected dimensions: {self.img_shape} Error "
-                                     f"message: {exc}") from exc
-                except OSError as exc:
-                    raise RuntimeError(f"Could not load file {in_file}. Error details: {exc}") from exc
+                    for size in results:
+                        total_size += size
+                        progress.update(msg='Image')
+                except Exception:
+                    stop.set()
+                    pu.drain_thread_results(results)
+                    raise
 
+        self._log_loaded(data, files, total_size)
+        return data
+
+    def _log_loaded(self, data: pu.SharedArray, files: list[Path], total_size: int) -> None:
         LOG.info(f"Loaded {len(files)} files (name={files[0].name}, format={self.img_format}, "
                  f"total size={total_size / (1024 * 1024):.2f} MB, dtype={data.array.dtype}, shape={data.array.shape})")
+
+    def average_files(self, files: list[Path]) -> tuple[pu.SharedArray, np.ndarray]:
+        """
+        Load the files and keep a running sum, so only the mean image is stored. Files are decoded on the thread pool
+        if it is configured, and added up in order.
+
+        :return: The mean as a stack of one image, which is floating point even if the files are integer, and the
+                 mean of each image
+        """
+        stop = threading.Event()
+        total = np.zeros(self.output_shape, dtype=np.float64)
+        frame_means = np.empty(len(files))
+
+        def read_one(in_file: Path) -> np.ndarray | None:
+            return None if stop.is_set() else self._read_file(in_file)
+
+        progress = Progress.ensure_instance(self.progress, num_steps=len(files), task_name='Averaging')
+        with pm.pool_in_use(len(files), use_threads=True):
+            if pm.thread_pool is not None:
+                images: Iterator[np.ndarray | None] = pm.thread_pool.imap(read_one, files)
+            else:
+                images = map(read_one, files)
+            with progress:
+                try:
+                    for idx, image in enumerate(images):
+                        assert image is not None
+                        total += image
+                        frame_means[idx] = image.mean()
+                        progress.update(msg='Image')
+                except Exception:
+                    stop.set()
+                    pu.drain_thread_results(images)
+                    raise
+
+        data = pu.create_array((1, *self.output_shape), np.result_type(self.data_dtype, np.float32))
+        np.divide(total, len(files), out=data.array[0], casting="unsafe")
+        LOG.info(f"Averaged {len(files)} files (name={files[0].name}, format={self.img_format}, "
+                 f"dtype={data.array.dtype}, shape={self.output_shape})")
+        return data, frame_means
+
+    def load_pages(self, pages: list[int]) -> pu.SharedArray:
+        """
+        Load pages of a single multi-page file. load_func is called with the page number instead of a file name.
+        """
+        data = pu.create_array((len(pages), *self.output_shape), self.data_dtype)
+        progress = Progress.ensure_instance(self.progress, num_steps=len(pages), task_name='Loading')
+        with progress:
+            for idx, page in enumerate(pages):
+                image = self.load_func(page)
+                if image.shape != tuple(self.img_shape):
+                    raise ValueError(f"Page {page} has shape {image.shape}, expected {self.img_shape}")
+                data.array[idx, :] = self._reduce(image) if self._reduces else image
+                progress.update(msg='Image')
+        LOG.info(f"Loaded {len(pages)} pages, dtype={data.array.dtype}, shape={data.array.shape}")
         return data
 
     def load_files(self, files: list[Path]) -> pu.SharedArray:
         # Zeroing here to make sure that we can allocate the memory.
         # If it's not possible better crash here than later.
         num_images = len(files)
-        shape = (num_images, self.img_shape[0], self.img_shape[1])
+        shape = (num_images, *self.output_shape)
         data = pu.create_array(shape, self.data_dtype)
+        if num_images > 1:
+            return self._do_files_load_par(data, files)
         return self._do_files_load_seq(data, files)
@@ -1,10 +1,13 @@
 # Copyright (C) 2021 ISIS Rutherford Appleton Laboratory UKRI
 # SPDX - License - Identifier: GPL-3.0-or-later
 from __future__ import annotations
+import copy
+import json
+import time
 from dataclasses import dataclass, field
 from logging import getLogger
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, NamedTuple, TypeVar, cast
 from collections.abc import Callable
 
 import numpy as np
@@ -15,7 +18,8 @@ from mantidimaging.core.io.instrument_log import InstrumentLog, ShutterCount
 from mantidimaging.core.io.loader import img_loader
 from mantidimaging.core.io.utility import find_first_file_that_is_possibly_a_sample
 from mantidimaging.core.utility.data_containers import Indices, FILE_TYPES, ProjectionAngles
-from mantidimaging.core.io.filenames import FilenameGroup
+from mantidimaging.core.utility.sensible_roi import SensibleROI
+from mantidimaging.core.io.filenames import RACY_MTIME_NS, FilenameGroup
 
 if TYPE_CHECKING:
     import numpy.typing as npt
@@ -24,9 +28,13 @@ if TYPE_CHECKING:
 
 LOG = getLogger(__name__)
 
+LogT = TypeVar("LogT", InstrumentLog, ShutterCount)
+
 DEFAULT_IS_SINOGRAM = False
 DEFAULT_PIXEL_SIZE = 0
 DEFAULT_PIXEL_DEPTH = "float32"
+# Keep the images in the type they are stored in, usually uint16, until an operation needs floating point data
+NATIVE_PIXEL_DEPTH = "native"
 
 
 @dataclass
@@ -38,6 +46,11 @@ class ImageParameters:
     log_file: Path | None = None
     shutter_count_file: Path | None = None
     indices: Indices | None = None
+    # Crop and bin each image as it is loaded, so the full size stack is never allocated
+    roi: SensibleROI | None = None
+    binning: int = 1
+    # Only keep the mean image, used for flat and dark images
+    average: bool = False
 
 
 @dataclass
@@ -88,21 +101,112 @@ def get_loader(in_format: str) -> Callable[[Path | str], np.ndarray]:
     return load_func
 
 
-def read_image_dimensions(file_path: Path) -> tuple[int, int]:
-    load_func = get_loader(file_path.suffix.replace(".", ""))
-    img = load_func(file_path)
-    assert len(img.shape) == 2
-    return img.shape
+class ImageInfo(NamedTuple):
+    """
+    Shape and type of an image, read from the file header without decoding the pixel data
+    """
+    shape: tuple[int, ...]
+    dtype: np.dtype
+    compressed: bool = False
+
+
+# FITS BITPIX values, see the FITS standard section 4.4.1.1
+_FITS_BITPIX_DTYPES = {8: np.uint8, 16: np.int16, 32: np.int32, 64: np.int64, -32: np.float32, -64: np.float64}
+_FITS_UNSIGNED_DTYPES = {16: np.uint16, 32: np.uint32, 64: np.uint64}
+
+
+def _tiff_info(filename: Path | str) -> ImageInfo:
+    try:
+        with tifffile.TiffFile(filename) as tif:
+            # The first series covers all the pages of a multi-page stack
+            series = tif.series[0]
+            return ImageInfo(tuple(series.shape), np.dtype(series.dtype), series.keyframe.compression
+                             != tifffile.COMPRESSION.NONE)
+    except tifffile.TiffFileError as e:
+        raise RuntimeError(f"TiffFileError {e.args[0]}: {filename}") from e
+
+
+def _fits_info(filename: Path | str) -> ImageInfo:
+    header = fits.getheader(filename, 0)
+    # FITS axes are listed fastest varying first
+    shape = tuple(header[f"NAXIS{axis}"] for axis in range(header["NAXIS"], 0, -1))
+    bitpix = header["BITPIX"]
+    bscale = header.get("BSCALE", 1)
+    bzero = header.get("BZERO", 0)
+    if bscale == 1 and bitpix in _FITS_UNSIGNED_DTYPES and bzero == 2**(bitpix - 1):
+        dtype = np.dtype(_FITS_UNSIGNED_DTYPES[bitpix])
+    elif bscale != 1 or bzero != 0:
+        dtype = np.dtype(np.float64 if bitpix == -64 else np.float32)
+    else:
+        dtype = np.dtype(_FITS_BITPIX_DTYPES[bitpix])
+    return ImageInfo(shape, dtype)
+
+
+def read_image_info(file_path: Path) -> ImageInfo:
+    """
+    Read the shape and type of an image from the TIFF tags or FITS header, without loading the image
+    """
+    in_format = file_path.suffix.lstrip(".").lower()
+    if in_format in ['fits', 'fit']:
+        return _fits_info(file_path)
+    elif in_format in ['tiff', 'tif']:
+        return _tiff_info(file_path)
+    raise NotImplementedError("Loading not implemented for:", in_format)
+
+
+def read_image_dimensions(file_path: Path) -> tuple[int, ...]:
+    """
+    Read the shape of an image, or of the whole stack for a multi-page TIFF
+    """
+    shape = read_image_info(file_path).shape
+    assert len(shape) in (2, 3)
+    return shape
+
+
+def check_image_dimensions(file_names: list[Path], expected: ImageInfo) -> None:
+    """
+    Check that all the images have the expected shape before memory is allocated for them. Only the TIFF tags or FITS
+    header of each file are read. File sizes can not be used as a shortcut, as a transposed image has the same size.
+
+    :raises ValueError: If any of the images has a different shape
+    """
+    for file_name in file_names[1:]:
+        shape = read_image_info(file_name).shape
+        if shape != expected.shape:
+            raise ValueError("An image has different width and/or height dimensions! All images must have the same "
+                             f"dimensions. Expected dimensions: {expected.shape} but {file_name} has {shape}")
+
+
+# Parsed log files, with the modification time and size of the file when it was parsed
+_parsed_logs: dict[tuple[type, Path], tuple[int, int, InstrumentLog | ShutterCount]] = {}
+
+
+def _load_parsed(log_file: Path, log_class: type[LogT], encoding: str | None = None) -> LogT:
+    """
+    Parse a log file, or copy the result of parsing it before if the file has not changed since. Spectra and shutter
+    count files can have hundreds of thousands of rows, and are loaded again each time a stack is selected.
+    """
+    file_stat = log_file.stat()
+    key = (log_class, log_file.absolute())
+    cached = _parsed_logs.get(key)
+    if cached is not None and cached[:2] == (file_stat.st_mtime_ns, file_stat.st_size):
+        LOG.debug(f"Using cached parse of {log_file}")
+        return copy.deepcopy(cast(LogT, cached[2]))
+
+    with open(log_file, encoding=encoding) as f:
+        log = log_class(f.readlines(), log_file)
+    # A file that has just changed might change again without its modification time moving on
+    if time.time_ns() - file_stat.st_mtime_ns > RACY_MTIME_NS:
+        _parsed_logs[key] = (file_stat.st_mtime_ns, file_stat.st_size, copy.deepcopy(log))
+    return log
 
 
 def load_log(log_file: Path) -> InstrumentLog:
-    with open(log_file) as f:
-        return InstrumentLog(f.readlines(), log_file)
+    return _load_parsed(log_file, InstrumentLog)
 
 
 def load_shutter_counts(shutter_count_file: Path) -> ShutterCount:
-    with open(shutter_count_file, encoding='utf-8') as f:
-        return ShutterCount(f.readlines(), shutter_count_file)
+    return _load_parsed(shutter_count_file, ShutterCount, encoding='utf-8')
 
 
 def load_stack_from_group(group: FilenameGroup, progress: Progress | None = None) -> ImageStack:
@@ -117,7 +221,10 @@ def load_stack_from_image_params(image_params: ImageParameters,
                 dtype=dtype,
                 indices=image_params.indices,
                 log_file=image_params.log_file,
-                shutter_count_file=image_params.shutter_count_file)
+                shutter_count_file=image_params.shutter_count_file,
+                roi=image_params.roi,
+                binning=image_params.binning,
+                average=image_params.average)
 
 
 def load(filename_group: FilenameGroup,
@@ -125,17 +232,25 @@ def load(filename_group: FilenameGroup,
          indices: list[int] | Indices | None = None,
          progress: Progress | None = None,
          log_file: Path | None = None,
-         shutter_count_file: Path | None = None) -> ImageStack:
+         shutter_count_file: Path | None = None,
+         roi: SensibleROI | None = None,
+         binning: int = 1,
+         average: bool = False) -> ImageStack:
     """
     Loads a stack, including sample, white and dark images.
 
-    :param dtype: Default: np.float32, data type for the input images
+    :param dtype: Default: np.float32, data type for the input images, or NATIVE_PIXEL_DEPTH to keep the type of the
+                  image files
     :param filename_group: FilenameGroup to provide file names for loading
     :param indices: Specify which indices are loaded from the found files.
                     This **DOES NOT** check for the number in the image
                     filename, but removes all indices from the filenames list
                     that are not selected
     :param progress: The progress reporting instance
+    :param roi: Region of each image to keep, recorded in the operation history as a crop
+    :param binning: Average blocks of binning x binning pixels of each image, after cropping
+    :param average: Only keep the mean of the images, as a stack with a single image. Not used for multi-page TIFF
+                    stacks, which are memory mapped when possible
     :return: an ImageStack
     """
     if indices and len(indices) < 3:
@@ -145,19 +260,28 @@ def load(filename_group: FilenameGroup,
     in_format = filename_group.first_file().suffix.lstrip('.')
     load_func = get_loader(in_format)
 
-    if log_file is not None:
-        log_data = load_log(log_file)
-        if log_data.has_projection_angles():
-            angles = log_data.projection_angles().value
-            angle_order = np.argsort(angles)
-            angles = angles[angle_order]
+    log_data = load_log(log_file) if log_file is not None else None
+    angle_order = None
+    if log_data is not None and log_data.has_projection_angles():
+        angle_order = np.argsort(log_data.projection_angles().value)
+
+    image_info = read_image_info(file_names[0])
+    if isinstance(dtype, str) and dtype == NATIVE_PIXEL_DEPTH:
+        dtype = image_info.dtype
+    if len(image_info.shape) == 3:
+        image_stack = _load_stack_file(file_names, in_format, image_info, dtype, indices, progress, angle_order, roi,
+                                       binning)
+    else:
+        if angle_order is not None:
             file_names = [file_names[i] for i in angle_order]
+        check_image_dimensions(file_names[indices[0]:indices[1]:indices[2]] if indices else file_names, image_info)
+        image_stack = img_loader.execute(load_func, file_names, in_format, dtype, indices, progress, image_info.shape,
+                                         roi, binning, average)
 
-    image_stack = img_loader.execute(load_func, file_names, in_format, dtype, indices, progress)
-
-    if log_file is not None:
+    if log_data is not None:
         image_stack.log_file = log_data
-        if log_data.has_projection_angles():
+        if angle_order is not None:
+            angles = log_data.projection_angles().value[angle_order]
             angles = angles[indices[0]:indices[1]:indices[2]] if indices else angles
             image_stack.set_projection_angles(ProjectionAngles(angles))
 
@@ -169,12 +293,45 @@ def load(filename_group: FilenameGroup,
         with open(metadata_filename) as f:
             image_stack.load_metadata(f)
             LOG.debug(f'Loaded metadata from: {metadata_filename}')
+    elif len(image_info.shape) == 3 and (stack_metadata := _read_stack_metadata(file_names[0])) is not None:
+        image_stack.metadata = stack_metadata | image_stack.metadata
+        LOG.debug(f'Loaded metadata from the description of: {file_names[0]}')
     else:
         LOG.debug('No metadata file found')
 
     return image_stack
 
 
+def _load_stack_file(file_names: list[Path], in_format: str, image_info: ImageInfo, dtype: npt.DTypeLike,
+                     indices: list[int] | Indices | None, progress: Progress | None, angle_order: np.ndarray | None,
+                     roi: SensibleROI | None, binning: int) -> ImageStack:
+    """
+    Load a single multi-page TIFF, which holds the whole stack with one projection per page
+    """
+    if len(file_names) > 1 or in_format.lower() not in ['tiff', 'tif']:
+        raise ValueError(f"Images must be 2D, or a single multi-page TIFF stack. {file_names[0]} has shape "
+                         f"{image_info.shape} and {len(file_names)} files were found")
+    # Keep the zero-copy path if the projections are already in order
+    if angle_order is not None and np.array_equal(angle_order, np.arange(len(angle_order))):
+        angle_order = None
+    return img_loader.execute_stack(file_names[0], dtype, indices, progress, image_info.shape, angle_order, roi,
+                                    binning)
+
+
+def _read_stack_metadata(file_name: Path) -> dict | None:
+    """
+    Read the metadata that is saved as JSON in the description of a multi-page TIFF stack
+    :return: The metadata, or None if the description does not hold any
+    """
+    with tifffile.TiffFile(file_name) as tif:
+        description = tif.pages[0].description
+    try:
+        metadata = json.loads(description)
+    except ValueError:
+        return None
+    return metadata if isinstance(metadata, dict) else None
+
+
 def create_loading_parameters_for_file_path(file_path: Path) -> LoadingParameters | None:
     sample_file = find_first_file_that_is_possibly_a_sample(file_path)
     if sample_file is None:
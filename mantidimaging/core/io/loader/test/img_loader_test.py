@@ -0,0 +1,202 @@
+# Copyright (C) 2021 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+from __future__ import annotations
+
+import contextlib
+import unittest
+from multiprocessing.pool import ThreadPool
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import numpy.testing as npt
+
+from mantidimaging.core.io.loader.img_loader import ImageLoader, execute
+from mantidimaging.core.operation_history import const
+from mantidimaging.core.utility.progress_reporting import Progress
+from mantidimaging.core.utility.progress_reporting.progress import TaskCancelled
+from mantidimaging.core.utility.sensible_roi import SensibleROI
+
+
+class FakeFile(type(Path())):  # type: ignore
+
+    def stat(self):
+        return mock.Mock(st_size=100)
+
+
+def load_func(path: Path) -> np.ndarray:
+    if "bad_shape" in path.name:
+        return np.zeros((3, 3))
+    if "missing" in path.name:
+        raise FileNotFoundError("no such file")
+    index = int(path.stem.split("_")[-1])
+    return np.full((4, 5), index, dtype=np.float32)
+
+
+class ImageLoaderTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.thread_pool = ThreadPool(4)
+        patcher = mock.patch("mantidimaging.core.io.loader.img_loader.pm")
+        self.mock_pm = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_pm.thread_pool = self.thread_pool
+        self.mock_pm.thread_pool_size = 4
+        self.mock_pm.pool_in_use.return_value = contextlib.nullcontext()
+
+    def tearDown(self) -> None:
+        self.thread_pool.terminate()
+
+    @staticmethod
+    def _files(count: int) -> list[Path]:
+        return [FakeFile(f"/data/image_{i:04d}.tif") for i in range(count)]
+
+    def _loader(self, progress: Progress | None = None) -> ImageLoader:
+        return ImageLoader(load_func, "tif", (4, 5), np.float32, None, progress)
+
+    def test_parallel_load_puts_each_image_in_its_row(self):
+        files = self._files(50)
+
+        data = self._loader().load_files(files)
+
+        npt.assert_array_equal(data.array[:, 0, 0], np.arange(50))
+        self.mock_pm.pool_in_use.assert_called_once_with(50, use_threads=True)
+
+    def test_parallel_load_matches_sequential(self):
+        files = self._files(20)
+        par = self._loader().load_files(files)
+        self.mock_pm.thread_pool = None
+        seq = self._loader().load_files(files)
+
+        npt.assert_array_equal(par.array, seq.array)
+
+    def test_single_file_loaded_sequentially(self):
+        data = self._loader().load_files(self._files(1))
+
+        self.mock_pm.pool_in_use.assert_not_called()
+        npt.assert_array_equal(data.array, np.zeros((1, 4, 5)))
+
+    def test_parallel_load_reports_progress_for_each_image(self):
+        progress = Progress()
+
+        self._loader(progress).load_files(self._files(12))
+
+        self.assertEqual(12, progress.current_step - 1)
+        self.assertTrue(progress.complete)
+
+    def test_parallel_load_dimension_mismatch(self):
+        files = self._files(10)
+        files[6] = FakeFile("/data/bad_shape_0006.tif")
+
+        with self.assertRaisesRegex(ValueError, "An image has different width and/or height dimensions"):
+            self._loader().load_files(files)
+
+    def test_parallel_load_file_error(self):
+        files = self._files(10)
+        files[3] = FakeFile("/data/missing_0003.tif")
+
+        with self.assertRaisesRegex(RuntimeError, "Could not load file /data/missing_0003.tif"):
+            self._loader().load_files(files)
+
+    def test_parallel_load_cancelled(self):
+        progress = Progress()
+        progress.cancel()
+
+        with self.assertRaises(TaskCancelled):
+            self._loader(progress).load_files(self._files(10))
+
+    def test_crop_and_bin_on_load(self):
+        full = np.arange(4 * 5, dtype=np.float32).reshape((4, 5))
+        loader = ImageLoader(lambda _: full, "tif", (4, 5), np.float32, None, None, SensibleROI(1, 0, 5, 4), 2)
+
+        data = loader.load_files(self._files(3))
+
+        self.assertEqual(data.array.shape, (3, 2, 2))
+        expected = full[:, 1:5].reshape(2, 2, 2, 2).mean(axis=(1, 3))
+        npt.assert_array_equal(data.array[2], expected)
+
+    def test_bin_on_load_drops_partial_bins(self):
+        full = np.ones((5, 7), dtype=np.uint16)
+        loader = ImageLoader(lambda _: full, "tif", (5, 7), np.uint16, None, None, None, 2)
+
+        data = loader.load_files(self._files(2))
+
+        self.assertEqual(data.array.shape, (2, 2, 3))
+        self.assertEqual(data.array.dtype, np.uint16)
+        npt.assert_array_equal(data.array, 1)
+
+    def test_crop_on_load_dimension_mismatch(self):
+        files = self._files(4)
+        files[2] = FakeFile("/data/bad_shape_0002.tif")
+        loader = ImageLoader(load_func, "tif", (4, 5), np.float32, None, None, SensibleROI(0, 0, 3, 3))
+
+        with self.assertRaisesRegex(ValueError, "An image has different width and/or height dimensions"):
+            loader.load_files(files)
+
+    def test_crop_outside_images_rejected(self):
+        with self.assertRaisesRegex(ValueError, "not inside the images"):
+            ImageLoader(load_func, "tif", (4, 5), np.float32, None, None, SensibleROI(0, 0, 6, 4))
+
+    def test_execute_records_crop_and_binning(self):
+        images = execute(load_func,
+                         self._files(3),
+                         "tif",
+                         np.float32,
+                         None,
+                         img_shape=(4, 5),
+                         roi=SensibleROI(0, 0, 4, 4),
+                         binning=2)
+
+        history = images.metadata[const.OPERATION_HISTORY]
+        self.assertEqual([op[const.OPERATION_NAME] for op in history],
+                         ["CropCoordinatesFilter", const.OPERATION_NAME_BIN_ON_LOAD])
+        self.assertEqual(history[0][const.OPERATION_KEYWORD_ARGS], {"region_of_interest": [0, 0, 4, 4]})
+        self.assertEqual(images.data.shape, (3, 2, 2))
+
+    def test_average_files(self):
+        data, frame_means = self._loader().average_files(self._files(10))
+
+        self.assertEqual(data.array.shape, (1, 4, 5))
+        npt.assert_array_equal(data.array, 4.5)
+        npt.assert_array_equal(frame_means, np.arange(10))
+        self.mock_pm.pool_in_use.assert_called_once_with(10, use_threads=True)
+
+    def test_average_files_matches_sequential(self):
+        files = self._files(7)
+        par, _ = self._loader().average_files(files)
+        self.mock_pm.thread_pool = None
+        seq, _ = self._loader().average_files(files)
+
+        npt.assert_array_equal(par.array, seq.array)
+
+    def test_average_of_integer_files_is_float(self):
+        loader = ImageLoader(lambda path: np.full((4, 5), int(path.stem[-1]), dtype=np.uint16), "tif", (4, 5),
+                             np.uint16, None)
+
+        data, _ = loader.average_files(self._files(2))
+
+        self.assertEqual(data.array.dtype, np.float32)
+        npt.assert_array_equal(data.array, 0.5)
+
+    def test_average_files_dimension_mismatch(self):
+        files = self._files(10)
+        files[6] = FakeFile("/data/bad_shape_0006.tif")
+
+        with self.assertRaisesRegex(ValueError, "An image has different width and/or height dimensions"):
+            self._loader().average_files(files)
+
+    def test_execute_average_records_frame_statistics(self):
+        images = execute(load_func, self._files(4), "tif", np.float32, None, img_shape=(4, 5), average=True)
+
+        self.assertEqual(images.data.shape, (1, 4, 5))
+        self.assertEqual(images.name, "image_0000")
+        history = images.metadata[const.OPERATION_HISTORY]
+        self.assertEqual(history[0][const.OPERATION_NAME], const.OPERATION_NAME_AVERAGE_ON_LOAD)
+        self.assertEqual(history[0][const.OPERATION_KEYWORD_ARGS], {
+            const.AVERAGE_NUM_IMAGES: 4,
+            const.AVERAGE_FRAME_MEANS: [0, 1, 2, 3]
+        })
+
+
+if __name__ == "__main__":
+    unittest.main()
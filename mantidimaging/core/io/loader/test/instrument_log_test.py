@@ -5,10 +5,12 @@ from __future__ import annotations
 import unittest
 from pathlib import Path
 
-from numpy.testing import assert_allclose
+import numpy as np
+from numpy.testing import assert_allclose, assert_array_equal
 
 from .instrument_log_data import IMAT_2023_SPECTRA_LOG, INVALID_FILE, IMAT_2019_TOMO_LOG
-from mantidimaging.core.io.instrument_log import LogColumn, InstrumentLog, NoParserFound
+from mantidimaging.core.io.instrument_log import (LogColumn, InstrumentLog, NoParserFound, ShutterCount,
+                                                  ShutterCountColumn)
 
 
 class FilenamePatternTest(unittest.TestCase):
@@ -29,3 +31,28 @@ class FilenamePatternTest(unittest.TestCase):
     def test_WHEN_invalid_file_THEN_exception(self):
         filename, data = INVALID_FILE
         self.assertRaises(NoParserFound, InstrumentLog, data, Path(filename))
+
+    def test_WHEN_read_spectra_file_THEN_columns_are_arrays(self):
+        filename, data = IMAT_2023_SPECTRA_LOG
+        log = InstrumentLog(data.split("\n"), Path(filename))
+
+        self.assertEqual(log.length, 4)
+        self.assertEqual(log.get_column(LogColumn.TIME_OF_FLIGHT).dtype, np.float64)
+        self.assertEqual(log.get_column(LogColumn.SPECTRUM_COUNTS).dtype, np.int64)
+
+    def test_WHEN_read_imat_file_THEN_columns_are_arrays(self):
+        filename, data = IMAT_2019_TOMO_LOG
+        log = InstrumentLog(data.split("\n"), Path(filename))
+
+        self.assertIsInstance(log.get_column(LogColumn.PROJECTION_NUMBER), np.ndarray)
+        self.assertEqual(log.get_column(LogColumn.TIMESTAMP)[1], "Sun Feb 10 00:22:37 2019")
+
+    def test_WHEN_read_shutter_count_file_THEN_expected_values_read(self):
+        lines = ["0\t11\n", "1\t12\n", "\n", "2\t0\n"]
+        shutter_count = ShutterCount(lines, Path("IMAT_ShutterCount.txt"))
+
+        assert_array_equal(shutter_count.get_column(ShutterCountColumn.PULSE), [0, 1, 2])
+        assert_array_equal(shutter_count.pulse_per_shutter_range_numbers(), [11, 12, 0])
+
+    def test_WHEN_spectra_count_not_integer_THEN_exception(self):
+        self.assertRaises(ValueError, InstrumentLog, ["0.012\t3.5\n", "0.013\t4\n"], Path("a_Spectra.txt"))
@@ -1,15 +1,23 @@
 # Copyright (C) 2021 ISIS Rutherford Appleton Laboratory UKRI
 # SPDX - License - Identifier: GPL-3.0-or-later
 from __future__ import annotations
+import os
+import time
 from pathlib import Path
 from unittest import mock
 
+import astropy.io.fits as fits
 import numpy as np
+import pytest
+from tifffile import tifffile
 
 from mantidimaging.core.io.filenames import FilenameGroup
-from mantidimaging.core.io.instrument_log import InstrumentLog
+from mantidimaging.core.io.instrument_log import InstrumentLog, LogColumn
 from mantidimaging.core.io.loader.loader import (DEFAULT_PIXEL_DEPTH, DEFAULT_PIXEL_SIZE, DEFAULT_IS_SINOGRAM,
-                                                 create_loading_parameters_for_file_path, get_loader, load, _imread)
+                                                 NATIVE_PIXEL_DEPTH, ImageInfo, check_image_dimensions,
+                                                 create_loading_parameters_for_file_path, get_loader, load, _fitsread,
+                                                 _imread, load_log, load_shutter_counts, read_image_dimensions,
+                                                 read_image_info)
 
 from mantidimaging.core.utility.data_containers import FILE_TYPES, ProjectionAngles
 from mantidimaging.test_helpers.unit_test_helper import FakeFSTestCase
@@ -71,9 +79,11 @@ class LoaderTest(FakeFSTestCase):
         self._file_in_sequence(Path("/b/180deg/180deg_0000.tif"), sample.file_group.all_files())
         self.assertEqual(1, len(list(sample.file_group.all_files())))
 
+    @mock.patch('mantidimaging.core.io.loader.loader.check_image_dimensions')
+    @mock.patch('mantidimaging.core.io.loader.loader.read_image_info')
     @mock.patch('mantidimaging.core.io.loader.loader.load_log')
     @mock.patch('mantidimaging.core.io.loader.loader.img_loader.execute')
-    def test_load_with_golden_angles(self, mock_execute: mock.Mock, mock_load_log: mock.Mock):
+    def test_load_with_golden_angles(self, mock_execute: mock.Mock, mock_load_log: mock.Mock, _, __):
         filenames = [Path(f"foo_{n}.tif") for n in range(20)]
         angles = np.array([(n * 137.507764) % 360 for n in range(20)])
 
@@ -96,3 +106,201 @@ class LoaderTest(FakeFSTestCase):
         self._file_list_count_equal(filenames, reordered_filenames)
         self.assertListEqual(['foo_0.tif', 'foo_8.tif', 'foo_16.tif', 'foo_3.tif', 'foo_11.tif'],
                              [p.name for p in reordered_filenames[:5]])
+
+
+@pytest.mark.parametrize("dtype,compression", [(np.uint16, None), (np.float32, None), (np.uint16, "zlib")])
+def test_read_image_info_tiff(tmp_path, dtype, compression):
+    file_path = tmp_path / "image.tif"
+    tifffile.imwrite(file_path, np.zeros((6, 7), dtype=dtype), compression=compression)
+
+    info = read_image_info(file_path)
+
+    assert info == ImageInfo((6, 7), np.dtype(dtype), compression is not None)
+    assert read_image_dimensions(file_path) == (6, 7)
+
+
+@pytest.mark.parametrize("data,expected_dtype", [(np.zeros((6, 7), dtype=np.uint16), np.uint16),
+                                                 (np.zeros((6, 7), dtype=np.int16), np.int16),
+                                                 (np.zeros((6, 7), dtype=np.float32), np.float32)])
+def test_read_image_info_fits(tmp_path, data, expected_dtype):
+    file_path = tmp_path / "image.fits"
+    fits.PrimaryHDU(data).writeto(file_path)
+
+    info = read_image_info(file_path)
+
+    assert info.shape == (6, 7)
+    # FITS data is big endian, the header gives the value type
+    assert info.dtype == _fitsread(file_path).dtype.newbyteorder("=") == expected_dtype
+
+
+def test_read_image_info_does_not_decode(tmp_path):
+    file_path = tmp_path / "image.tif"
+    tifffile.imwrite(file_path, np.zeros((6, 7), dtype=np.uint16))
+
+    with mock.patch("mantidimaging.core.io.loader.loader.tifffile.imread") as mock_imread:
+        read_image_info(file_path)
+
+    mock_imread.assert_not_called()
+
+
+@pytest.mark.parametrize("compression", [None, "zlib"])
+def test_check_image_dimensions(tmp_path, compression):
+    file_names = []
+    for i in range(5):
+        file_names.append(tmp_path / f"image_{i}.tif")
+        tifffile.imwrite(file_names[-1], np.full((6, 7), i, dtype=np.uint16), compression=compression)
+    info = read_image_info(file_names[0])
+
+    check_image_dimensions(file_names, info)
+
+    tifffile.imwrite(file_names[3], np.zeros((6, 8), dtype=np.uint16), compression=compression)
+    with pytest.raises(ValueError, match="image_3.tif has"):
+        check_image_dimensions(file_names, info)
+
+
+def test_check_image_dimensions_transposed_image(tmp_path):
+    file_names = [tmp_path / f"image_{i}.tif" for i in range(4)]
+    for file_name in file_names:
+        tifffile.imwrite(file_name, np.zeros((6, 7), dtype=np.uint16))
+    # Same number of pixels, so the same file size
+    tifffile.imwrite(file_names[2], np.zeros((7, 6), dtype=np.uint16))
+    assert file_names[2].stat().st_size == file_names[0].stat().st_size
+
+    with pytest.raises(ValueError, match=r"image_2.tif has \(7, 6\)"):
+        check_image_dimensions(file_names, read_image_info(file_names[0]))
+
+
+def test_load_checks_dimensions_before_allocating(tmp_path):
+    for i in range(5):
+        tifffile.imwrite(tmp_path / f"image_{i:04d}.tif", np.zeros((6, 7 if i != 2 else 8), dtype=np.uint16))
+    group = FilenameGroup.from_file(tmp_path / "image_0000.tif")
+    group.find_all_files()
+
+    with mock.patch("mantidimaging.core.io.loader.loader.img_loader.execute") as mock_execute:
+        with pytest.raises(ValueError, match="different width and/or height"):
+            load(group)
+
+    mock_execute.assert_not_called()
+
+
+@pytest.mark.parametrize("dtype,expected", [(NATIVE_PIXEL_DEPTH, np.uint16), ("float32", np.float32)])
+def test_load_native_dtype(tmp_path, dtype, expected):
+    for i in range(3):
+        tifffile.imwrite(tmp_path / f"image_{i:04d}.tif", np.full((6, 7), i, dtype=np.uint16))
+    group = FilenameGroup.from_file(tmp_path / "image_0000.tif")
+    group.find_all_files()
+
+    images = load(group, dtype=dtype)
+
+    assert images.dtype == expected
+    np.testing.assert_array_equal(images.data[:, 0, 0], [0, 1, 2])
+
+
+def _write_stack(tmp_path: Path, compression: str | None = None) -> FilenameGroup:
+    data = np.arange(5 * 6 * 7, dtype=np.uint16).reshape((5, 6, 7))
+    tifffile.imwrite(tmp_path / "stack_0000.tif", data, compression=compression)
+    group = FilenameGroup.from_file(tmp_path / "stack_0000.tif")
+    group.find_all_files()
+    return group
+
+
+def test_read_image_info_multi_page_tiff(tmp_path):
+    _write_stack(tmp_path)
+
+    assert read_image_info(tmp_path / "stack_0000.tif") == ImageInfo((5, 6, 7), np.dtype(np.uint16))
+    assert read_image_dimensions(tmp_path / "stack_0000.tif") == (5, 6, 7)
+
+
+def test_load_multi_page_tiff_is_memory_mapped(tmp_path):
+    group = _write_stack(tmp_path)
+
+    images = load(group, dtype=NATIVE_PIXEL_DEPTH, indices=[1, 5, 2])
+
+    assert images.is_read_only
+    assert images.shape == (2, 6, 7)
+    np.testing.assert_array_equal(images.data[:, 0, 0], [42, 126])
+
+    images.make_writable()
+
+    assert not images.is_read_only
+    assert images.uses_shared_memory
+    np.testing.assert_array_equal(images.data[:, 0, 0], [42, 126])
+
+
+@pytest.mark.parametrize("compression,dtype", [("zlib", NATIVE_PIXEL_DEPTH), (None, "float32")])
+def test_load_multi_page_tiff_is_read_when_not_mappable(tmp_path, compression, dtype):
+    group = _write_stack(tmp_path, compression)
+
+    with mock.patch("mantidimaging.core.io.loader.img_loader.tifffile.memmap", wraps=tifffile.memmap) as mock_memmap:
+        images = load(group, dtype=dtype)
+
+    assert not images.is_read_only
+    np.testing.assert_array_equal(images.data[:, 0, 0], [0, 42, 84, 126, 168])
+    if compression is not None:
+        # The pixel data is compressed, so it can not be mapped
+        mock_memmap.assert_called_once()
+    else:
+        mock_memmap.assert_not_called()
+
+
+@mock.patch('mantidimaging.core.io.loader.loader.load_log')
+def test_load_multi_page_tiff_in_angle_order(mock_load_log, tmp_path):
+    group = _write_stack(tmp_path)
+    mock_log_data = mock.create_autospec(InstrumentLog, instance=True, source_file=tmp_path / "log.txt")
+    mock_log_data.has_projection_angles.return_value = True
+    mock_log_data.projection_angles.return_value = ProjectionAngles(np.deg2rad([40, 0, 30, 10, 20]))
+    mock_load_log.return_value = mock_log_data
+
+    with mock.patch("mantidimaging.core.data.imagestack.ImageStack.set_projection_angles") as mock_set_angles:
+        images = load(group, dtype=NATIVE_PIXEL_DEPTH, log_file=Path())
+
+    assert not images.is_read_only
+    np.testing.assert_array_equal(images.data[:, 0, 0], [42, 126, 168, 84, 0])
+    np.testing.assert_allclose(np.rad2deg(mock_set_angles.call_args[0][0].value), [0, 10, 20, 30, 40])
+
+
+def test_load_average(tmp_path):
+    for i in range(4):
+        tifffile.imwrite(tmp_path / f"flat_{i:04d}.tif", np.full((6, 7), i, dtype=np.uint16))
+    group = FilenameGroup.from_file(tmp_path / "flat_0000.tif")
+    group.find_all_files()
+
+    images = load(group, dtype=NATIVE_PIXEL_DEPTH, average=True)
+
+    assert images.shape == (1, 6, 7)
+    assert images.dtype == np.float32
+    np.testing.assert_array_equal(images.data, 1.5)
+
+
+def _age_file(file_path: Path) -> None:
+    old = time.time() - 60
+    os.utime(file_path, (old, old))
+
+
+def test_load_log_parses_unchanged_file_once(tmp_path):
+    log_file = tmp_path / "IMAT_Spectra.txt"
+    log_file.write_text("0.012\t334937\n0.013\t331913\n")
+    _age_file(log_file)
+
+    first = load_log(log_file)
+    with mock.patch.object(InstrumentLog, "parse") as mock_parse:
+        second = load_log(log_file)
+    mock_parse.assert_not_called()
+
+    np.testing.assert_array_equal(second.get_column(LogColumn.SPECTRUM_COUNTS), [334937, 331913])
+    # Each caller gets its own copy, so changing one does not change the cache
+    second.data[LogColumn.SPECTRUM_COUNTS][0] = 0
+    assert first.get_column(LogColumn.SPECTRUM_COUNTS)[0] == 334937
+    assert load_log(log_file).get_column(LogColumn.SPECTRUM_COUNTS)[0] == 334937
+
+
+def test_load_log_parses_changed_file_again(tmp_path):
+    log_file = tmp_path / "IMAT_ShutterCount.txt"
+    log_file.write_text("0\t11\n1\t12\n")
+    _age_file(log_file)
+    assert load_shutter_counts(log_file).length == 2
+
+    log_file.write_text("0\t11\n1\t12\n2\t13\n")
+    _age_file(log_file)
+
+    assert load_shutter_counts(log_file).length == 3
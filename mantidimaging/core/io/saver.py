@@ -2,9 +2,12 @@
 # SPDX - License - Identifier: GPL-3.0-or-later
 from __future__ import annotations
 import datetime
+import io
+import queue
+import threading
 from logging import getLogger
 from typing import TYPE_CHECKING
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Iterator
 
 import h5py
 from pathlib import Path
@@ -15,12 +18,14 @@ from tifffile import tifffile
 from mantidimaging.core.operation_history.const import TIMESTAMP
 import astropy.io.fits as fits
 
-from .utility import DEFAULT_IO_FILE_FORMAT, NEXUS_PROCESSED_DATA_PATH
+from .utility import DEFAULT_IO_FILE_FORMAT, NEXUS_PROCESSED_DATA_PATH, TIFF_STACK_FORMAT
 from ..operations.rescale import RescaleFilter
+from ..parallel import manager as pm, utility as pu
 from ..utility.progress_reporting import Progress
 from ..utility.version_check import CheckVersion
 
 if TYPE_CHECKING:
+    import numpy.typing as npt
     from ..data.dataset import Dataset
     from ..data.imagestack import ImageStack
     from ..utility.data_containers import Indices
@@ -31,6 +36,13 @@ DEFAULT_ZFILL_LENGTH = 6
 DEFAULT_NAME_PREFIX = 'image'
 DEFAULT_NAME_POSTFIX = ''
 INT16_SIZE = 65536
+TIFF_STACK_COMPRESSION_TYPES = ("zlib", "zstd")
+NEXUS_COMPRESSION_TYPES = ("gzip", "lzf")
+# Image data is written to NeXus files in slabs of roughly this many bytes
+NEXUS_SLAB_BYTES = 256 * 1024**2
+
+VOLUME_WRITER_FORMATS = (DEFAULT_IO_FILE_FORMAT, TIFF_STACK_FORMAT, "h5")
+HDF5_VOLUME_PATH = "entry/data/data"
 
 package_version = CheckVersion().get_version()
 
@@ -45,6 +57,40 @@ def write_img(data: np.ndarray, filename: str, overwrite: bool = False, descript
     tifffile.imwrite(filename, data, description=description, metadata=None, software="Mantid Imaging")
 
 
+def write_tiff_stack(slices: Iterable[np.ndarray],
+                     shape: tuple[int, int, int],
+                     dtype: npt.DTypeLike,
+                     filename: str,
+                     description: str | None = "",
+                     compression: str | None = None,
+                     tile: tuple[int, int] | None = None) -> None:
+    """
+    Write a stack into a single BigTIFF file with one page per image. The images are taken from slices as they are
+    written, so the stack is never held in memory in the output type.
+    :param slices: The images to write, in order.
+    :param shape: The shape of the stack, (images, height, width).
+    :param description: Stored in the description tag of the first page.
+    :param compression: Optional compression, "zlib" or "zstd". A horizontal (or floating point) predictor is used
+                        with it to make the images more compressible.
+    :param tile: The (height, width) of the tiles each page is split into, or None to write the pages in strips.
+    """
+    if tile is not None:
+        # tifffile takes the tiles of each page in turn when writing a tiled stack from an iterator
+        slices = (image[y:y + tile[0], x:x + tile[1]] for image in slices for y in range(0, shape[1], tile[0])
+                  for x in range(0, shape[2], tile[1]))
+    with tifffile.TiffWriter(filename, bigtiff=True) as tif:
+        tif.write(slices,
+                  shape=shape,
+                  dtype=dtype,
+                  photometric="minisblack",
+                  compression=compression,
+                  predictor=compression is not None,
+                  tile=tile,
+                  description=description,
+                  metadata=None,
+                  software="Mantid Imaging")
+
+
 def write_nxs(data: np.ndarray,
               filename: str,
               projection_angles: np.ndarray | None = None,
@@ -78,7 +124,9 @@ def image_save(images: ImageStack,
                name_postfix: str = DEFAULT_NAME_POSTFIX,
                indices: list[int] | Indices | None = None,
                pixel_depth: str | None = None,
-               progress: Progress | None = None) -> list[Path]:
+               progress: Progress | None = None,
+               compression: str | None = None,
+               tile: tuple[int, int] | None = None) -> list[Path]:
     """
     Save image volume (3d) into a series of slices along the Z axis.
     The Z axis in the script is the ndarray.shape[0].
@@ -107,34 +155,67 @@ def image_save(images: ImageStack,
     :param pixel_depth: Defines the target pixel depth of the save operation so
            np.float32 or np.int16 will ensure the values are scaled
            correctly to these values.
+    :param compression: Only used by the tif stack format. Compress the
+           images with "zlib" or "zstd".
+    :param tile: Only used by the tif stack format. Write the images in
+           tiles of this (height, width) instead of in strips.
     :returns: The filename/filenames of the saved data.
     """
+    if compression is not None and compression not in TIFF_STACK_COMPRESSION_TYPES:
+        raise ValueError(f"The compression given is not handled: {compression}")
+
     progress = Progress.ensure_instance(progress, task_name='Save')
     output_dir = Path(output_dir).expanduser().resolve()
     make_dirs_if_needed(output_dir, overwrite_all)
 
-    min_value: float = np.nanmin(images.data)
-    max_value: float = np.nanmax(images.data)
-    int_16_slope = max_value / INT16_SIZE
-
     if pixel_depth is None or pixel_depth == "float32":
         rescale_params: dict[str, str | float] | None = None
         rescale_info = ""
     elif pixel_depth == "int16":
+        min_value, max_value = _nan_range(images.data)
+        int_16_slope = float(max_value) / INT16_SIZE
         rescale_params = {"offset": str(min_value), "slope": int_16_slope}
         rescale_info = f"offset = {rescale_params['offset']} \n slope = {rescale_params['slope']}"
     else:
         raise ValueError(f"The pixel depth given is not handled: {pixel_depth}")
 
+    data = images.data
+    if swap_axes:
+        data = np.swapaxes(data, 0, 1)
+
+    def output_slice(idx: int) -> np.ndarray:
+        if pixel_depth == "int16":
+            return RescaleFilter.filter_array(np.copy(data[idx]),
+                                              min_input=min_value,
+                                              max_input=max_value,
+                                              max_output=INT16_SIZE - 1).astype(np.uint16)
+        return data[idx, :, :]
+
+    if out_format == TIFF_STACK_FORMAT:
+        # The metadata goes in the file, so the stack is a single self-contained file
+        metadata = io.StringIO()
+        images.save_metadata(metadata, rescale_params)
+        filename = output_dir / f"{name_prefix}{name_postfix}.tif"
+        num_images = data.shape[0]
+        progress.set_estimated_steps(num_images)
+
+        def stack_slices() -> Iterator[np.ndarray]:
+            for idx in range(num_images):
+                image = output_slice(idx)
+                # tifffile stops asking for images after the last one, so count each image as it is handed over
+                progress.update(msg="Image")
+                yield image
+
+        with progress:
+            write_tiff_stack(stack_slices(), data.shape, np.uint16 if pixel_depth == "int16" else data.dtype,
+                             str(filename), metadata.getvalue(), compression, tile)
+        return [filename]
+
     metadata_filename = output_dir / f"{name_prefix}.json"
     LOG.debug(f"Metadata filename: {metadata_filename}")
     with metadata_filename.open("w+") as f:
         images.save_metadata(f, rescale_params)
 
-    data = images.data
-    if swap_axes:
-        data = np.swapaxes(data, 0, 1)
-
     if out_format in ["nxs"]:
         filename_base = output_dir / f"{name_prefix}{name_postfix}"
         filename_with_ext = filename_base.with_suffix(".nxs")
@@ -152,36 +233,222 @@ def image_save(images: ImageStack,
         names = generate_names(name_prefix, indices, num_images, custom_idx, zfill_len, name_postfix, out_format)
         names = [output_dir / name for name in names]
 
-        with progress:
-            for idx in range(num_images):
-                if pixel_depth == "int16":
-                    output_data = RescaleFilter.filter_array(np.copy(images.data[idx]),
-                                                             min_input=min_value,
-                                                             max_input=max_value,
-                                                             max_output=INT16_SIZE - 1).astype(np.uint16)
-                    write_func(output_data, str(names[idx]), overwrite_all, rescale_info)
-                else:
-                    write_func(data[idx, :, :], str(names[idx]), overwrite_all, rescale_info)
-
-                progress.update(msg="Image")
+        # Set on error or cancel, so the slices still queued are skipped
+        stop = threading.Event()
+
+        def save_one(idx: int) -> None:
+            if stop.is_set():
+                return
+            write_func(output_slice(idx), str(names[idx]), overwrite_all, rescale_info)
+
+        with pm.pool_in_use(num_images, use_threads=True):
+            # Encoding and writing mostly happen in numpy, tifffile and the OS with the GIL released
+            if pm.thread_pool is not None and num_images > 1:
+                saved: Iterator[None] = pm.thread_pool.imap(save_one, range(num_images))
+            else:
+                saved = map(save_one, range(num_images))
+            with progress:
+                try:
+                    for _ in saved:
+                        progress.update(msg="Image")
+                except Exception:
+                    stop.set()
+                    pu.drain_thread_results(saved)
+                    raise
 
         return names
 
 
-def nexus_save(dataset: Dataset, path: Path, sample_name: str, save_as_float: bool) -> None:
+def _nan_range(data: np.ndarray) -> tuple[float, float]:
+    """
+    Find the minimum and maximum of the data ignoring NaNs, reducing slabs of images in parallel on the thread pool.
+    :return: The minimum and maximum, which are NaN if all of the data is NaN.
+    """
+
+    def slab_range(slab: slice) -> tuple[float, float]:
+        # fmin and fmax ignore NaNs without warning about slabs that are all NaN
+        return np.fmin.reduce(data[slab], axis=None), np.fmax.reduce(data[slab], axis=None)
+
+    num_images = data.shape[0]
+    with pm.pool_in_use(num_images, use_threads=True):
+        slab_size = -(-num_images // (4 * pm.thread_pool_size)) if pm.thread_pool is not None else num_images
+        slabs = [slice(first, first + slab_size) for first in range(0, num_images, max(1, slab_size))]
+        if pm.thread_pool is not None and len(slabs) > 1:
+            ranges = pm.thread_pool.map(slab_range, slabs)
+        else:
+            ranges = [slab_range(slab) for slab in slabs]
+    mins, maxs = zip(*ranges, strict=True)
+    return np.fmin.reduce(mins), np.fmax.reduce(maxs)
+
+
+class VolumeWriter:
+    """
+    Writes a volume to disk a slab of images at a time on a background thread, while the caller produces the next
+    slab. At most max_queued slabs wait to be written, so the memory used is bounded by the slab size instead of the
+    size of the volume.
+
+    Used as a context manager: leaving it normally waits for the last slab to be written and raises any error from
+    the writing, leaving it with an exception abandons the writing.
+    """
+
+    def __init__(self,
+                 output_dir: str | Path,
+                 name_prefix: str,
+                 out_format: str,
+                 shape: tuple[int, int, int],
+                 dtype: npt.DTypeLike,
+                 metadata: str = "",
+                 overwrite_all: bool = False,
+                 max_queued: int = 1):
+        """
+        :param output_dir: Directory the volume is written into
+        :param name_prefix: Name of the stack or HDF5 file, or the prefix of the image names for a tif series
+        :param out_format: One of VOLUME_WRITER_FORMATS
+        :param shape: Shape of the whole volume, (images, height, width)
+        :param metadata: JSON metadata for the volume. Written next to a tif series, and inside a tif stack or HDF5
+                         file.
+        :param overwrite_all: Overwrite existing images with conflicting names
+        :param max_queued: Number of slabs that can wait to be written before write blocks
+        """
+        if out_format not in VOLUME_WRITER_FORMATS:
+            raise ValueError(f"The format given is not handled: {out_format}")
+
+        self.output_dir = Path(output_dir).expanduser().resolve()
+        make_dirs_if_needed(self.output_dir, overwrite_all)
+        self.name_prefix = name_prefix
+        self.out_format = out_format
+        self.shape = shape
+        self.dtype = np.dtype(dtype)
+        self.metadata = metadata
+        self.overwrite_all = overwrite_all
+
+        if out_format == DEFAULT_IO_FILE_FORMAT:
+            names = generate_names(name_prefix, None, shape[0], out_format=out_format)
+            self.filenames = [self.output_dir / name for name in names]
+        elif out_format == TIFF_STACK_FORMAT:
+            self.filenames = [self.output_dir / f"{name_prefix}.tif"]
+        else:
+            self.filenames = [self.output_dir / f"{name_prefix}.h5"]
+
+        self._queue: queue.Queue[ImageStack | None] = queue.Queue(maxsize=max_queued)
+        self._abandoned = threading.Event()
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(target=self._run, name="volume-writer", daemon=True)
+
+    def __enter__(self) -> VolumeWriter:
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type is not None:
+            self._abandoned.set()
+            self._thread.join()
+            return
+        self._put(None)
+        self._thread.join()
+        self._raise_if_failed()
+
+    def write(self, slab: ImageStack) -> None:
+        """
+        Queue the next slab of images to be written, waiting while the queue is full. The slab is released once it
+        has been written, and must not be modified until then.
+        """
+        self._put(slab)
+
+    def _put(self, slab: ImageStack | None) -> None:
+        while True:
+            self._raise_if_failed()
+            try:
+                self._queue.put(slab, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def _slabs(self) -> Iterator[ImageStack]:
+        written = 0
+        while True:
+            try:
+                slab = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                if self._abandoned.is_set():
+                    raise RuntimeError(f"Writing {self.filenames[0]} was abandoned") from None
+                continue
+            if slab is None:
+                break
+            yield slab
+            written += slab.num_images
+        if written != self.shape[0]:
+            raise ValueError(f"Expected {self.shape[0]} images to write, but {written} were given")
+
+    def _images(self) -> Iterator[np.ndarray]:
+        previous = None
+        for slab in self._slabs():
+            yield from slab.data
+            # The last image of a slab is still referenced while the next one is asked for, so its slab must not be
+            # freed until then
+            previous = slab
+        del previous
+
+    def _run(self) -> None:
+        try:
+            if self.out_format == DEFAULT_IO_FILE_FORMAT:
+                self._write_tiff_series()
+            elif self.out_format == TIFF_STACK_FORMAT:
+                write_tiff_stack(self._images(), self.shape, self.dtype, str(self.filenames[0]), self.metadata)
+            else:
+                self._write_hdf5()
+        except BaseException as exc:
+            self._error = exc
+
+    def _write_tiff_series(self) -> None:
+        index = 0
+        for slab in self._slabs():
+            for image_idx in range(slab.num_images):
+                write_img(slab.data[image_idx], str(self.filenames[index]), self.overwrite_all)
+                index += 1
+        metadata_filename = self.output_dir / f"{self.name_prefix}.json"
+        metadata_filename.write_text(self.metadata)
+
+    def _write_hdf5(self) -> None:
+        with h5py.File(self.filenames[0], "w") as nexus_file:
+            data = _create_image_dataset(nexus_file, HDF5_VOLUME_PATH, self.shape, self.dtype.name, None)
+            data.attrs["metadata"] = self.metadata
+            index = 0
+            for slab in self._slabs():
+                _write_slabs(data, index, slab.data)
+                index += slab.num_images
+
+
+def nexus_save(dataset: Dataset,
+               path: Path,
+               sample_name: str,
+               save_as_float: bool,
+               compression: str | None = None,
+               progress: Progress | None = None) -> None:
     """
     Uses information from a Dataset to create a NeXus file.
+    The image data is written straight to disk one slab at a time, so the file is never built up in memory.
     :param dataset: The dataset to save as a NeXus file.
     :param path: The NeXus file path.
     :param sample_name: The sample name.
+    :param save_as_float: Save the images as float32 if True, otherwise scale them to int16.
+    :param compression: Optional HDF5 compression filter for the image data, "gzip" or "lzf".
+    :param progress: Updated as each slab of images is written.
     """
+    if compression is not None and compression not in NEXUS_COMPRESSION_TYPES:
+        raise ValueError(f"The NeXus compression given is not handled: {compression}")
+
     try:
-        nexus_file = h5py.File(str(path), "w", driver="core")
+        nexus_file = h5py.File(str(path), "w")
     except OSError as exc:
         raise RuntimeError(f"Unable to save NeXus file. {exc}") from exc
 
     try:
-        _nexus_save(nexus_file, dataset, sample_name, save_as_float)
+        _nexus_save(nexus_file, dataset, sample_name, save_as_float, compression, progress)
     except OSError as exc:
         nexus_file.close()
         path.unlink(missing_ok=True)
@@ -189,66 +456,85 @@ def nexus_save(dataset: Dataset, path: Path, sample_name: str, save_as_float: bo
     nexus_file.close()
 
 
-def _nexus_save(nexus_file: h5py.File, dataset: Dataset, sample_name: str, save_as_float: bool) -> None:
+def _nexus_save(nexus_file: h5py.File,
+                dataset: Dataset,
+                sample_name: str,
+                save_as_float: bool,
+                compression: str | None = None,
+                progress: Progress | None = None) -> None:
     """
     Takes a NeXus file and writes the Dataset information to it.
     :param nexus_file: The NeXus file.
     :param dataset: The Dataset.
     :param sample_name: The sample name.
+    :param save_as_float: Save the images as float32 if True, otherwise scale them to int16.
+    :param compression: Optional HDF5 compression filter for the image data.
+    :param progress: Updated as each slab of images is written.
     """
-    # Top-level group
-    entry = nexus_file.create_group("entry1")
-    _set_nx_class(entry, "NXentry")
-
-    # Tomo entry
-    tomo_entry = entry.create_group("tomo_entry")
-    _set_nx_class(tomo_entry, "NXsubentry")
-
-    # definition field
-    tomo_entry.create_dataset("definition", data=np.bytes_("NXtomo"))
-
-    # instrument field
-    instrument_group = tomo_entry.create_group("instrument")
-    _set_nx_class(instrument_group, "NXinstrument")
-
-    # instrument/detector field
-    detector = instrument_group.create_group("detector")
-    _set_nx_class(detector, "NXdetector")
-    detector.create_dataset("image_key", data=dataset.image_keys)
-
-    # sample field
-    sample_group = tomo_entry.create_group("sample")
-    _set_nx_class(sample_group, "NXsample")
-    sample_group.create_dataset("name", data=np.bytes_(sample_name))
-
-    # rotation angle
-    rotation_angle = sample_group.create_dataset("rotation_angle", data=np.concatenate(dataset.nexus_rotation_angles))
-    rotation_angle.attrs["units"] = "rad"
-
-    if dataset.is_processed:
-        _save_processed_data_to_nexus(nexus_file, dataset, rotation_angle, detector["image_key"], save_as_float)
-    else:
-        _save_image_stacks_to_nexus(dataset, detector, save_as_float)
-
-    # data field
-    data = tomo_entry.create_group("data")
-    _set_nx_class(data, "NXdata")
-    data["rotation_angle"] = rotation_angle
-    data["image_key"] = detector["image_key"]
-
-    for recon in dataset.recons:
-        assert dataset.sample is not None
-        assert dataset.sample.filenames is not None
-        _save_recon_to_nexus(nexus_file, recon, str(dataset.sample.filenames[0]))
-
-
-def _save_processed_data_to_nexus(nexus_file: h5py.File, dataset: Dataset, rotation_angle: h5py.Dataset,
-                                  image_key: h5py.Dataset, save_as_float: bool) -> None:
+    num_images = sum(arr.shape[0] for arr in dataset.nexus_arrays) + sum(recon.num_images for recon in dataset.recons)
+    progress = Progress.ensure_instance(progress, num_steps=num_images, task_name="Save NeXus")
+
+    with progress:
+        # Top-level group
+        entry = nexus_file.create_group("entry1")
+        _set_nx_class(entry, "NXentry")
+
+        # Tomo entry
+        tomo_entry = entry.create_group("tomo_entry")
+        _set_nx_class(tomo_entry, "NXsubentry")
+
+        # definition field
+        tomo_entry.create_dataset("definition", data=np.bytes_("NXtomo"))
+
+        # instrument field
+        instrument_group = tomo_entry.create_group("instrument")
+        _set_nx_class(instrument_group, "NXinstrument")
+
+        # instrument/detector field
+        detector = instrument_group.create_group("detector")
+        _set_nx_class(detector, "NXdetector")
+        detector.create_dataset("image_key", data=dataset.image_keys)
+
+        # sample field
+        sample_group = tomo_entry.create_group("sample")
+        _set_nx_class(sample_group, "NXsample")
+        sample_group.create_dataset("name", data=np.bytes_(sample_name))
+
+        # rotation angle
+        rotation_angle = sample_group.create_dataset("rotation_angle",
+                                                     data=np.concatenate(dataset.nexus_rotation_angles))
+        rotation_angle.attrs["units"] = "rad"
+
+        if dataset.is_processed:
+            _save_processed_data_to_nexus(nexus_file, dataset, rotation_angle, detector["image_key"], save_as_float,
+                                          compression, progress)
+        else:
+            _save_image_stacks_to_nexus(dataset, detector, save_as_float, compression, progress)
+
+        # data field
+        data = tomo_entry.create_group("data")
+        _set_nx_class(data, "NXdata")
+        data["rotation_angle"] = rotation_angle
+        data["image_key"] = detector["image_key"]
+
+        for recon in dataset.recons:
+            assert dataset.sample is not None
+            assert dataset.sample.filenames is not None
+            _save_recon_to_nexus(nexus_file, recon, str(dataset.sample.filenames[0]), compression, progress)
+
+
+def _save_processed_data_to_nexus(nexus_file: h5py.File,
+                                  dataset: Dataset,
+                                  rotation_angle: h5py.Dataset,
+                                  image_key: h5py.Dataset,
+                                  save_as_float: bool,
+                                  compression: str | None = None,
+                                  progress: Progress | None = None) -> None:
     data = nexus_file.create_group(NEXUS_PROCESSED_DATA_PATH)
     data["rotation_angle"] = rotation_angle
     data["image_key"] = image_key
     _set_nx_class(data, "NXdata")
-    _save_image_stacks_to_nexus(dataset, data, save_as_float)
+    _save_image_stacks_to_nexus(dataset, data, save_as_float, compression, progress)
 
     process = data.create_group("process")
     _set_nx_class(process, "NXprocess")
@@ -257,50 +543,83 @@ def _save_processed_data_to_nexus(nexus_file: h5py.File, dataset: Dataset, rotat
     process.create_dataset("version", data=np.bytes_(package_version))
 
 
-def _save_image_stacks_to_nexus(dataset: Dataset, data_group: h5py.Group, save_as_float: bool) -> None:
-    combined_data_shape = (sum([len(arr) for arr in dataset.nexus_arrays]), ) + dataset.nexus_arrays[0].shape[1:]
+def _save_image_stacks_to_nexus(dataset: Dataset,
+                                data_group: h5py.Group,
+                                save_as_float: bool,
+                                compression: str | None = None,
+                                progress: Progress | None = None) -> None:
+    arrays = dataset.nexus_arrays
+    combined_data_shape = (sum([len(arr) for arr in arrays]), ) + arrays[0].shape[1:]
+    nexus_data = _create_image_dataset(data_group, "data", combined_data_shape, "float32" if save_as_float else "int16",
+                                       compression)
 
     index = 0
-    if save_as_float:
-        data = dataset.nexus_arrays
-        dtype = "float32"
-    else:
-        data, _ = _convert_float_to_int(dataset.nexus_arrays)
-        dtype = "int16"
+    for arr in arrays:
+        scaling_factor = None if save_as_float else _int16_scaling_factor(arr)
+        _write_slabs(nexus_data, index, arr, scaling_factor, progress)
+        index += arr.shape[0]
 
-    data_group.create_dataset("data", shape=combined_data_shape, dtype=dtype)
 
-    for arr in data:
-        data_group["data"][index:index + arr.shape[0]] = arr
-        index += arr.shape[0]
+def _create_image_dataset(group: h5py.Group, name: str, shape: tuple[int, ...], dtype: str,
+                          compression: str | None) -> h5py.Dataset:
+    """
+    Creates a dataset for a stack of images, chunked by image so that slabs of images can be written and read
+    without touching the rest of the data.
+    """
+    return group.create_dataset(name, shape=shape, dtype=dtype, chunks=(1, ) + shape[1:], compression=compression)
 
 
-def _convert_float_to_int(arrays: list[np.ndarray]) -> tuple[list[np.ndarray], list[int]]:
+def _write_slabs(nexus_data: h5py.Dataset,
+                 start: int,
+                 arr: np.ndarray,
+                 scaling_factor: float | None = None,
+                 progress: Progress | None = None) -> None:
     """
-    Scales a float array to convert it to ints.
-    :param arrays: The dataset arrays.
-    :return: A list of int arrays and a list of scaling factors.
+    Writes an array of images into a dataset one slab at a time, so only a single slab is ever converted in memory.
+    :param nexus_data: The dataset to write into.
+    :param start: The index of the dataset to write the first image to.
+    :param arr: The images to write.
+    :param scaling_factor: If given, the images are scaled by this and converted to int16.
+    :param progress: Updated after each slab is written.
     """
-    converted = []
-    factors = []
+    slab_size = max(1, NEXUS_SLAB_BYTES // max(1, arr[0].nbytes)) if arr.shape[0] else 1
+    for first in range(0, arr.shape[0], slab_size):
+        slab = arr[first:first + slab_size]
+        if scaling_factor is not None:
+            slab = _scale_to_int16(slab, scaling_factor)
+        nexus_data[start + first:start + first + slab.shape[0]] = slab
+        if progress is not None:
+            progress.update(steps=slab.shape[0], msg="Image")
 
-    def scale_row(row):
-        return np.round(row * scaling_factor).astype("int16")
 
-    for arr in arrays:
-        scaling_factor = np.iinfo("int16").max / max(abs(arr.min()), abs(arr.max()))
-        scaled_arr = np.apply_along_axis(scale_row, axis=1, arr=arr)
-        converted.append(scaled_arr)
-        factors.append(scaling_factor)
+def _int16_scaling_factor(arr: np.ndarray) -> float:
+    """
+    Finds the factor that scales the largest magnitude in an array to the int16 maximum.
+    :param arr: The float array.
+    :return: The scaling factor.
+    """
+    peak = max(abs(np.nanmin(arr)), abs(np.nanmax(arr)))
+    return float(np.iinfo("int16").max / peak) if peak else 1.0
+
 
-    return converted, factors
+def _scale_to_int16(arr: np.ndarray, scaling_factor: float) -> np.ndarray:
+    """
+    Scales a float array by a factor from _int16_scaling_factor and rounds it to int16.
+    """
+    return np.rint(arr * np.float32(scaling_factor)).astype("int16")
 
 
-def _save_recon_to_nexus(nexus_file: h5py.File, recon: ImageStack, sample_path: str) -> None:
+def _save_recon_to_nexus(nexus_file: h5py.File,
+                         recon: ImageStack,
+                         sample_path: str,
+                         compression: str | None = None,
+                         progress: Progress | None = None) -> None:
     """
     Saves a recon to a NeXus file.
     :param nexus_file: The NeXus file.
     :param recon: The recon data.
+    :param compression: Optional HDF5 compression filter for the recon data.
+    :param progress: Updated as each slab of the recon is written.
     """
     recon_entry = nexus_file.create_group(recon.name)
     _set_nx_class(recon_entry, "NXentry")
@@ -338,8 +657,10 @@ def _save_recon_to_nexus(nexus_file: h5py.File, recon: ImageStack, sample_path:
     data = recon_entry.create_group("data")
     _set_nx_class(data, "NXdata")
 
-    data.create_dataset("data", shape=recon.shape, dtype="float32")
-    data["data"][:] = recon.data
+    _write_slabs(_create_image_dataset(data, "data", recon.shape, "float32", compression),
+                 0,
+                 recon.data,
+                 progress=progress)
 
     x_arr, y_arr, z_arr = _create_pixel_size_arrays(recon)
     data.create_dataset("x", shape=x_arr.shape, dtype="float16", data=x_arr)
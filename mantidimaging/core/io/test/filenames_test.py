@@ -2,13 +2,16 @@
 # SPDX - License - Identifier: GPL-3.0-or-later
 from __future__ import annotations
 
+import os
 from pathlib import Path
+import time
 import unittest
+from unittest import mock
 
 from parameterized import parameterized
 
 from mantidimaging.test_helpers.unit_test_helper import FakeFSTestCase
-from ..filenames import FilenameGroup, FilenamePattern, FilenamePatternGolden
+from ..filenames import DirectoryIndex, FilenameGroup, FilenamePattern, FilenamePatternGolden
 from ...utility.data_containers import FILE_TYPES
 
 
@@ -292,6 +295,7 @@ class FilenameGroupTest(FakeFSTestCase):
         ("/a/Tomo/foo_Tomo_%06d.tif", "/a/Flat_Before/foo_Flat_Before_%06d.tif"),
         ("/a/Tomo/foo_Tomo_%06d.tif", "/a/Flat/foo_Flat_%06d.tif"),
         ("/a/tomo/foo_tomo_%06d.tif", "/a/flat_before/foo_flat_before_%06d.tif"),
+        ("/a/Tomo/foo_Tomo_%06d.tif", "/a/FLAT_BEFORE/foo_Flat_Before_%06d.tif"),
         ("/foo/Tomo/IMAT00026734_Tomo_CoinCell_7_Angled_PH40_Tomo_%03d.tif",
          "/foo/Flat_Before/IMAT00026732_Tomo_CoinCell_7_Angled_PH40_Flat_Before_%03d.tif"),
     ])
@@ -325,6 +329,19 @@ class FilenameGroupTest(FakeFSTestCase):
 
         self._file_list_count_equal(proj_180_list, list(proj_180_fg.all_files()))
 
+    def test_find_related_proj_180_different_case(self):
+        tomo_list = [Path(f"/a/Tomo/foo_Tomo_{i:06d}.tif") for i in range(10)]
+        proj_180_list = [Path("/a/180DEG/foo_180Deg.tif")]
+        for file_name in tomo_list + proj_180_list:
+            self.fs.create_file(file_name)
+
+        fg = FilenameGroup.from_file(tomo_list[0])
+        proj_180_fg = fg.find_related(FILE_TYPES.PROJ_180)
+        self.assertIsNotNone(proj_180_fg)
+        proj_180_fg.find_all_files()
+
+        self._file_list_count_equal(proj_180_list, list(proj_180_fg.all_files()))
+
     def test_find_related_proj_180_GRtomo(self):
         proj_name = "/a/180deg/foo_GR_180deg_180.0_000.tif"
         tomo_list = [Path("/a/GRtomo/foo_GRtomo_%01d.%04d_%03d.tif" % (i, i, i)) for i in range(10)]
@@ -381,3 +398,105 @@ class GoldenFilenameGroupTest(FakeFSTestCase):
         group.find_all_files()
 
         self._file_list_count_equal(filenames, group.all_files())
+
+
+class DirectoryIndexTest(FakeFSTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        DirectoryIndex.clear_cache()
+        self.directory = Path("/data/Tomo")
+        for i in range(3):
+            self.fs.create_file(self.directory / f"IMAT_Flower_Tomo_{i:06d}.tif")
+        self.fs.create_file(self.directory / "IMAT_Flower_Tomo_ShutterCount.TXT")
+        self.fs.create_dir(self.directory / "subdir")
+
+    def _age_directory(self) -> None:
+        old = time.time() - 60
+        os.utime(self.directory, (old, old))
+
+    def test_index(self):
+        index = DirectoryIndex.get(self.directory)
+
+        self.assertEqual(index.file_names,
+                         [f"IMAT_Flower_Tomo_{i:06d}.tif" for i in range(3)] + ["IMAT_Flower_Tomo_ShutterCount.TXT"])
+        self.assertEqual(index.dir_names, ["subdir"])
+        self.assertIn("subdir", index)
+        self.assertTrue(index.has_dir("subdir"))
+        self.assertFalse(index.has_dir("IMAT_Flower_Tomo_000000.tif"))
+
+    def test_find_is_case_insensitive(self):
+        index = DirectoryIndex.get(self.directory)
+
+        self.assertTrue(index.has_dir("SUBDIR"))
+        self.assertEqual(index.find_dir("SubDir"), self.directory / "subdir")
+        self.assertEqual(index.find_file("imat_flower_tomo_shuttercount.txt"),
+                         self.directory / "IMAT_Flower_Tomo_ShutterCount.TXT")
+        self.assertIsNone(index.find_dir("IMAT_Flower_Tomo_000000.tif"))
+        self.assertIsNone(index.find_file("subdir"))
+
+    def test_find_prefers_exact_case(self):
+        self.fs.create_dir(self.directory / "SUBDIR")
+        index = DirectoryIndex.get(self.directory)
+
+        self.assertEqual(index.find_dir("subdir"), self.directory / "subdir")
+        self.assertEqual(index.find_dir("SUBDIR"), self.directory / "SUBDIR")
+
+    def test_least_recently_used_index_evicted(self):
+        self._age_directory()
+        index = DirectoryIndex.get(self.directory)
+        with mock.patch("mantidimaging.core.io.filenames.DIRECTORY_INDEX_CACHE_SIZE", 2):
+            for name in ["a", "b"]:
+                self.fs.create_dir(Path("/other") / name)
+                DirectoryIndex.get(Path("/other") / name)
+                self.assertLessEqual(len(DirectoryIndex._cache), 2)
+
+        self.assertNotIn(self.directory, DirectoryIndex._cache)
+        self.assertIsNot(DirectoryIndex.get(self.directory), index)
+
+    def test_glob_is_case_insensitive(self):
+        index = DirectoryIndex.get(self.directory)
+
+        self.assertEqual(index.glob("*shuttercount.txt"), [self.directory / "IMAT_Flower_Tomo_ShutterCount.TXT"])
+        self.assertEqual(index.glob("*.csv"), [])
+
+    def test_index_reused_while_directory_unchanged(self):
+        self._age_directory()
+        index = DirectoryIndex.get(self.directory)
+
+        with mock.patch("mantidimaging.core.io.filenames.os.scandir") as mock_scandir:
+            self.assertIs(DirectoryIndex.get(self.directory), index)
+        mock_scandir.assert_not_called()
+
+    def test_recently_changed_directory_not_reused(self):
+        now = time.time()
+        os.utime(self.directory, (now, now))
+        index = DirectoryIndex.get(self.directory)
+
+        self.assertIsNot(DirectoryIndex.get(self.directory), index)
+
+    def test_find_indexes_in_joined_names(self):
+        pattern = FilenamePattern.from_name("IMAT_Flower_Tomo_000000.tif")
+
+        indexes = pattern.find_indexes("\n".join([
+            "IMAT_Flower_Tomo_000002.tif", "other_000001.tif", "IMAT_Flower_Tomo_1000000.tif",
+            "IMAT_Flower_Tomo_000001.tiff"
+        ]))
+
+        self.assertEqual(indexes, [2, 1000000])
+
+
+def test_index_rescanned_when_directory_changes(tmp_path):
+    DirectoryIndex.clear_cache()
+    for i in range(3):
+        (tmp_path / f"IMAT_Flower_Tomo_{i:06d}.tif").touch()
+    old = time.time() - 60
+    os.utime(tmp_path, (old, old))
+    index = DirectoryIndex.get(tmp_path)
+    assert DirectoryIndex.get(tmp_path) is index
+
+    (tmp_path / "IMAT_Flower_Tomo_000003.tif").touch()
+    group = FilenameGroup.from_file(tmp_path / "IMAT_Flower_Tomo_000000.tif")
+    group.find_all_files()
+
+    assert group.all_indexes == [0, 1, 2, 3]
@@ -1,18 +1,22 @@
 # Copyright (C) 2021 ISIS Rutherford Appleton Laboratory UKRI
 # SPDX - License - Identifier: GPL-3.0-or-later
 from __future__ import annotations
+import contextlib
 import datetime
 import pathlib
 import unittest
+from multiprocessing.pool import ThreadPool
 from pathlib import Path
 from unittest import mock
 
 import h5py
 import numpy as np
 import numpy.testing as npt
+import tifffile
 
 from mantidimaging.core.io.filenames import FilenameGroup
 from mantidimaging.core.io.utility import NEXUS_PROCESSED_DATA_PATH
+from mantidimaging.core.operation_history import const
 from mantidimaging.core.operation_history.const import TIMESTAMP
 
 import mantidimaging.test_helpers.unit_test_helper as th
@@ -21,7 +25,7 @@ from mantidimaging.core.data.dataset import Dataset
 from mantidimaging.core.io import loader
 from mantidimaging.core.io import saver
 from mantidimaging.core.io.saver import _rescale_recon_data, _save_recon_to_nexus, _save_processed_data_to_nexus, \
-    _save_image_stacks_to_nexus, _convert_float_to_int
+    _save_image_stacks_to_nexus, _int16_scaling_factor, _scale_to_int16
 from mantidimaging.core.utility.version_check import CheckVersion
 from mantidimaging.test_helpers import FileOutputtingTestCase
 
@@ -185,6 +189,181 @@ class IOTest(FileOutputtingTestCase):
         # Ensure properties have been preserved
         self.assertEqual(loaded_images.metadata, images.metadata)
 
+    def _save_with_thread_pool(self, images: ImageStack, **kwargs) -> list[Path]:
+        thread_pool = ThreadPool(4)
+        self.addCleanup(thread_pool.terminate)
+        with mock.patch("mantidimaging.core.io.saver.pm") as mock_pm:
+            mock_pm.thread_pool = thread_pool
+            mock_pm.thread_pool_size = 4
+            mock_pm.pool_in_use.return_value = contextlib.nullcontext()
+            return saver.image_save(images, self.output_directory, **kwargs)
+
+    def test_parallel_int16_save_matches_serial(self):
+        images = th.generate_images(shape=(12, 8, 10))
+        images.data[3, 2, 2] = np.nan
+        progress = mock.MagicMock()
+
+        parallel_names = self._save_with_thread_pool(images, pixel_depth="int16", progress=progress)
+        parallel = [tifffile.imread(name) for name in parallel_names]
+        parallel_metadata = (Path(self.output_directory) / f"{saver.DEFAULT_NAME_PREFIX}.json").read_text()
+        serial_names = saver.image_save(images, self.output_directory, pixel_depth="int16", overwrite_all=True)
+
+        self.assertEqual(parallel_names, serial_names)
+        for name, expected in zip(serial_names, parallel, strict=True):
+            npt.assert_array_equal(tifffile.imread(name), expected)
+        self.assertEqual((Path(self.output_directory) / f"{saver.DEFAULT_NAME_PREFIX}.json").read_text(),
+                         parallel_metadata)
+        self.assertEqual(progress.update.call_count, images.num_images)
+
+    def test_parallel_save_stops_after_failed_write(self):
+        images = th.generate_images(shape=(12, 8, 10))
+        with mock.patch("mantidimaging.core.io.saver.write_img", side_effect=OSError("disk full")) as write_mock:
+            with self.assertRaises(OSError):
+                self._save_with_thread_pool(images)
+        self.assertLessEqual(write_mock.call_count, images.num_images)
+
+    def test_nan_range_ignores_nans(self):
+        data = th.gen_img_numpy_rand((9, 4, 4))
+        data[0] = np.nan
+        data[4, 1, 1] = np.nan
+        thread_pool = ThreadPool(2)
+        self.addCleanup(thread_pool.terminate)
+        with mock.patch("mantidimaging.core.io.saver.pm") as mock_pm:
+            mock_pm.thread_pool = thread_pool
+            mock_pm.thread_pool_size = 2
+            mock_pm.pool_in_use.return_value = contextlib.nullcontext()
+            self.assertEqual(saver._nan_range(data), (np.nanmin(data), np.nanmax(data)))
+
+    def _load_tiff_stack(self, filename: Path) -> ImageStack:
+        group = FilenameGroup.from_file(filename)
+        group.find_all_files()
+        return loader.load(group)
+
+    def test_tiff_stack_round_trip(self):
+        images = th.generate_images(shape=(6, 20, 30))
+        images.pixel_size = 12
+        images.record_operation("MedianFilter", "Median", size=3)
+
+        names = saver.image_save(images, self.output_directory, out_format=saver.TIFF_STACK_FORMAT)
+
+        self.assertEqual(names, [Path(self.output_directory) / f"{saver.DEFAULT_NAME_PREFIX}.tif"])
+        self.assertEqual(list(Path(self.output_directory).iterdir()), names)
+        with tifffile.TiffFile(names[0]) as tif:
+            self.assertTrue(tif.is_bigtiff)
+            self.assertEqual(len(tif.pages), images.num_images)
+        loaded = self._load_tiff_stack(names[0])
+        npt.assert_array_equal(loaded.data, images.data)
+        self.assertEqual(loaded.pixel_size, 12)
+        self.assertEqual(loaded.metadata, images.metadata)
+
+    def test_compressed_tiled_tiff_stack_round_trip(self):
+        images = th.generate_images(shape=(4, 40, 50))
+
+        names = saver.image_save(images,
+                                 self.output_directory,
+                                 out_format=saver.TIFF_STACK_FORMAT,
+                                 compression="zstd",
+                                 tile=(32, 32))
+
+        with tifffile.TiffFile(names[0]) as tif:
+            self.assertTrue(tif.pages[0].is_tiled)
+            self.assertEqual(tif.pages[0].compression, tifffile.COMPRESSION.ZSTD)
+        loaded = self._load_tiff_stack(names[0])
+        npt.assert_array_equal(loaded.data, images.data)
+
+    def test_int16_tiff_stack_matches_image_series(self):
+        images = th.generate_images(shape=(5, 8, 10))
+        progress = mock.MagicMock()
+
+        stack_name = saver.image_save(images,
+                                      Path(self.output_directory) / "stack",
+                                      out_format=saver.TIFF_STACK_FORMAT,
+                                      pixel_depth="int16",
+                                      compression="zlib",
+                                      progress=progress)[0]
+        series_names = saver.image_save(images, Path(self.output_directory) / "series", pixel_depth="int16")
+
+        npt.assert_array_equal(tifffile.imread(stack_name), np.stack([tifffile.imread(n) for n in series_names]))
+        self.assertEqual(progress.update.call_count, images.num_images)
+        self.assertIn(const.RESCALED, self._load_tiff_stack(stack_name).metadata)
+
+    def test_image_save_rejects_unknown_compression(self):
+        with self.assertRaises(ValueError):
+            saver.image_save(th.generate_images(), self.output_directory, compression="lzw")
+
+    def _write_volume(self,
+                      out_format: str,
+                      volume: np.ndarray,
+                      slab_height: int,
+                      num_images: int | None = None) -> saver.VolumeWriter:
+        with saver.VolumeWriter(self.output_directory, "recon", out_format, volume.shape, volume.dtype,
+                                '{"pixel_size": 3}') as writer:
+            for start in range(0, num_images or volume.shape[0], slab_height):
+                writer.write(ImageStack(volume[start:start + slab_height]))
+        return writer
+
+    def test_volume_writer_tiff_series(self):
+        images = th.generate_images(shape=(7, 10, 10))
+        volume = images.data
+
+        writer = self._write_volume(saver.DEFAULT_IO_FILE_FORMAT, volume, 3)
+
+        self.assertEqual(len(writer.filenames), volume.shape[0])
+        npt.assert_array_equal(np.stack([tifffile.imread(name) for name in writer.filenames]), volume)
+        self.assertEqual((Path(self.output_directory) / "recon.json").read_text(), '{"pixel_size": 3}')
+
+    def test_volume_writer_tiff_stack(self):
+        images = th.generate_images(shape=(7, 10, 10))
+        volume = images.data
+
+        writer = self._write_volume(saver.TIFF_STACK_FORMAT, volume, 3)
+
+        self.assertEqual(writer.filenames, [Path(self.output_directory) / "recon.tif"])
+        loaded = self._load_tiff_stack(writer.filenames[0])
+        npt.assert_array_equal(loaded.data, volume)
+        self.assertEqual(loaded.pixel_size, 3)
+
+    def test_volume_writer_hdf5(self):
+        images = th.generate_images(shape=(7, 10, 10))
+        volume = images.data
+
+        writer = self._write_volume("h5", volume, 3)
+
+        with h5py.File(writer.filenames[0], "r") as nexus_file:
+            data = nexus_file[saver.HDF5_VOLUME_PATH]
+            self.assertEqual(data.chunks, (1, 10, 10))
+            npt.assert_array_equal(data[:], volume)
+            self.assertEqual(data.attrs["metadata"], '{"pixel_size": 3}')
+
+    def test_volume_writer_raises_if_images_are_missing(self):
+        images = th.generate_images(shape=(7, 10, 10))
+        volume = images.data
+
+        with self.assertRaisesRegex(ValueError, "Expected 7 images"):
+            self._write_volume("h5", volume, 3, num_images=5)
+
+    def test_volume_writer_raises_write_errors_to_the_producer(self):
+        images = th.generate_images(shape=(6, 10, 10))
+        volume = images.data
+
+        with mock.patch("mantidimaging.core.io.saver.write_img", side_effect=OSError("disk full")):
+            with self.assertRaisesRegex(OSError, "disk full"):
+                self._write_volume(saver.DEFAULT_IO_FILE_FORMAT, volume, 1)
+
+    def test_volume_writer_abandons_writing_on_error(self):
+        images = th.generate_images(shape=(6, 10, 10))
+        volume = images.data
+
+        with self.assertRaises(KeyError):
+            with saver.VolumeWriter(self.output_directory, "recon", "h5", volume.shape, volume.dtype) as writer:
+                writer.write(ImageStack(volume[:3]))
+                raise KeyError("reconstruction failed")
+        self.assertFalse(writer._thread.is_alive())
+
+    def test_volume_writer_rejects_unknown_format(self):
+        with self.assertRaises(ValueError):
+            saver.VolumeWriter(self.output_directory, "recon", "fits", (1, 2, 2), np.float32)
+
     def test_nexus_simple_dataset_save(self):
         sample = th.generate_images()
         sample.data *= 12
@@ -471,12 +650,45 @@ class IOTest(FileOutputtingTestCase):
     def test_convert_float_to_int(self):
         n_arrs = 3
         float_arr = [th.gen_img_numpy_rand() for _ in range(3)]
-        conv, factors = _convert_float_to_int(float_arr)
+        factors = [_int16_scaling_factor(arr) for arr in float_arr]
+        conv = [_scale_to_int16(arr, factor) for arr, factor in zip(float_arr, factors, strict=True)]
 
         for i in range(n_arrs):
+            self.assertEqual(conv[i].dtype, np.int16)
             close_arr = np.isclose(conv[i] / factors[i], float_arr[i], rtol=1e-5)
             self.assertTrue(np.count_nonzero(close_arr) >= len(close_arr) * 0.75)
 
+    def test_int16_scaling_factor_of_zeros(self):
+        self.assertEqual(_int16_scaling_factor(np.zeros((2, 3, 3))), 1.0)
+
+    @mock.patch("mantidimaging.core.io.saver.NEXUS_SLAB_BYTES", 1)
+    def test_save_image_stacks_to_nexus_as_int_in_slabs(self):
+        ds = Dataset(sample=th.generate_images(), flat_before=th.generate_images())
+        progress = mock.Mock()
+
+        with h5py.File("path", "w", driver="core", backing_store=False) as nexus_file:
+            data = nexus_file.create_group("data")
+            _save_image_stacks_to_nexus(ds, data, False, progress=progress)
+            expected = np.concatenate(
+                [_scale_to_int16(arr, _int16_scaling_factor(arr)) for arr in [ds.flat_before.data, ds.sample.data]])
+            npt.assert_array_equal(data["data"][:], expected)
+
+        self.assertEqual(progress.update.call_count, expected.shape[0])
+
+    def test_save_image_stacks_to_nexus_chunked_and_compressed(self):
+        ds = Dataset(sample=th.generate_images())
+
+        with h5py.File("path", "w", driver="core", backing_store=False) as nexus_file:
+            data = nexus_file.create_group("data")
+            _save_image_stacks_to_nexus(ds, data, True, compression="gzip")
+            self.assertEqual(data["data"].chunks, (1, ) + ds.sample.data.shape[1:])
+            self.assertEqual(data["data"].compression, "gzip")
+            npt.assert_array_equal(data["data"][:], ds.sample.data)
+
+    def test_nexus_save_rejects_unknown_compression(self):
+        with self.assertRaises(ValueError):
+            saver.nexus_save(Dataset(sample=th.generate_images()), Path("path"), "sample-name", True, "bzip2")
+
     def test_create_rits_format(self):
         tof = np.array([1, 2, 3])
         transmission = np.array([4, 5, 6])
@@ -9,6 +9,8 @@ from logging import getLogger
 log = getLogger(__name__)
 
 DEFAULT_IO_FILE_FORMAT = 'tif'
+# Saves the whole stack to one multi-page BigTIFF file, instead of one file per image
+TIFF_STACK_FORMAT = 'tif stack'
 NEXUS_PROCESSED_DATA_PATH = 'processed-data'
 
 THRESHOLD_180 = np.radians(1)
@@ -21,6 +21,12 @@ COR_TILT_ROTATION_CENTRES = 'rotation_centres'
 OPERATION_NAME_CROP = 'crop_coords'
 CROP_REGION_OF_INTEREST = 'region_of_interest'
 
+OPERATION_NAME_BIN_ON_LOAD = 'bin_on_load'
+
+OPERATION_NAME_AVERAGE_ON_LOAD = 'average_on_load'
+AVERAGE_NUM_IMAGES = 'num_images'
+AVERAGE_FRAME_MEANS = 'frame_means'
+
 OPERATION_NAME_TOMOPY_RECON = "tomopy_recon"
 
 SINOGRAMS = "sinograms"
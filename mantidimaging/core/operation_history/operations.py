@@ -4,12 +4,21 @@ from __future__ import annotations
 
 from functools import partial
 from logging import getLogger
-from typing import Any
+from typing import TYPE_CHECKING, Any
 from collections.abc import Callable, Iterable
 
+import numpy as np
+
 from mantidimaging.core.operations.loader import load_filter_packages
+from mantidimaging.core.parallel import shared as ps
+from mantidimaging.core.parallel import utility as pu
 from . import const
 
+if TYPE_CHECKING:
+    from mantidimaging.core.data import ImageStack
+    from mantidimaging.core.operations.base_filter import BaseFilter, SliceCompute
+    from mantidimaging.core.utility.progress_reporting import Progress
+
 MODULE_NOT_FOUND = "Could not find module with name '{}'"
 
 
@@ -58,3 +67,81 @@ def deserialize_metadata(metadata: dict[str, Any]) -> list[ImageOperation]:
 def ops_to_partials(filter_ops: Iterable[ImageOperation]) -> Iterable[partial]:
     filter_funcs: dict[str, Callable] = {f.__name__: f.filter_func for f in load_filter_packages()}
     return (op.to_partial(filter_funcs) for op in filter_ops)
+
+
+def _compute_fused_slice(index: int, arrays: np.ndarray | list[np.ndarray], params: dict[str, Any]) -> None:
+    if not isinstance(arrays, list):
+        arrays = [arrays]
+    for func, func_params, extra_arrays in params['steps']:
+        if extra_arrays:
+            func(index, [arrays[0]] + [arrays[i] for i in extra_arrays], func_params)
+        else:
+            func(index, arrays[0], func_params)
+
+
+def _run_fused_stage(images: ImageStack, stage: list[tuple[type[BaseFilter], SliceCompute]],
+                     progress: Progress | None) -> None:
+    # The reference arrays of every step are passed after the stack, and each step is given the positions of its own
+    arrays = [images.shared_array]
+    steps = []
+    for _, compute in stage:
+        steps.append((compute.func, compute.params, range(len(arrays), len(arrays) + len(compute.arrays))))
+        arrays.extend(compute.arrays)
+    params = {'steps': steps}
+    cost = pu.SliceCost.LOW if all(compute.cost == pu.SliceCost.LOW for _, compute in stage) else pu.SliceCost.HIGH
+    use_threads = all(filter_class.releases_gil for filter_class, _ in stage)
+    getLogger(__name__).info(f"Running fused operations: {[filter_class.filter_name for filter_class, _ in stage]}")
+    ps.run_compute_func(_compute_fused_slice,
+                        images.shape[0],
+                        arrays,
+                        params,
+                        progress,
+                        cost=cost,
+                        use_threads=use_threads)
+
+
+def run_operations(images: ImageStack,
+                   filter_ops: Iterable[ImageOperation],
+                   progress: Progress | None = None) -> ImageStack:
+    """
+    Apply a sequence of operations, such as a stack's operation history, to images.
+
+    Consecutive operations that process each projection independently are fused, so that each slice passes through
+    all of them in a single pass over the stack while it is still in cache. Operations that need the whole stack are
+    run on their own and split the sequence into stages. Each operation is recorded in the operation history of images.
+    """
+    filter_classes: dict[str, type[BaseFilter]] = {f.__name__: f for f in load_filter_packages()}
+    filter_funcs: dict[str, Callable] = {name: f.filter_func for name, f in filter_classes.items()}
+    stage: list[tuple[type[BaseFilter], SliceCompute]] = []
+    stage_ops: list[ImageOperation] = []
+
+    def finish_stage():
+        if stage:
+            _run_fused_stage(images, stage, progress)
+            for stage_op in stage_ops:
+                images.record_operation(stage_op.filter_name, stage_op.display_name, **stage_op.filter_kwargs)
+            stage.clear()
+            stage_ops.clear()
+
+    for op in filter_ops:
+        if op.filter_name not in filter_classes:
+            msg = MODULE_NOT_FOUND.format(op.filter_name)
+            getLogger(__name__).error(msg)
+            raise KeyError(msg)
+        filter_class = filter_classes[op.filter_name]
+        if filter_class.requires_float:
+            images.promote_to_float(progress=progress)
+        images.make_writable(progress=progress)
+        compute = filter_class.slice_compute(images, **op.filter_kwargs)
+        if compute is not None:
+            stage.append((filter_class, compute))
+            stage_ops.append(op)
+            continue
+
+        finish_stage()
+        result = op.to_partial(filter_funcs)(images, progress=progress)
+        if result is not None:
+            images = result
+        images.record_operation(op.filter_name, op.display_name, **op.filter_kwargs)
+    finish_stage()
+    return images
@@ -3,8 +3,20 @@
 from __future__ import annotations
 
 import unittest
+from unittest import mock
 
-from mantidimaging.core.operation_history import operations
+import numpy as np
+import numpy.testing as npt
+
+from mantidimaging.core.data import ImageStack
+from mantidimaging.core.operation_history import const, operations
+from mantidimaging.core.operations.clip_values import ClipValuesFilter
+from mantidimaging.core.operations.divide import DivideFilter
+from mantidimaging.core.operations.flat_fielding import FlatFieldFilter
+from mantidimaging.core.operations.median_filter import MedianFilter
+from mantidimaging.core.operations.rebin import RebinFilter
+from mantidimaging.core.parallel import utility as pu
+from mantidimaging.test_helpers.unit_test_helper import generate_images
 from mantidimaging.core.operation_history.operations import (MODULE_NOT_FOUND, ImageOperation)
 
 
@@ -23,3 +35,137 @@ class OperationHistoryTest(unittest.TestCase):
         ops = operations.ops_to_partials(in_ops)
         with self.assertRaisesRegex(KeyError, MODULE_NOT_FOUND.format(fake_module_name)):
             list(ops)
+
+    def test_run_operations_matches_applying_filters_one_by_one(self):
+        in_ops = [
+            ImageOperation("DivideFilter", {
+                "value": 2,
+                "unit": "cm"
+            }, "Divide"),
+            ImageOperation("ClipValuesFilter", {
+                "clip_min": 0.2,
+                "clip_max": 0.4
+            }, "Clip Values"),
+            ImageOperation("MedianFilter", {
+                "size": 3,
+                "force_cpu": True
+            }, "Median"),
+        ]
+        images = generate_images()
+        expected = images.copy()
+        DivideFilter.filter_func(expected, value=2, unit="cm")
+        ClipValuesFilter.filter_func(expected, clip_min=0.2, clip_max=0.4)
+        MedianFilter.filter_func(expected, size=3, force_cpu=True)
+
+        with mock.patch("mantidimaging.core.operation_history.operations.ps.run_compute_func",
+                        wraps=operations.ps.run_compute_func) as run_compute_func:
+            result = operations.run_operations(images, in_ops)
+
+        run_compute_func.assert_called_once()
+        npt.assert_allclose(result.data, expected.data, rtol=1e-6)
+        self.assertEqual([op.filter_name for op in operations.deserialize_metadata(result.metadata)],
+                         ["DivideFilter", "ClipValuesFilter", "MedianFilter"])
+
+    def test_run_operations_splits_stages_at_whole_stack_operations(self):
+        in_ops = [
+            ImageOperation("DivideFilter", {
+                "value": 2,
+                "unit": "cm"
+            }, "Divide"),
+            ImageOperation("RebinFilter", {
+                "rebin_param": 0.5,
+                "mode": "reflect"
+            }, "Rebin"),
+            ImageOperation("ClipValuesFilter", {
+                "clip_min": 0.2,
+                "clip_max": 0.4
+            }, "Clip Values"),
+        ]
+        images = generate_images()
+        expected = images.copy()
+        DivideFilter.filter_func(expected, value=2, unit="cm")
+        expected = RebinFilter.filter_func(expected, rebin_param=0.5, mode="reflect")
+        ClipValuesFilter.filter_func(expected, clip_min=0.2, clip_max=0.4)
+
+        with mock.patch("mantidimaging.core.operation_history.operations._run_fused_stage",
+                        wraps=operations._run_fused_stage) as run_fused_stage:
+            result = operations.run_operations(images, in_ops)
+
+        self.assertEqual(run_fused_stage.call_count, 2)
+        npt.assert_allclose(result.data, expected.data, rtol=1e-6)
+        self.assertEqual(len(result.metadata[const.OPERATION_HISTORY]), 3)
+
+    def test_fused_stage_passes_reference_arrays_to_their_step(self):
+        images = generate_images()
+        flat = generate_images()
+        dark = generate_images()
+        dark.data *= 0.1
+        expected = images.copy()
+        DivideFilter.filter_func(expected, value=2, unit="cm")
+        FlatFieldFilter.filter_func(expected, flat_before=flat, dark_before=dark, selected_flat_fielding="Only Before")
+        DivideFilter.filter_func(expected, value=2, unit="cm")
+
+        divide = DivideFilter.slice_compute(images, value=2, unit="cm")
+        flat_field = FlatFieldFilter.slice_compute(images, flat, None, dark, None, "Only Before")
+        operations._run_fused_stage(images, [(DivideFilter, divide), (FlatFieldFilter, flat_field),
+                                             (DivideFilter, divide)], None)
+
+        npt.assert_allclose(images.data, expected.data, rtol=1e-6)
+
+    def test_run_operations_does_not_fuse_gpu_median(self):
+        images = generate_images()
+        self.assertIsNone(MedianFilter.slice_compute(images, size=3, force_cpu=False))
+        self.assertIsNotNone(MedianFilter.slice_compute(images, size=3, force_cpu=True))
+
+    def test_run_operations_validates_before_running(self):
+        in_ops = [
+            ImageOperation("DivideFilter", {
+                "value": 2,
+                "unit": "cm"
+            }, "Divide"),
+            ImageOperation("ClipValuesFilter", {}, "Clip Values"),
+        ]
+        images = generate_images()
+        original = np.copy(images.data)
+        with self.assertRaises(ValueError):
+            operations.run_operations(images, in_ops)
+        npt.assert_array_equal(images.data, original)
+
+    def test_run_operations_promotes_compact_stack(self):
+        images = ImageStack(np.full((3, 4, 5), 10, dtype=np.uint16))
+        in_ops = [
+            ImageOperation("CropCoordinatesFilter", {"region_of_interest": [0, 0, 4, 3]}, "Crop"),
+            ImageOperation("DivideFilter", {
+                "value": 4,
+                "unit": "cm"
+            }, "Divide"),
+        ]
+
+        expected = DivideFilter.filter_func(ImageStack(np.full((3, 3, 4), 10, dtype=np.float32)), value=4, unit="cm")
+
+        with mock.patch.object(images, "promote_to_float", wraps=images.promote_to_float) as promote_to_float:
+            result = operations.run_operations(images, in_ops)
+
+        # Only the divide needs float data, so the stack is promoted after cropping
+        promote_to_float.assert_called_once()
+        self.assertEqual(result.dtype, np.float32)
+        npt.assert_allclose(result.data, expected.data)
+
+    def test_run_operations_copies_read_only_stack(self):
+        data = np.full((3, 4, 5), 10, dtype=np.float32)
+        read_only = data.copy()
+        read_only.flags.writeable = False
+        images = ImageStack(pu.SharedArray(read_only, None, free_mem_on_del=False))
+        in_ops = [ImageOperation("DivideFilter", {"value": 4, "unit": "cm"}, "Divide")]
+
+        expected = DivideFilter.filter_func(ImageStack(data), value=4, unit="cm")
+
+        result = operations.run_operations(images, in_ops)
+
+        self.assertFalse(result.is_read_only)
+        npt.assert_allclose(result.data, expected.data)
+        npt.assert_array_equal(read_only, data)
+
+    def test_run_operations_bad_module(self):
+        with self.assertRaisesRegex(KeyError, MODULE_NOT_FOUND.format("NonExistingFilter12")):
+            operations.run_operations(generate_images(), [ImageOperation("NonExistingFilter12", {}, "unknown")])
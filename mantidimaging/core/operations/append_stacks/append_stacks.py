@@ -56,10 +56,10 @@ class AppendStacks(BaseFilter):
                 "Stack to append does not have Projection Angle data!"
             try:
                 # get stacks projection angle order
-                final_images_proj_angles_ind = (np.array([
-                    images.log_file.get_column(LogColumn.PROJECTION_ANGLE) +
+                final_images_proj_angles_ind = np.concatenate([
+                    images.log_file.get_column(LogColumn.PROJECTION_ANGLE),
                     stack_to_append.log_file.get_column(LogColumn.PROJECTION_ANGLE)
-                ]).argsort()).flatten()
+                ]).argsort()
             except Exception as exc:
                 raise KeyError(f"The chosen stacks do not have projection angle data! Error {exc}") from exc
         else:
@@ -102,11 +102,10 @@ class AppendStacks(BaseFilter):
         if images.log_file is not None and stack_to_append.log_file is not None:
             image_columns = list(images.log_file.data.keys())
             for column in image_columns:
-                appended_column = images.log_file.get_column(column) + stack_to_append.log_file.get_column(column)
-                del images.log_file.data[column]
-                appended_column = np.array(appended_column)[final_images_proj_angles_ind]
-                appended_column = appended_column.tolist()
-                images.log_file.data[column] = appended_column
+                appended_column = np.concatenate(
+                    [images.log_file.get_column(column),
+                     stack_to_append.log_file.get_column(column)])
+                images.log_file.data[column] = appended_column[final_images_proj_angles_ind]
 
         return images
 
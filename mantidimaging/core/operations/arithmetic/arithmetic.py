@@ -8,6 +8,7 @@ from collections.abc import Callable
 from mantidimaging.gui.utility.qt_helpers import add_property_to_form, MAX_SPIN_BOX, Type
 from mantidimaging.core.operations.base_filter import BaseFilter
 from mantidimaging.core.parallel import shared as ps
+from mantidimaging.core.parallel import utility as pu
 
 if TYPE_CHECKING:
     import numpy as np
@@ -47,7 +48,12 @@ class ArithmeticFilter(BaseFilter):
             raise ValueError("Unable to proceed with operation because division/multiplication value is zero.")
 
         params = {'div': div_val, 'mult': mult_val, 'add': add_val, 'sub': sub_val}
-        ps.run_compute_func(ArithmeticFilter.compute_function, images.shape[0], images.shared_array, params, progress)
+        ps.run_compute_func(ArithmeticFilter.compute_function,
+                            images.shape[0],
+                            images.shared_array,
+                            params,
+                            progress,
+                            cost=pu.SliceCost.LOW)
 
         return images
 
@@ -3,13 +3,14 @@
 from __future__ import annotations
 
 from functools import partial
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, NamedTuple
 from collections.abc import Callable
 from enum import Enum, auto
 
 import numpy as np
 
 from mantidimaging.core.data import ImageStack
+from mantidimaging.core.parallel import utility as pu
 
 if TYPE_CHECKING:
     from PyQt5.QtWidgets import QFormLayout, QWidget  # noqa: F401   # pragma: no cover
@@ -23,12 +24,32 @@ class FilterGroup(Enum):
     Advanced = auto()
 
 
+class SliceCompute(NamedTuple):
+    """
+    A per slice compute function of a filter, with the parameters it should be called with
+
+    Reference images the function reads are given in arrays, so they are shared with the workers instead of being
+    pickled with the parameters. If there are any, func is called with a list of the stack followed by them, rather
+    than with the stack alone.
+    """
+    func: Callable[[int, Any, dict[str, Any]], None]
+    params: dict[str, Any]
+    cost: pu.SliceCost = pu.SliceCost.HIGH
+    arrays: tuple[pu.SharedArray, ...] = ()
+
+
 class BaseFilter:
     filter_name = "Unnamed Filter"
     link_histograms = False
     show_negative_overlay = True
     operate_on_sinograms = False
     allow_for_180_projection = True
+    # Set when the per slice work is done in NumPy/SciPy code that releases the GIL, so the filter can run in the
+    # thread pool rather than the process pool
+    releases_gil = False
+    # Compact integer stacks are converted to float before running a filter that needs it. Filters that only move or
+    # select pixels can work on the compact data
+    requires_float = True
 
     SINOGRAM_FILTER_INFO = "This filter will work on a\nsinogram view of the data."
 
@@ -52,6 +73,20 @@ class BaseFilter:
         raise_not_implemented("filter_func")
         return ImageStack(np.asarray([]))
 
+    @staticmethod
+    def slice_compute(images: ImageStack, **kwargs) -> SliceCompute | None:
+        """
+        For filters that process each projection independently of the others, validate the arguments as filter_func
+        would and return the per slice compute function with its parameters. This allows the filter to be fused with
+        neighbouring operations into a single pass over the stack. The parameters must not depend on the pixel values
+        of images, as earlier fused operations will not have run yet.
+
+        :param images: the image data the filter will be applied to
+        :param kwargs: the arguments of filter_func, excluding progress
+        :return: None if the filter needs the whole stack or works on sinograms
+        """
+        return None
+
     @staticmethod
     def execute_wrapper(args) -> partial:
         """
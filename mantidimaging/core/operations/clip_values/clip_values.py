@@ -7,8 +7,9 @@ from typing import TYPE_CHECKING, Any
 
 import numpy as np
 
-from mantidimaging.core.operations.base_filter import BaseFilter
+from mantidimaging.core.operations.base_filter import BaseFilter, SliceCompute
 from mantidimaging.core.parallel import shared as ps
+from mantidimaging.core.parallel import utility as pu
 
 if TYPE_CHECKING:
     from mantidimaging.core.data import ImageStack
@@ -54,6 +55,22 @@ class ClipValuesFilter(BaseFilter):
 
         :return: The processed 3D numpy.ndarray.
         """
+        compute = ClipValuesFilter.slice_compute(data,
+                                                 clip_min=clip_min,
+                                                 clip_max=clip_max,
+                                                 clip_min_new_value=clip_min_new_value,
+                                                 clip_max_new_value=clip_max_new_value)
+        ps.run_compute_func(compute.func,
+                            data.shape[0], [data.shared_array],
+                            compute.params,
+                            progress,
+                            cost=compute.cost)
+
+        return data
+
+    @staticmethod
+    def slice_compute(  # type: ignore
+            data, clip_min=None, clip_max=None, clip_min_new_value=None, clip_max_new_value=None) -> SliceCompute:
         # We're using is None because 0.0 is a valid value
         if clip_min is None and clip_max is None:
             raise ValueError('At least one of clip_min or clip_max must be supplied')
@@ -63,10 +80,7 @@ class ClipValuesFilter(BaseFilter):
             'clip_min_new_value': clip_min_new_value,
             'clip_max_new_value': clip_max_new_value
         }
-
-        ps.run_compute_func(ClipValuesFilter.compute_function, data.shape[0], [data.shared_array], params, progress)
-
-        return data
+        return SliceCompute(ClipValuesFilter.compute_function, params, pu.SliceCost.LOW)
 
     @staticmethod
     def compute_function(i: int, array: np.ndarray, params: dict[str, Any]):
@@ -30,6 +30,7 @@ class CropCoordinatesFilter(BaseFilter):
     """
     filter_name = "Crop Coordinates"
     link_histograms = True
+    requires_float = False
 
     @staticmethod
     def filter_func(images: ImageStack,
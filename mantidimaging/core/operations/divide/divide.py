@@ -10,7 +10,8 @@ from mantidimaging import helper as h
 import numpy as np
 
 from mantidimaging.core.parallel import shared as ps
-from mantidimaging.core.operations.base_filter import BaseFilter
+from mantidimaging.core.parallel import utility as pu
+from mantidimaging.core.operations.base_filter import BaseFilter, SliceCompute
 from mantidimaging.gui.utility.qt_helpers import Type
 
 if TYPE_CHECKING:
@@ -41,16 +42,25 @@ class DivideFilter(BaseFilter):
         :return: The ImageStack object which has been divided by a value.
         """
         h.check_data_stack(images)
+        compute = DivideFilter.slice_compute(images, value=value, unit=unit)
+        ps.run_compute_func(compute.func,
+                            images.shape[0],
+                            images.shared_array,
+                            compute.params,
+                            progress,
+                            cost=compute.cost)
+
+        return images
+
+    @staticmethod
+    def slice_compute(images: ImageStack, value: int | float = 0, unit="micron") -> SliceCompute:  # type: ignore
         if not value:
             raise ValueError('value parameter must not equal 0 or None')
 
         if unit == "micron":
             value *= 1e-4
 
-        params = {'value': value}
-        ps.run_compute_func(DivideFilter.compute_function, images.shape[0], images.shared_array, params, progress)
-
-        return images
+        return SliceCompute(DivideFilter.compute_function, {'value': value}, pu.SliceCost.LOW)
 
     @staticmethod
     def compute_function(i: int, array: np.ndarray, params: dict):
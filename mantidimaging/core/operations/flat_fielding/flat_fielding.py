@@ -2,6 +2,7 @@
 # SPDX - License - Identifier: GPL-3.0-or-later
 from __future__ import annotations
 
+import math
 from functools import partial
 from typing import Any, TYPE_CHECKING
 from PyQt5.QtWidgets import QComboBox, QCheckBox
@@ -9,18 +10,79 @@ from PyQt5.QtWidgets import QComboBox, QCheckBox
 import numpy as np
 
 from mantidimaging import helper as h
-from mantidimaging.core.operations.base_filter import BaseFilter, FilterGroup
-from mantidimaging.core.parallel import shared as ps
+from mantidimaging.core.data.imagestack import StackNotFoundError
+from mantidimaging.core.operations.base_filter import BaseFilter, FilterGroup, SliceCompute
+from mantidimaging.core.parallel import shared as ps, utility as pu
 from mantidimaging.gui.utility.qt_helpers import Type
 from mantidimaging.gui.widgets.dataset_selector import DatasetSelectorWidgetView
 
 if TYPE_CHECKING:
     from mantidimaging.core.data import ImageStack
+    from mantidimaging.core.data.dataset import Dataset
 
 # The smallest and largest allowed pixel value
 MINIMUM_PIXEL_VALUE = 1e-9
 MAXIMUM_PIXEL_VALUE = 1e9
 valid_methods = ["Only Before", "Only After", "Both, concatenated"]
+# How the images of a flat or dark stack are combined into a single reference image
+combine_modes = ["Mean", "Median", "Sigma-clipped mean"]
+# Approximate size of the part of a flat or dark stack that each worker combines at a time
+COMBINE_TILE_BYTES = 4 * 1024**2
+SIGMA_CLIP_SIGMA = 3.0
+SIGMA_CLIP_MAX_ITERATIONS = 5
+
+
+def combine_images(images: ImageStack, mode: str = "Mean") -> np.ndarray:
+    """
+    Combine a stack of flat or dark images into a single reference image.
+
+    The median and sigma-clipped mean reject outliers such as zingers that only appear in some of the images. They are
+    computed in the process pool, with each worker combining a band of rows through the whole stack.
+
+    :param images: The flat or dark stack
+    :param mode: One of combine_modes
+    :return: The combined image
+    """
+    if mode not in combine_modes:
+        raise ValueError(f"Invalid flat/dark combination mode: {mode}")
+    if mode == "Mean":
+        return images.data.mean(axis=0)
+
+    num_images, height, width = images.shape
+    tile_rows = max(1, COMBINE_TILE_BYTES // max(1, num_images * width * images.data.itemsize))
+    output = pu.create_array((height, width), np.float32)
+    ps.run_compute_func(_combine_tile, math.ceil(height / tile_rows), [images.shared_array, output], {
+        'mode': mode,
+        'tile_rows': tile_rows
+    })
+    # Copy out of shared memory, so the result does not depend on the lifetime of the shared array
+    return np.array(output.array)
+
+
+def _combine_tile(index: int, arrays: list[np.ndarray], params: dict[str, Any]) -> None:
+    images, output = arrays
+    rows = slice(index * params['tile_rows'], (index + 1) * params['tile_rows'])
+    tile = images[:, rows].astype(np.float32)
+    if params['mode'] == "Median":
+        output[rows] = np.median(tile, axis=0)
+    else:
+        output[rows] = _sigma_clipped_mean(tile)
+
+
+def _sigma_clipped_mean(tile: np.ndarray) -> np.ndarray:
+    """
+    Mean over axis 0, iteratively ignoring values more than SIGMA_CLIP_SIGMA standard deviations from the median.
+    Modifies the tile.
+    """
+    for _ in range(SIGMA_CLIP_MAX_ITERATIONS):
+        centre = np.nanmedian(tile, axis=0)
+        deviation = np.abs(tile - centre)
+        outliers = deviation > SIGMA_CLIP_SIGMA * np.nanstd(tile, axis=0)
+        if not outliers.any():
+            break
+        tile[outliers] = np.nan
+    # The values closest to the median are never rejected, so every pixel keeps at least one value
+    return np.nanmean(tile, axis=0)
 
 
 def enable_correct_fields_only(selected_flat_fielding_widget, flat_before_widget, flat_after_widget, dark_before_widget,
@@ -63,6 +125,9 @@ class FlatFieldFilter(BaseFilter):
     or this will introduce additional noise in the sample. Remove outliers before flat-fielding.
     """
     filter_name = 'Flat-fielding'
+    releases_gil = True
+    # Compact stacks are converted while flat-fielding, see filter_func
+    requires_float = False
 
     @staticmethod
     def filter_func(images: ImageStack,
@@ -72,6 +137,8 @@ class FlatFieldFilter(BaseFilter):
                     dark_after: ImageStack | None = None,
                     selected_flat_fielding: str | None = None,
                     use_dark: bool = True,
+                    combine_mode: str = "Mean",
+                    dataset: Dataset | None = None,
                     progress=None) -> ImageStack:
         """Do background correction with flat and dark images.
 
@@ -83,12 +150,67 @@ class FlatFieldFilter(BaseFilter):
         :param selected_flat_fielding: Select which of the flat fielding methods to use, just Before stacks, just After
                                        stacks or combined.
         :param use_dark: Whether to use dark frame subtraction
+        :param combine_mode: How the flat and dark images are combined into reference images, one of combine_modes.
+                             The median and sigma-clipped mean reject zingers in individual flat or dark images.
+        :param dataset: Dataset containing the flat and dark stacks, used to cache their combined reference images
         :return: Filtered data (stack of images)
         """
         h.check_data_stack(images)
+        compute = FlatFieldFilter._flat_field_compute(images, flat_before, flat_after, dark_before, dark_after,
+                                                      selected_flat_fielding, use_dark, combine_mode, dataset)
+        if images.is_compact:
+            # Read the compact integer data and write the result as float in the same pass, rather than converting
+            # the whole stack to float first
+            output = pu.create_array(images.shape, np.float32)
+            ps.run_compute_func(FlatFieldFilter._compute_flat_field_from_compact,
+                                len(images.data), [images.shared_array, output, *compute.arrays],
+                                compute.params,
+                                progress,
+                                use_threads=FlatFieldFilter.releases_gil)
+            images.shared_array = output
+        else:
+            ps.run_compute_func(compute.func,
+                                len(images.data), [images.shared_array, *compute.arrays],
+                                compute.params,
+                                progress,
+                                use_threads=FlatFieldFilter.releases_gil)
+
+        h.check_data_stack(images)
+        return images
+
+    @staticmethod
+    def slice_compute(  # type: ignore
+            images: ImageStack,
+            flat_before: ImageStack | None = None,
+            flat_after: ImageStack | None = None,
+            dark_before: ImageStack | None = None,
+            dark_after: ImageStack | None = None,
+            selected_flat_fielding: str | None = None,
+            use_dark: bool = True,
+            combine_mode: str = "Mean",
+            dataset: Dataset | None = None) -> SliceCompute | None:
+        if images.is_compact:
+            # The result is float, so can not be written in place into compact data
+            return None
+        return FlatFieldFilter._flat_field_compute(images, flat_before, flat_after, dark_before, dark_after,
+                                                   selected_flat_fielding, use_dark, combine_mode, dataset)
+
+    @staticmethod
+    def _flat_field_compute(images: ImageStack,
+                            flat_before: ImageStack | None = None,
+                            flat_after: ImageStack | None = None,
+                            dark_before: ImageStack | None = None,
+                            dark_after: ImageStack | None = None,
+                            selected_flat_fielding: str | None = None,
+                            use_dark: bool = True,
+                            combine_mode: str = "Mean",
+                            dataset: Dataset | None = None) -> SliceCompute:
         if selected_flat_fielding not in ["Both, concatenated", "Only Before", "Only After"]:
             raise ValueError(f"Invalid flat fielding method: {selected_flat_fielding}")
+        if combine_mode not in combine_modes:
+            raise ValueError(f"Invalid flat/dark combination mode: {combine_mode}")
 
+        combine = partial(FlatFieldFilter._combined_image, mode=combine_mode, dataset=dataset)
         dark_avg = None
 
         if selected_flat_fielding == "Both, concatenated":
@@ -96,29 +218,29 @@ class FlatFieldFilter(BaseFilter):
                 raise ValueError("Missing stack: flat_before is required for 'Both, concatenated'")
             if flat_after is None:
                 raise ValueError("Missing stack: flat_after is required for 'Both, concatenated'")
-            flat_avg = (flat_before.data.mean(axis=0) + flat_after.data.mean(axis=0)) / 2.0
+            flat_avg = (combine(flat_before) + combine(flat_after)) / 2.0
             if use_dark:
                 if dark_before is None or dark_after is None:
                     raise ValueError("Missing stack: dark_before and dark_after are required for 'Both, concatenated'")
-                dark_avg = (dark_before.data.mean(axis=0) + dark_after.data.mean(axis=0)) / 2.0
+                dark_avg = (combine(dark_before) + combine(dark_after)) / 2.0
 
         elif selected_flat_fielding == "Only After":
             if flat_after is None:
                 raise ValueError("Missing stack: flat_after is required for 'Only After'")
-            flat_avg = flat_after.data.mean(axis=0)
+            flat_avg = combine(flat_after)
             if use_dark:
                 if dark_after is None:
                     raise ValueError("Missing stack: dark_after is required for 'Only After'")
-                dark_avg = dark_after.data.mean(axis=0)
+                dark_avg = combine(dark_after)
 
         elif selected_flat_fielding == "Only Before":
             if flat_before is None:
                 raise ValueError("Missing stack: flat_before is required for 'Only Before'")
-            flat_avg = flat_before.data.mean(axis=0)
+            flat_avg = combine(flat_before)
             if use_dark:
                 if dark_before is None:
                     raise ValueError("Missing stack: dark_before is required for 'Only Before'")
-                dark_avg = dark_before.data.mean(axis=0)
+                dark_avg = combine(dark_before)
 
         if dark_avg is None:
             dark_avg = np.zeros_like(flat_avg)
@@ -132,22 +254,47 @@ class FlatFieldFilter(BaseFilter):
                 raise ValueError(f"Not all images are the expected shape: {images.shape[1:]}, instead "
                                  f"flat had shape: {flat_avg.shape}, and dark had shape: {dark_avg.shape}")
 
-        params = {'flat_avg': flat_avg, 'dark_avg': dark_avg}
-        ps.run_compute_func(FlatFieldFilter._compute_flat_field, len(images.data), [images.shared_array], params,
-                            progress)
+        return SliceCompute(FlatFieldFilter._compute_flat_field, {},
+                            arrays=(FlatFieldFilter._reference_images(flat_avg, dark_avg), ))
 
-        h.check_data_stack(images)
-        return images
+    @staticmethod
+    def _combined_image(stack: ImageStack, mode: str, dataset: Dataset | None) -> np.ndarray:
+        """
+        Combine a flat or dark stack, reusing the result cached on its dataset if the stack has not changed since
+        """
+        if dataset is None or stack.id not in dataset:
+            return combine_images(stack, mode)
+        combined = dataset.get_combined_image(stack, mode)
+        if combined is None:
+            combined = combine_images(stack, mode)
+            dataset.set_combined_image(stack, mode, combined)
+        return combined
 
     @staticmethod
-    def _compute_flat_field(index: int, array: np.ndarray, params: dict):
-        flat_avg = params['flat_avg']
-        dark_avg = params['dark_avg']
+    def _reference_images(flat_avg: np.ndarray, dark_avg: np.ndarray) -> pu.SharedArray:
+        """
+        Put the dark image and the reciprocal of (flat - dark) in shared memory, so that each slice only needs a
+        subtraction and a multiplication
+        """
+        references = pu.create_array((2, ) + flat_avg.shape, np.float32)
+        dark, reciprocal = references.array
+        dark[:] = dark_avg
+        np.subtract(flat_avg, dark_avg, out=reciprocal)
+        reciprocal[reciprocal == 0] = MINIMUM_PIXEL_VALUE
+        np.reciprocal(reciprocal, out=reciprocal)
+        return references
 
-        norm_divide = flat_avg - dark_avg
-        norm_divide[norm_divide == 0] = MINIMUM_PIXEL_VALUE
-        array[index] -= dark_avg
-        array[index] /= norm_divide
+    @staticmethod
+    def _compute_flat_field(index: int, arrays: list[np.ndarray], params: dict):
+        array, (dark, reciprocal) = arrays
+        np.subtract(array[index], dark, out=array[index])
+        np.multiply(array[index], reciprocal, out=array[index])
+
+    @staticmethod
+    def _compute_flat_field_from_compact(index: int, arrays: list[np.ndarray], params: dict):
+        compact, output, references = arrays
+        output[index] = compact[index]
+        FlatFieldFilter._compute_flat_field(index, [output, references], params)
 
     @staticmethod
     def register_gui(form, on_change, view) -> dict[str, Any]:
@@ -183,6 +330,15 @@ class FlatFieldFilter(BaseFilter):
                                                   on_change=on_change,
                                                   tooltip="Use dark frame subtraction")
 
+        _, combine_mode_widget = add_property_to_form("Flat/Dark Combination",
+                                                      Type.CHOICE,
+                                                      valid_values=combine_modes,
+                                                      form=form,
+                                                      filters_view=view,
+                                                      on_change=on_change,
+                                                      tooltip="How the flat and dark images are combined. Median and "
+                                                      "sigma-clipped mean reject zingers in individual images.")
+
         _, dark_before_widget = add_property_to_form("Dark Before",
                                                      Type.STACK,
                                                      form=form,
@@ -238,13 +394,15 @@ class FlatFieldFilter(BaseFilter):
             'dark_before_widget': dark_before_widget,
             'dark_after_widget': dark_after_widget,
             'use_dark_widget': use_dark_widget,
+            'combine_mode_widget': combine_mode_widget,
         }
 
     @staticmethod
     def execute_wrapper(  # type: ignore
             flat_before_widget: DatasetSelectorWidgetView, flat_after_widget: DatasetSelectorWidgetView,
             dark_before_widget: DatasetSelectorWidgetView, dark_after_widget: DatasetSelectorWidgetView,
-            selected_flat_fielding_widget: QComboBox, use_dark_widget: QCheckBox) -> partial:
+            selected_flat_fielding_widget: QComboBox, use_dark_widget: QCheckBox,
+            combine_mode_widget: QComboBox) -> partial:
 
         flat_before_images = BaseFilter.get_images_from_stack(flat_before_widget, "flat before")
         flat_after_images = BaseFilter.get_images_from_stack(flat_after_widget, "flat after")
@@ -256,13 +414,33 @@ class FlatFieldFilter(BaseFilter):
 
         use_dark = use_dark_widget.isChecked()
 
+        combine_mode = combine_mode_widget.currentText()
+        dataset = FlatFieldFilter._get_dataset(flat_before_widget if selected_flat_fielding !=
+                                               "Only After" else flat_after_widget)
+
         return partial(FlatFieldFilter.filter_func,
                        flat_before=flat_before_images,
                        flat_after=flat_after_images,
                        dark_before=dark_before_images,
                        dark_after=dark_after_images,
                        selected_flat_fielding=selected_flat_fielding,
-                       use_dark=use_dark)
+                       use_dark=use_dark,
+                       combine_mode=combine_mode,
+                       dataset=dataset)
+
+    @staticmethod
+    def _get_dataset(widget: DatasetSelectorWidgetView) -> Dataset | None:
+        """
+        Get the dataset containing the stack selected in the widget, to cache the combined reference images on
+        """
+        stack_uuid = widget.current()
+        if stack_uuid is None:
+            return None
+        try:
+            dataset_id = widget.main_window.get_dataset_id_from_stack_uuid(stack_uuid)
+        except StackNotFoundError:
+            return None
+        return widget.main_window.get_dataset(dataset_id)
 
     @staticmethod
     def validate_execute_kwargs(kwargs: dict[str, Any], images: ImageStack) -> str | None:
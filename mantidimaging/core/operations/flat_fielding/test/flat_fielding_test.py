@@ -11,7 +11,10 @@ import numpy as np
 import numpy.testing as npt
 
 import mantidimaging.test_helpers.unit_test_helper as th
-from mantidimaging.core.operations.flat_fielding.flat_fielding import enable_correct_fields_only
+from mantidimaging.core.data.dataset import Dataset
+from mantidimaging.core.data.imagestack import StackNotFoundError
+from mantidimaging.core.operations.flat_fielding.flat_fielding import (MINIMUM_PIXEL_VALUE, combine_images,
+                                                                       enable_correct_fields_only)
 from mantidimaging.core.operations.flat_fielding import FlatFieldFilter
 
 if TYPE_CHECKING:
@@ -99,6 +102,54 @@ class FlatFieldingTest(unittest.TestCase):
 
         npt.assert_almost_equal(result.data, expected, 7)
 
+    def test_compact_images_flat_fielded_without_separate_promotion(self):
+        images, flat_before, dark_before, flat_after, dark_after = self._make_images()
+        images.data = np.full(images.shape, 26, dtype=np.uint16)
+        flat_before.data = np.full(flat_before.shape, 7, dtype=np.uint16)
+        dark_before.data = np.full(dark_before.shape, 6, dtype=np.uint16)
+
+        self.assertIsNone(FlatFieldFilter.slice_compute(images, flat_before, None, dark_before, None, "Only Before"))
+        with mock.patch.object(images, "promote_to_float") as promote_to_float:
+            result = FlatFieldFilter.filter_func(images,
+                                                 flat_before=flat_before,
+                                                 dark_before=dark_before,
+                                                 selected_flat_fielding="Only Before")
+
+        promote_to_float.assert_not_called()
+        self.assertEqual(result.dtype, np.float32)
+        self.assertEqual(flat_before.dtype, np.uint16)
+        npt.assert_almost_equal(result.data, np.full(images.shape, 20.), 7)
+
+    def test_reference_images_are_shared_instead_of_passed_in_params(self):
+        images, flat_before, dark_before, _, _ = self._make_images()
+        flat_before.data[:] = 7.
+        dark_before.data[:] = 6.
+        flat_before.data[:, 0, 0] = 6.
+
+        compute = FlatFieldFilter.slice_compute(images, flat_before, None, dark_before, None, "Only Before")
+
+        self.assertEqual(compute.params, {})
+        self.assertEqual(len(compute.arrays), 1)
+        dark, reciprocal = compute.arrays[0].array
+        npt.assert_array_equal(dark, np.full(images.shape[1:], 6.))
+        self.assertEqual(reciprocal[0, 0], np.float32(1 / MINIMUM_PIXEL_VALUE))
+        npt.assert_array_equal(reciprocal[1:, 1:], 1.)
+
+    def test_flat_equal_to_dark_is_treated_as_minimum_pixel_value(self):
+        images, flat_before, dark_before, _, _ = self._make_images()
+        images.data[:] = 26.
+        flat_before.data[:] = 7.
+        dark_before.data[:] = 6.
+        flat_before.data[:, 0, 0] = 6.
+
+        result = FlatFieldFilter.filter_func(images,
+                                             flat_before=flat_before,
+                                             dark_before=dark_before,
+                                             selected_flat_fielding="Only Before")
+
+        npt.assert_allclose(result.data[:, 0, 0], 20. / MINIMUM_PIXEL_VALUE, rtol=1e-6)
+        npt.assert_almost_equal(result.data[:, 1:, 1:], 20., 7)
+
     def test_execute_wrapper_return_is_runnable(self):
         """
         Test that the partial returned by execute_wrapper can be executed (kwargs are named correctly)
@@ -106,6 +157,7 @@ class FlatFieldingTest(unittest.TestCase):
         fake_images = th.generate_images()
         flat_before_widget = mock.Mock()
         flat_before_widget.main_window.get_stack = mock.Mock(return_value=fake_images)
+        flat_before_widget.main_window.get_dataset = mock.Mock(return_value=None)
         flat_after_widget = mock.Mock()
         flat_after_widget.main_window.get_stack = mock.Mock(return_value=fake_images)
         dark_before_widget = mock.Mock()
@@ -115,16 +167,149 @@ class FlatFieldingTest(unittest.TestCase):
         selected_flat_fielding_widget = mock.Mock()
         selected_flat_fielding_widget.currentText = mock.Mock(return_value="Only Before")
         use_dark_widget = mock.Mock()
+        combine_mode_widget = mock.Mock()
+        combine_mode_widget.currentText = mock.Mock(return_value="Median")
 
         execute_func = FlatFieldFilter.execute_wrapper(flat_before_widget=flat_before_widget,
                                                        flat_after_widget=flat_before_widget,
                                                        dark_before_widget=dark_before_widget,
                                                        dark_after_widget=dark_after_widget,
                                                        selected_flat_fielding_widget=selected_flat_fielding_widget,
-                                                       use_dark_widget=use_dark_widget)
+                                                       use_dark_widget=use_dark_widget,
+                                                       combine_mode_widget=combine_mode_widget)
         images = th.generate_images()
         execute_func(images)
 
+    def test_execute_wrapper_passes_dataset_of_flat_stack(self):
+        dataset = Dataset()
+        flat_before_widget = mock.Mock()
+        flat_before_widget.main_window.get_dataset = mock.Mock(return_value=dataset)
+        selected_flat_fielding_widget = mock.Mock()
+        selected_flat_fielding_widget.currentText = mock.Mock(return_value="Only Before")
+        combine_mode_widget = mock.Mock()
+        combine_mode_widget.currentText = mock.Mock(return_value="Sigma-clipped mean")
+
+        execute_func = FlatFieldFilter.execute_wrapper(flat_before_widget=flat_before_widget,
+                                                       flat_after_widget=mock.Mock(),
+                                                       dark_before_widget=mock.Mock(),
+                                                       dark_after_widget=mock.Mock(),
+                                                       selected_flat_fielding_widget=selected_flat_fielding_widget,
+                                                       use_dark_widget=mock.Mock(),
+                                                       combine_mode_widget=combine_mode_widget)
+
+        flat_before_widget.main_window.get_dataset_id_from_stack_uuid.assert_called_once_with(
+            flat_before_widget.current.return_value)
+        self.assertIs(execute_func.keywords["dataset"], dataset)
+        self.assertEqual(execute_func.keywords["combine_mode"], "Sigma-clipped mean")
+
+    def test_execute_wrapper_without_dataset(self):
+        flat_before_widget = mock.Mock()
+        flat_before_widget.main_window.get_dataset_id_from_stack_uuid = mock.Mock(
+            side_effect=StackNotFoundError("not found"))
+        selected_flat_fielding_widget = mock.Mock()
+        selected_flat_fielding_widget.currentText = mock.Mock(return_value="Only Before")
+
+        execute_func = FlatFieldFilter.execute_wrapper(flat_before_widget=flat_before_widget,
+                                                       flat_after_widget=mock.Mock(),
+                                                       dark_before_widget=mock.Mock(),
+                                                       dark_after_widget=mock.Mock(),
+                                                       selected_flat_fielding_widget=selected_flat_fielding_widget,
+                                                       use_dark_widget=mock.Mock(),
+                                                       combine_mode_widget=mock.Mock())
+
+        self.assertIsNone(execute_func.keywords["dataset"])
+
+    @parameterized.expand([("Median", "Median"), ("Sigma-clipped mean", "Sigma-clipped mean")])
+    def test_combination_rejects_zinger_in_flat(self, _, combine_mode):
+        images, flat_before, dark_before, _, _ = self._make_images()
+        images.data[:] = 26.
+        flat_before.data[:] = 7.
+        dark_before.data[:] = 6.
+        flat_before.data[3, 2, 4] = 60000.
+
+        result = FlatFieldFilter.filter_func(images,
+                                             flat_before=flat_before,
+                                             dark_before=dark_before,
+                                             selected_flat_fielding="Only Before",
+                                             combine_mode=combine_mode)
+
+        npt.assert_almost_equal(result.data, np.full(images.shape, 20.), 5)
+
+    def test_mean_combination_is_contaminated_by_zinger_in_flat(self):
+        images, flat_before, dark_before, _, _ = self._make_images()
+        images.data[:] = 26.
+        flat_before.data[:] = 7.
+        dark_before.data[:] = 6.
+        flat_before.data[3, 2, 4] = 60000.
+
+        result = FlatFieldFilter.filter_func(images,
+                                             flat_before=flat_before,
+                                             dark_before=dark_before,
+                                             selected_flat_fielding="Only Before",
+                                             combine_mode="Mean")
+
+        self.assertTrue(np.all(result.data[:, 2, 4] < 1))
+
+    def test_invalid_combine_mode_raises(self):
+        images, flat_before, dark_before, _, _ = self._make_images()
+
+        self.assertRaises(ValueError,
+                          FlatFieldFilter.filter_func,
+                          images,
+                          flat_before=flat_before,
+                          dark_before=dark_before,
+                          selected_flat_fielding="Only Before",
+                          combine_mode="Maximum")
+
+    def test_combine_images_in_tiles_matches_numpy(self):
+        images = th.generate_images((15, 9, 7), seed=2021)
+        images.data[4, 1, 2] = 1e6
+
+        with mock.patch("mantidimaging.core.operations.flat_fielding.flat_fielding.COMBINE_TILE_BYTES", 2 * 15 * 7 * 4):
+            median = combine_images(images, "Median")
+            clipped = combine_images(images, "Sigma-clipped mean")
+
+        npt.assert_allclose(median, np.median(images.data, axis=0), rtol=1e-6)
+        expected = images.data.mean(axis=0)
+        expected[1, 2] = np.delete(images.data[:, 1, 2], 4).mean()
+        npt.assert_allclose(clipped, expected, rtol=1e-5)
+
+    def test_combined_images_are_cached_on_dataset(self):
+        images, flat_before, dark_before, _, _ = self._make_images()
+        dataset = Dataset(sample=images, flat_before=flat_before, dark_before=dark_before)
+
+        with mock.patch("mantidimaging.core.operations.flat_fielding.flat_fielding.combine_images",
+                        side_effect=combine_images) as mock_combine:
+            for _ in range(2):
+                FlatFieldFilter.slice_compute(images,
+                                              flat_before,
+                                              dark_before=dark_before,
+                                              selected_flat_fielding="Only Before",
+                                              combine_mode="Median",
+                                              dataset=dataset)
+            self.assertEqual(mock_combine.call_count, 2)
+
+            flat_before.record_operation("", "")
+            FlatFieldFilter.slice_compute(images,
+                                          flat_before,
+                                          dark_before=dark_before,
+                                          selected_flat_fielding="Only Before",
+                                          combine_mode="Median",
+                                          dataset=dataset)
+            self.assertEqual(mock_combine.call_count, 3)
+
+    def test_stacks_not_in_dataset_are_not_cached(self):
+        images, flat_before, dark_before, _, _ = self._make_images()
+        dataset = Dataset(sample=images)
+
+        FlatFieldFilter.slice_compute(images,
+                                      flat_before,
+                                      dark_before=dark_before,
+                                      selected_flat_fielding="Only Before",
+                                      dataset=dataset)
+
+        self.assertIsNone(dataset.get_combined_image(flat_before, "Mean"))
+
     def test_enable_correct_fields_only_before(self):
         text = "Only Before"
         flat_before_widget = mock.MagicMock()
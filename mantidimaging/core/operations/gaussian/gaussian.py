@@ -27,6 +27,7 @@ class GaussianFilter(BaseFilter):
     """
     filter_name = "Gaussian"
     link_histograms = True
+    releases_gil = True
 
     @staticmethod
     def filter_func(data: ImageStack, size=None, mode=None, order=None, progress=None):
@@ -53,7 +54,12 @@ class GaussianFilter(BaseFilter):
             raise ValueError(f'Size parameter must be greater than 1, but value provided was {size}')
 
         params = {'size': size, 'mode': mode, 'order': order}
-        ps.run_compute_func(GaussianFilter.compute_function, data.shape[0], data.shared_array, params, progress)
+        ps.run_compute_func(GaussianFilter.compute_function,
+                            data.shape[0],
+                            data.shared_array,
+                            params,
+                            progress,
+                            use_threads=GaussianFilter.releases_gil)
 
         h.check_data_stack(data)
         return data
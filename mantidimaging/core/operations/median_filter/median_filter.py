@@ -15,7 +15,7 @@ import scipy.ndimage as scipy_ndimage
 
 from mantidimaging import helper as h
 from mantidimaging.core.gpu import utility as gpu
-from mantidimaging.core.operations.base_filter import BaseFilter
+from mantidimaging.core.operations.base_filter import BaseFilter, SliceCompute
 from mantidimaging.core.parallel import shared as ps
 from mantidimaging.core.utility.progress_reporting import Progress
 from mantidimaging.gui.utility import add_property_to_form
@@ -69,6 +69,7 @@ class MedianFilter(BaseFilter):
     """
     filter_name = "Median"
     link_histograms = True
+    releases_gil = True
 
     @staticmethod
     def filter_func(data: ImageStack, size=None, mode="reflect", progress=None, force_cpu=True):
@@ -90,13 +91,30 @@ class MedianFilter(BaseFilter):
         if size is None or size <= 1:
             raise ValueError(f'Size parameter must be greater than 1, but value provided was {size}')
 
-        params = {'mode': mode, 'size': size, 'force_cpu': force_cpu}
         if force_cpu:
-            ps.run_compute_func(MedianFilter.compute_function, data.data.shape[0], data.shared_array, params, progress)
+            ps.run_compute_func(MedianFilter.compute_function,
+                                data.data.shape[0],
+                                data.shared_array, {
+                                    'mode': mode,
+                                    'size': size,
+                                    'force_cpu': force_cpu
+                                },
+                                progress,
+                                use_threads=MedianFilter.releases_gil)
         else:
             _execute_gpu(data.data, size, mode, progress=None)
         return data
 
+    @staticmethod
+    def slice_compute(  # type: ignore
+            data: ImageStack, size=None, mode="reflect", force_cpu=True) -> SliceCompute | None:
+        if size is None or size <= 1:
+            raise ValueError(f'Size parameter must be greater than 1, but value provided was {size}')
+        if not force_cpu:
+            # The GPU implementation works on the whole stack
+            return None
+        return SliceCompute(MedianFilter.compute_function, {'mode': mode, 'size': size, 'force_cpu': force_cpu})
+
     @staticmethod
     def compute_function(i: int, array: np.ndarray, params: dict[str, Any]):
         mode = params['mode']
@@ -9,6 +9,7 @@ import numpy as np
 
 from mantidimaging.core.operations.base_filter import BaseFilter
 from mantidimaging.core.parallel import shared as ps
+from mantidimaging.core.parallel import utility as pu
 
 if TYPE_CHECKING:
     from mantidimaging.core.data import ImageStack
@@ -46,8 +47,12 @@ class MonitorNormalisation(BaseFilter):
         normalization_factor = counts.value / counts.value[0]
         params = {'normalization_factor': normalization_factor}
 
-        ps.run_compute_func(MonitorNormalisation.compute_function, images.shape[0], images.shared_array, params,
-                            progress)
+        ps.run_compute_func(MonitorNormalisation.compute_function,
+                            images.shape[0],
+                            images.shared_array,
+                            params,
+                            progress,
+                            cost=pu.SliceCost.LOW)
         return images
 
     @staticmethod
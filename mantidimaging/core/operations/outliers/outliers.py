@@ -8,7 +8,7 @@ from typing import TYPE_CHECKING
 import numpy as np
 from scipy.ndimage import median_filter
 
-from mantidimaging.core.operations.base_filter import BaseFilter, FilterGroup
+from mantidimaging.core.operations.base_filter import BaseFilter, FilterGroup, SliceCompute
 from mantidimaging.core.parallel import shared as ps
 from mantidimaging.gui.utility import add_property_to_form
 from mantidimaging.gui.utility.qt_helpers import Type
@@ -53,16 +53,21 @@ class OutliersFilter(BaseFilter):
 
         :return: The processed 3D numpy.ndarray
         """
+        compute = OutliersFilter.slice_compute(images, diff=diff, radius=radius, mode=mode)
+        ps.run_compute_func(compute.func, images.shape[0], images.shared_array, compute.params, progress)
+
+        return images
+
+    @staticmethod
+    def slice_compute(  # type: ignore
+            images: ImageStack, diff=None, radius=_default_radius, mode=_default_mode) -> SliceCompute:
         if not diff or not diff > 0:
             raise ValueError(f'diff parameter must be greater than 0. Value provided was {diff}')
 
         if not radius or not radius > 0:
             raise ValueError(f'radius parameter must be greater than 0. Value provided was {radius}')
 
-        params = {'diff': diff, 'radius': radius, 'mode': mode}
-        ps.run_compute_func(OutliersFilter.compute_function, images.shape[0], images.shared_array, params, progress)
-
-        return images
+        return SliceCompute(OutliersFilter.compute_function, {'diff': diff, 'radius': radius, 'mode': mode})
 
     @staticmethod
     def compute_function(i: int, array: np.ndarray, params):
@@ -7,6 +7,7 @@ from typing import Any, TYPE_CHECKING
 
 import numpy as np
 from mantidimaging.core.parallel import shared as ps
+from mantidimaging.core.parallel import utility as pu
 from mantidimaging.core.operations.base_filter import BaseFilter
 from mantidimaging.gui.utility.qt_helpers import Type
 
@@ -43,7 +44,11 @@ class RescaleFilter(BaseFilter):
         """
 
         params = {'min_input': min_input, 'max_input': max_input, 'max_output': max_output}
-        ps.run_compute_func(RescaleFilter.compute_function, len(images.data), [images.shared_array], params, progress)
+        ps.run_compute_func(RescaleFilter.compute_function,
+                            len(images.data), [images.shared_array],
+                            params,
+                            progress,
+                            cost=pu.SliceCost.LOW)
         return images
 
     @staticmethod
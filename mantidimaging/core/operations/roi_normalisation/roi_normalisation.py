@@ -9,6 +9,7 @@ import numpy as np
 from mantidimaging import helper as h
 from mantidimaging.core.operations.base_filter import BaseFilter, FilterGroup
 from mantidimaging.core.parallel import shared as ps
+from mantidimaging.core.parallel import utility as pu
 from mantidimaging.core.utility.sensible_roi import SensibleROI
 from mantidimaging.gui.utility import add_property_to_form
 from mantidimaging.gui.utility.qt_helpers import Type
@@ -81,7 +82,11 @@ class RoiNormalisationFilter(BaseFilter):
             'normalisation_factors': global_params
         }
 
-        ps.run_compute_func(RoiNormalisationFilter.compute_function, images.shape[0], images.shared_array, params)
+        ps.run_compute_func(RoiNormalisationFilter.compute_function,
+                            images.shape[0],
+                            images.shared_array,
+                            params,
+                            cost=pu.SliceCost.LOW)
 
         h.check_data_stack(images)
 
@@ -33,6 +33,7 @@ class RotateFilter(BaseFilter):
     """
     filter_name = "Rotate Stack"
     link_histograms = True
+    releases_gil = True
 
     @staticmethod
     def filter_func(data: ImageStack, angle=None, progress=None):
@@ -142,8 +143,10 @@ def _cardinal_rotation_per_slice(data: ImageStack, angle: float, progress) -> pu
         new_data = _inplace_rotation(z_axis, data, angle, progress)
     else:
         new_data = pu.create_array(rotated_shape, data.dtype)
-        ps.run_compute_func(_compute_cardinal_rotation_per_slice, z_axis, [data.shared_array, new_data],
-                            {"angle": angle}, progress)
+        ps.run_compute_func(_compute_cardinal_rotation_per_slice,
+                            z_axis, [data.shared_array, new_data], {"angle": angle},
+                            progress,
+                            use_threads=RotateFilter.releases_gil)
     return new_data
 
 
@@ -157,8 +160,11 @@ def _inplace_rotation(number_of_slices: int, data, angle: float, progress) -> pu
     param: progress: progress bar
     return: new_data: rotated image data array
     """
-    ps.run_compute_func(_compute_rotation_per_slice_inplace, number_of_slices, data.shared_array, {"angle": angle},
-                        progress)
+    ps.run_compute_func(_compute_rotation_per_slice_inplace,
+                        number_of_slices,
+                        data.shared_array, {"angle": angle},
+                        progress,
+                        use_threads=RotateFilter.releases_gil)
     return data.shared_array
 
 
@@ -2,20 +2,27 @@
 # SPDX - License - Identifier: GPL-3.0-or-later
 from __future__ import annotations
 
+import itertools
+import threading
 import time
+from contextlib import contextmanager
 from multiprocessing import get_context
+from multiprocessing.pool import ThreadPool
 import os
 import uuid
 from logging import getLogger
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, NamedTuple
+from collections.abc import Iterator
 
 import psutil
 from psutil import NoSuchProcess, AccessDenied
 
 from mantidimaging.core.operations.loader import load_filter_packages
+from mantidimaging.core.utility.optional_imports import safe_import
 
 if TYPE_CHECKING:
+    from ctypes import Array, c_longlong
     from multiprocessing.pool import Pool
 
 MEM_PREFIX = 'MI'
@@ -25,33 +32,296 @@ CURRENT_PID = psutil.Process().pid
 LOG = getLogger(__name__)
 perf_logger = getLogger("perf." + __name__)
 
-cores: int = 1
-pool: Pool | None = None
+threadpoolctl = safe_import('threadpoolctl')
+
+# Environment variables read by the BLAS, OpenMP and FFT libraries when they are loaded
+NATIVE_THREAD_ENV_VARS = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS', 'NUMEXPR_NUM_THREADS',
+                          'VECLIB_MAXIMUM_THREADS')
+
+
+class ThreadBudget(NamedTuple):
+    """
+    How the CPUs are divided between the worker processes and the native threads each of them may start
+    """
+    cpu_count: int
+    processes: int
+    threads_per_process: int
+
+
+def calculate_thread_budget(process_count: int, native_threads: int = 0, cpu_count: int | None = None) -> ThreadBudget:
+    """
+    :param process_count: Number of worker processes, 0 to use one per CPU
+    :param native_threads: Native threads per worker process, 0 to share the remaining CPUs between the workers
+    :param cpu_count: Number of CPUs available, detected if not given
+    """
+    if cpu_count is None:
+        cpu_count = os.cpu_count() or 1
+    processes = cpu_count if process_count == 0 else process_count
+    if native_threads <= 0:
+        native_threads = max(1, cpu_count // processes)
+    return ThreadBudget(cpu_count, processes, native_threads)
+
+
+@contextmanager
+def native_thread_limit(threads: int) -> Iterator[None]:
+    """
+    Limit the threads used by native libraries started or called within the context. Libraries which are already
+    loaded can only be limited if threadpoolctl is available.
+    """
+    previous = {name: os.environ.get(name) for name in NATIVE_THREAD_ENV_VARS}
+    os.environ.update({name: str(threads) for name in NATIVE_THREAD_ENV_VARS})
+    try:
+        if threadpoolctl is not None:
+            with threadpoolctl.threadpool_limits(limits=threads):
+                yield
+        else:
+            yield
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
 
 
-def create_and_start_pool(process_count: int) -> None:
+cores: int = 1
+thread_budget = calculate_thread_budget(cores)
+pool: Pool | None = None
+# Ids of the operations the parent is draining after they were cancelled, so that workers skip the slices still
+# queued for them without affecting other operations. Free slots hold 0.
+cancelled_operations: Array[c_longlong] | None = None
+CANCEL_SLOTS = 16
+# Used by operations that spend their time in native code which releases the GIL
+thread_pool: ThreadPool | None = None
+thread_pool_size: int = 1
+
+# Processes started when the pool is pre-warmed, before any operation has asked for more
+INITIAL_PROCESSES = 2
+DEFAULT_IDLE_TIMEOUT = 600.0
+
+# Set by configure_pool when the pool is started on demand, 0 if it is started eagerly
+_max_processes: int = 0
+idle_timeout: float = DEFAULT_IDLE_TIMEOUT
+_pool_lock = threading.RLock()
+_operations_in_progress = 0
+_idle_timer: threading.Timer | None = None
+_operation_ids = itertools.count(1)
+_cancel_lock = threading.Lock()
+
+
+def create_and_start_pool(process_count: int, native_threads: int = 0) -> None:
+    """
+    Start the pool with all of its processes now
+    """
+    global _max_processes
+    _max_processes = 0
+    _set_thread_budget(process_count, native_threads)
+    _start_pool(thread_budget.processes)
+    _start_thread_pool(thread_budget.processes)
+
+
+def configure_pool(process_count: int, native_threads: int = 0, idle_after: float = DEFAULT_IDLE_TIMEOUT) -> None:
+    """
+    Start the pools when they are first needed instead of now. The process pool is started with the processes needed
+    by the operation, and replaced by a larger one up to process_count when a larger operation is run while no others
+    are. Both pools are stopped once they have been idle for idle_after seconds.
+
+    :param process_count: Maximum number of worker processes, 0 to use one per CPU
+    :param native_threads: Native threads per worker process, 0 to share the remaining CPUs between the workers
+    :param idle_after: Seconds without operations before the pool is stopped, 0 to keep it running
+    """
+    global _max_processes, idle_timeout
+    with _pool_lock:
+        _set_thread_budget(process_count, native_threads)
+        _max_processes = thread_budget.processes
+        idle_timeout = idle_after
+
+
+def prewarm_pool() -> None:
+    """
+    Start a small pool in the background, so the first operation does not wait for the workers to start
+    """
+    threading.Thread(target=_ensure_pool, args=(INITIAL_PROCESSES, ), name="prewarm-pool", daemon=True).start()
+
+
+@contextmanager
+def pool_in_use(num_operations: int, use_threads: bool = False) -> Iterator[None]:
+    """
+    Make sure a configured pool is running with enough workers for num_operations tasks, up to the maximum, and
+    is not stopped as idle until the context exits.
+
+    :param use_threads: The operation runs in the thread pool, so the process pool is not needed
+    """
+    global _operations_in_progress
+    with _pool_lock:
+        if use_threads:
+            _ensure_thread_pool(num_operations)
+        else:
+            _ensure_pool(num_operations)
+        _operations_in_progress += 1
+    try:
+        yield
+    finally:
+        with _pool_lock:
+            _operations_in_progress -= 1
+            if _operations_in_progress == 0:
+                _schedule_idle_shutdown()
+
+
+def _set_thread_budget(process_count: int, native_threads: int) -> None:
+    global thread_budget
+    thread_budget = calculate_thread_budget(process_count, native_threads, get_context('spawn').cpu_count())
+    LOG.info(f"Thread budget: {thread_budget.processes} processes with {thread_budget.threads_per_process} native "
+             f"threads each on {thread_budget.cpu_count} CPUs")
+
+
+def _ensure_pool(num_operations: int) -> None:
+    with _pool_lock:
+        if _max_processes == 0 or num_operations <= 0:
+            return
+        wanted = min(_max_processes, num_operations)
+        if pool is None:
+            _start_pool(wanted)
+        elif cores < wanted and _operations_in_progress == 0:
+            # Operations already running keep using the smaller pool, it is replaced once they have finished
+            _replace_pool(wanted)
+
+
+def _ensure_thread_pool(num_operations: int) -> None:
+    with _pool_lock:
+        if _max_processes == 0 or num_operations <= 0 or thread_pool is not None:
+            return
+        # Threads are cheap to start, so the thread pool is started at its full size
+        _start_thread_pool(_max_processes)
+
+
+def _ensure_cancelled_operations() -> Array[c_longlong]:
+    """
+    The array is shared by the thread pool and the process pool, which can be started in either order
+    """
+    global cancelled_operations
+    if cancelled_operations is None:
+        cancelled_operations = get_context('spawn').RawArray('q', CANCEL_SLOTS)
+    return cancelled_operations
+
+
+def _start_thread_pool(threads: int) -> None:
+    global thread_pool, thread_pool_size
+    _ensure_cancelled_operations()
+    thread_pool_size = threads
+    thread_pool = ThreadPool(threads)
+
+
+def _start_pool(processes: int) -> None:
     t0 = time.monotonic()
     context = get_context('spawn')
-    global cores
-    if process_count == 0:
-        cores = context.cpu_count()
-    else:
-        cores = process_count
-    global pool
-    pool = context.Pool(cores, initializer=worker_setup)
+    global cores, pool
+    cores = processes
+    shared_cancelled_operations = _ensure_cancelled_operations()
+    # Spawned workers inherit the environment, so the limits apply before numpy loads its libraries
+    with native_thread_limit(thread_budget.threads_per_process):
+        pool = context.Pool(cores,
+                            initializer=worker_setup,
+                            initargs=(thread_budget.threads_per_process, shared_cancelled_operations))
     if perf_logger.isEnabledFor(1):
         perf_logger.info(f"Process pool started in {time.monotonic() - t0}")
 
 
-def worker_setup():
+def _replace_pool(processes: int) -> None:
+    """
+    Pool can not be resized, so stop the idle pool and start a larger one
+    """
+    global pool
+    assert pool is not None
+    LOG.info(f"Replacing process pool of {cores} processes with {processes} processes")
+    pool.close()
+    pool.join()
+    pool = None
+    _start_pool(processes)
+
+
+def _schedule_idle_shutdown() -> None:
+    global _idle_timer
+    if _idle_timer is not None:
+        _idle_timer.cancel()
+        _idle_timer = None
+    if _max_processes == 0 or idle_timeout <= 0 or (pool is None and thread_pool is None):
+        return
+    _idle_timer = threading.Timer(idle_timeout, _stop_idle_pool)
+    _idle_timer.daemon = True
+    _idle_timer.start()
+
+
+def _stop_idle_pool() -> None:
+    global pool, thread_pool
+    with _pool_lock:
+        if _operations_in_progress:
+            return
+        if pool is not None:
+            LOG.info(f"Stopping process pool after {idle_timeout}s idle")
+            pool.close()
+            pool.terminate()
+            pool = None
+        if thread_pool is not None:
+            LOG.info(f"Stopping thread pool after {idle_timeout}s idle")
+            thread_pool.close()
+            thread_pool.terminate()
+            thread_pool = None
+
+
+def worker_setup(native_threads: int = 1, shared_cancelled_operations: Array[c_longlong] | None = None) -> None:
+    global cancelled_operations
+    cancelled_operations = shared_cancelled_operations
+    if threadpoolctl is not None:
+        threadpoolctl.threadpool_limits(limits=native_threads)
     # Required to import modules for running operations
     load_filter_packages()
 
 
+def new_operation_id() -> int:
+    """
+    Id for the tasks of one operation, so that cancelling it does not affect other operations running at the same time
+    """
+    return next(_operation_ids)
+
+
+@contextmanager
+def operation_cancelled(operation_id: int) -> Iterator[None]:
+    """
+    Workers skip the slices of the operation while the context is active. If more operations than CANCEL_SLOTS are
+    cancelled at once, the extra ones run their remaining slices instead.
+    """
+    cancelled = _ensure_cancelled_operations()
+    with _cancel_lock:
+        slot = next((i for i, value in enumerate(cancelled) if value == 0), None)
+        if slot is not None:
+            cancelled[slot] = operation_id
+    try:
+        yield
+    finally:
+        if slot is not None:
+            with _cancel_lock:
+                cancelled[slot] = 0
+
+
+def is_operation_cancelled(operation_id: int) -> bool:
+    return cancelled_operations is not None and operation_id in cancelled_operations[:]
+
+
 def end_pool():
-    if pool:
-        pool.close()
-        pool.terminate()
+    global pool, thread_pool, _idle_timer
+    with _pool_lock:
+        if _idle_timer is not None:
+            _idle_timer.cancel()
+            _idle_timer = None
+        if pool:
+            pool.close()
+            pool.terminate()
+            pool = None
+        if thread_pool:
+            thread_pool.close()
+            thread_pool.terminate()
+            thread_pool = None
 
 
 def generate_mi_shared_mem_name() -> str:
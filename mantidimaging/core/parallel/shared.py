@@ -2,10 +2,15 @@
 # SPDX - License - Identifier: GPL-3.0-or-later
 from __future__ import annotations
 
+import os
+import threading
+import time
 from typing import Any, TYPE_CHECKING
 from collections.abc import Callable
 
+from mantidimaging.core.parallel import manager as pm
 from mantidimaging.core.parallel import utility as pu
+from mantidimaging.core.parallel.slice_timing import SliceTiming, timing_enabled
 
 if TYPE_CHECKING:
     from numpy import ndarray
@@ -21,24 +26,64 @@ class _Worker:
         self.func = func
         self.arrays = arrays
         self.params = params
+        self.record_timing = timing_enabled()
+        self.operation_id = pm.new_operation_id()
+        # Sent with each task so that workers can drop their attachments to segments the parent has freed
+        self.live_mem_names = pu.live_shared_memory_names()
+        self._stale_attachments_released = False
 
-    def __call__(self, index: int):
+    def __call__(self, index: int) -> SliceTiming | None:
+        if not self._stale_attachments_released:
+            pu.release_stale_shared_memory_attachments(self.live_mem_names)
+            self._stale_attachments_released = True
+        if pm.is_operation_cancelled(self.operation_id):
+            return None
+        start = time.monotonic()
         ndarrays = [sa.array for sa in self.arrays]
         if len(ndarrays) == 1:
             ndarrays = ndarrays[0]  # type: ignore[assignment]
         self.func(index, ndarrays, self.params)  # type: ignore[arg-type]
+        if self.record_timing:
+            return SliceTiming(index, os.getpid(), threading.get_ident(), start, time.monotonic())
+        return None
 
 
 def run_compute_func(func: ComputeFuncType,
                      num_operations: int,
                      arrays: list[pu.SharedArray] | pu.SharedArray,
                      params: dict[str, Any],
-                     progress=None) -> None:
+                     progress=None,
+                     cost: pu.SliceCost = pu.SliceCost.HIGH,
+                     use_threads: bool = False) -> None:
+    """
+    Run func for each index in range(num_operations), in the process pool if the data is in shared memory.
+
+    :param cost: Hint for how expensive func is per slice. Cheap functions are dispatched to the workers in
+                 contiguous blocks of slices to reduce the per task overhead.
+    :param use_threads: Run in the thread pool instead of the process pool. Only suitable for functions that spend
+                        most of their time in native code that releases the GIL, see BaseFilter.releases_gil
+    """
     if isinstance(arrays, pu.SharedArray):
         arrays = [arrays]
+    if use_threads:
+        # Threads share the memory of this process, so the arrays are used directly without proxies or pickling
+        worker_func = _Worker(func, arrays, params)
+        pu.run_compute_func_impl(worker_func,
+                                 num_operations,
+                                 True,
+                                 progress,
+                                 cost=cost,
+                                 use_threads=True,
+                                 operation_id=worker_func.operation_id)
+        return
     all_data_in_shared_memory, data = _check_shared_mem_and_get_data(arrays)
     worker_func = _Worker(func, data, params)
-    pu.run_compute_func_impl(worker_func, num_operations, all_data_in_shared_memory, progress)
+    pu.run_compute_func_impl(worker_func,
+                             num_operations,
+                             all_data_in_shared_memory,
+                             progress,
+                             cost=cost,
+                             operation_id=worker_func.operation_id)
 
 
 def _check_shared_mem_and_get_data(
@@ -0,0 +1,90 @@
+# Copyright (C) 2021 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+"""
+Timing of the individual slices of a parallel operation, used to tell whether a slow operation is limited by the
+pool, the filter or memory bandwidth. Only collected when performance logging is enabled.
+"""
+from __future__ import annotations
+
+import json
+from collections import defaultdict
+from logging import getLogger
+from typing import Any, NamedTuple
+from collections.abc import Sequence
+
+import numpy as np
+
+perf_logger = getLogger("perf." + __name__)
+
+# A slice taking longer than this multiple of the median slice time is reported as a straggler
+STRAGGLER_FACTOR = 3.0
+MAX_REPORTED_STRAGGLERS = 10
+
+
+class SliceTiming(NamedTuple):
+    """
+    When a slice was processed, and by which worker. Times are from time.monotonic, which is shared by all processes
+    """
+    slice_index: int
+    pid: int
+    thread: int
+    start: float
+    end: float
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+def timing_enabled() -> bool:
+    return perf_logger.isEnabledFor(1)
+
+
+def summarise_slice_timings(timings: Sequence[SliceTiming], start: float, end: float, workers: int) -> dict[str, Any]:
+    """
+    :param timings: The timing of each slice
+    :param start: When the parent started dispatching the operation
+    :param end: When the parent received the last result
+    :param workers: Number of workers available to the operation
+    """
+    durations = np.array([t.duration for t in timings])
+    wall_time = end - start
+    compute_time = float(durations.sum())
+    p50, p99 = np.percentile(durations, [50, 99])
+
+    stragglers = sorted((t for t in timings if t.duration > STRAGGLER_FACTOR * p50),
+                        key=lambda t: t.duration,
+                        reverse=True)
+
+    # Gaps between a worker finishing one slice and starting the next are the per task dispatch overhead
+    by_worker: dict[tuple[int, int], list[SliceTiming]] = defaultdict(list)
+    for t in timings:
+        by_worker[(t.pid, t.thread)].append(t)
+    gaps: list[float] = []
+    for worker_timings in by_worker.values():
+        worker_timings.sort(key=lambda t: t.start)
+        gaps.extend(b.start - a.end for a, b in zip(worker_timings, worker_timings[1:], strict=False))
+
+    return {
+        "slices": len(timings),
+        "workers": workers,
+        "workers_used": len(by_worker),
+        "wall_time": wall_time,
+        "compute_time": compute_time,
+        "slice_time_p50": float(p50),
+        "slice_time_p99": float(p99),
+        "stragglers": len(stragglers),
+        "straggler_slices": [t.slice_index for t in stragglers[:MAX_REPORTED_STRAGGLERS]],
+        "idle_fraction": max(0.0, 1 - compute_time / (wall_time * workers)) if wall_time > 0 else 0.0,
+        "first_slice_latency": min(t.start for t in timings) - start,
+        "last_result_latency": end - max(t.end for t in timings),
+        "mean_slice_gap": float(np.mean(gaps)) if gaps else 0.0,
+    }
+
+
+def log_slice_timings(name: str, timings: Sequence[SliceTiming], start: float, end: float, workers: int) -> None:
+    if not timings:
+        return
+    summary = summarise_slice_timings(timings, start, end, workers)
+    summary["operation"] = name
+    perf_logger.info(f"Slice timing: {json.dumps(summary)}")
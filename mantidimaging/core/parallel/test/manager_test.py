@@ -1,14 +1,19 @@
 # Copyright (C) 2021 ISIS Rutherford Appleton Laboratory UKRI
 # SPDX - License - Identifier: GPL-3.0-or-later
 from __future__ import annotations
+import os
+import time
 import unittest
+from contextlib import ExitStack
 from unittest.mock import patch, MagicMock
 
 import psutil
 from psutil import NoSuchProcess, AccessDenied
 from parameterized import parameterized
 
-from mantidimaging.core.parallel import manager as pm
+from mantidimaging.core.parallel import manager as pm, utility as pu
+from mantidimaging.core.utility.progress_reporting import Progress
+from mantidimaging.core.utility.progress_reporting.progress import TaskCancelled
 
 CURRENT_PID = 1234
 OLD_PID = CURRENT_PID - 1
@@ -63,3 +68,213 @@ class ParallelManagerTest(unittest.TestCase):
         mock_get_shared_mem_names_linux.return_value = all_mem_files
         mock_stat.return_value = MagicMock(st_mtime=psutil.Process().create_time() - 3600)
         self.assertEqual(files_to_remove, pm.find_memory_from_previous_process_linux())
+
+    @parameterized.expand([
+        ("automatic", 8, 0, 64, pm.ThreadBudget(64, 8, 8)),
+        ("one_per_cpu", 0, 0, 16, pm.ThreadBudget(16, 16, 1)),
+        ("more_processes_than_cpus", 32, 0, 16, pm.ThreadBudget(16, 32, 1)),
+        ("uneven", 6, 0, 16, pm.ThreadBudget(16, 6, 2)),
+        ("explicit_threads", 4, 3, 16, pm.ThreadBudget(16, 4, 3)),
+    ])
+    def test_calculate_thread_budget(self, _, process_count, native_threads, cpu_count, expected):
+        self.assertEqual(expected, pm.calculate_thread_budget(process_count, native_threads, cpu_count))
+
+    @patch('mantidimaging.core.parallel.manager.threadpoolctl', None)
+    def test_native_thread_limit_sets_and_restores_environment(self):
+        with patch.dict(os.environ, {'OMP_NUM_THREADS': '7'}, clear=False):
+            os.environ.pop('MKL_NUM_THREADS', None)
+            with pm.native_thread_limit(2):
+                for name in pm.NATIVE_THREAD_ENV_VARS:
+                    self.assertEqual('2', os.environ[name])
+            self.assertEqual('7', os.environ['OMP_NUM_THREADS'])
+            self.assertNotIn('MKL_NUM_THREADS', os.environ)
+
+    def test_native_thread_limit_uses_threadpoolctl(self):
+        threadpoolctl = MagicMock()
+        with patch('mantidimaging.core.parallel.manager.threadpoolctl', threadpoolctl):
+            with pm.native_thread_limit(3):
+                pass
+        threadpoolctl.threadpool_limits.assert_called_once_with(limits=3)
+
+    def test_operation_not_cancelled_without_pool(self):
+        with patch('mantidimaging.core.parallel.manager.cancelled_operations', None):
+            self.assertFalse(pm.is_operation_cancelled(pm.new_operation_id()))
+
+    def test_cancelling_operation_does_not_affect_others(self):
+        cancelled = pm.new_operation_id()
+        other = pm.new_operation_id()
+        with patch('mantidimaging.core.parallel.manager.cancelled_operations', None):
+            with pm.operation_cancelled(cancelled):
+                self.assertTrue(pm.is_operation_cancelled(cancelled))
+                self.assertFalse(pm.is_operation_cancelled(other))
+            self.assertFalse(pm.is_operation_cancelled(cancelled))
+
+    def test_operations_cancelled_beyond_slots_are_not_skipped(self):
+        operation_ids = [pm.new_operation_id() for _ in range(pm.CANCEL_SLOTS + 1)]
+        with patch('mantidimaging.core.parallel.manager.cancelled_operations', None):
+            with ExitStack() as stack:
+                for operation_id in operation_ids:
+                    stack.enter_context(pm.operation_cancelled(operation_id))
+                self.assertTrue(all(pm.is_operation_cancelled(i) for i in operation_ids[:-1]))
+                self.assertFalse(pm.is_operation_cancelled(operation_ids[-1]))
+            self.assertFalse(any(pm.cancelled_operations))
+
+
+@patch('mantidimaging.core.parallel.manager._start_thread_pool')
+@patch('mantidimaging.core.parallel.manager._replace_pool')
+@patch('mantidimaging.core.parallel.manager._start_pool')
+class LazyPoolTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        patcher = patch.multiple(pm,
+                                 pool=None,
+                                 thread_pool=None,
+                                 cores=1,
+                                 _max_processes=0,
+                                 _operations_in_progress=0,
+                                 _idle_timer=None,
+                                 idle_timeout=0,
+                                 thread_budget=pm.thread_budget)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_pool_not_started_if_not_configured(self, start_pool, replace_pool, start_thread_pool):
+        with pm.pool_in_use(100):
+            pass
+        start_pool.assert_not_called()
+
+    def test_pool_started_with_processes_needed(self, start_pool, replace_pool, start_thread_pool):
+        pm.configure_pool(8, idle_after=0)
+        with pm.pool_in_use(3):
+            pass
+        start_pool.assert_called_once_with(3)
+        start_thread_pool.assert_not_called()
+
+    def test_pool_replaced_up_to_maximum(self, start_pool, replace_pool, start_thread_pool):
+        pm.configure_pool(8, idle_after=0)
+        with patch.multiple(pm, pool=MagicMock(), cores=3):
+            with pm.pool_in_use(100):
+                pass
+        start_pool.assert_not_called()
+        replace_pool.assert_called_once_with(8)
+
+    def test_pool_not_replaced_while_in_use(self, start_pool, replace_pool, start_thread_pool):
+        pm.configure_pool(8, idle_after=0)
+        with patch.multiple(pm, pool=MagicMock(), cores=3):
+            with pm.pool_in_use(3):
+                with pm.pool_in_use(100):
+                    pass
+        replace_pool.assert_not_called()
+
+    def test_pool_not_started_for_synchronous_operation(self, start_pool, replace_pool, start_thread_pool):
+        pm.configure_pool(8, idle_after=0)
+        with pm.pool_in_use(0):
+            pass
+        start_pool.assert_not_called()
+
+    def test_thread_operation_only_starts_thread_pool(self, start_pool, replace_pool, start_thread_pool):
+        pm.configure_pool(8, idle_after=0)
+        with pm.pool_in_use(100, use_threads=True):
+            pass
+        start_pool.assert_not_called()
+        start_thread_pool.assert_called_once_with(8)
+
+    def test_idle_pool_stopped(self, start_pool, replace_pool, start_thread_pool):
+        pm.configure_pool(8, idle_after=60)
+        mock_pool = MagicMock()
+        with patch.multiple(pm, pool=mock_pool), patch('mantidimaging.core.parallel.manager.threading.Timer') as timer:
+            with pm.pool_in_use(3):
+                timer.assert_not_called()
+            timer.assert_called_once_with(60, pm._stop_idle_pool)
+            pm._stop_idle_pool()
+            self.assertIsNone(pm.pool)
+        mock_pool.terminate.assert_called_once()
+
+    def test_idle_thread_pool_stopped(self, start_pool, replace_pool, start_thread_pool):
+        pm.configure_pool(8, idle_after=60)
+        mock_thread_pool = MagicMock()
+        with patch.multiple(pm, thread_pool=mock_thread_pool), \
+                patch('mantidimaging.core.parallel.manager.threading.Timer') as timer:
+            with pm.pool_in_use(3, use_threads=True):
+                pass
+            timer.assert_called_once_with(60, pm._stop_idle_pool)
+            pm._stop_idle_pool()
+            self.assertIsNone(pm.thread_pool)
+        mock_thread_pool.terminate.assert_called_once()
+
+    def test_pool_in_use_not_stopped(self, start_pool, replace_pool, start_thread_pool):
+        pm.configure_pool(8, idle_after=60)
+        mock_pool = MagicMock()
+        with patch.multiple(pm, pool=mock_pool), patch('mantidimaging.core.parallel.manager.threading.Timer'):
+            with pm.pool_in_use(3):
+                pm._stop_idle_pool()
+            self.assertIs(pm.pool, mock_pool)
+        mock_pool.terminate.assert_not_called()
+
+
+class PoolStartTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        patcher = patch.multiple(pm,
+                                 pool=None,
+                                 thread_pool=None,
+                                 cancelled_operations=None,
+                                 cores=1,
+                                 _max_processes=0,
+                                 _operations_in_progress=0,
+                                 _idle_timer=None,
+                                 idle_timeout=0,
+                                 thread_budget=pm.thread_budget)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch('mantidimaging.core.parallel.manager.ThreadPool')
+    def test_thread_pool_can_be_cancelled_without_process_pool(self, _):
+        pm._start_thread_pool(2)
+
+        self.assertIsNotNone(pm.cancelled_operations)
+        operation_id = pm.new_operation_id()
+        with pm.operation_cancelled(operation_id):
+            self.assertTrue(pm.is_operation_cancelled(operation_id))
+
+    def test_cancelled_lazy_thread_operation_skips_queued_slices(self):
+        pm.configure_pool(2, idle_after=0)
+        self.addCleanup(pm.end_pool)
+        progress = Progress()
+        slices_run = []
+        operation_id = pm.new_operation_id()
+
+        def worker(index: int) -> None:
+            if pm.is_operation_cancelled(operation_id):
+                return
+            slices_run.append(index)
+            time.sleep(0.01)
+            if len(slices_run) == 2:
+                progress.cancel()
+
+        with self.assertRaises(TaskCancelled):
+            pu.run_compute_func_impl(worker, 40, True, progress, use_threads=True, operation_id=operation_id)
+
+        self.assertLess(len(slices_run), 40)
+        self.assertFalse(pm.is_operation_cancelled(operation_id))
+
+    @patch('mantidimaging.core.parallel.manager.get_context')
+    def test_replacement_pool_started_after_old_pool_drained(self, get_context):
+        env_when_started = {}
+
+        def new_pool(*args, **kwargs):
+            env_when_started.update({var: os.environ.get(var) for var in pm.NATIVE_THREAD_ENV_VARS})
+            return MagicMock()
+
+        get_context.return_value.Pool.side_effect = new_pool
+        old_pool = MagicMock()
+        budget = pm.calculate_thread_budget(2, native_threads=3, cpu_count=8)
+        with patch.multiple(pm, pool=old_pool, cores=2, thread_budget=budget):
+            pm._replace_pool(4)
+            self.assertEqual(pm.cores, 4)
+            self.assertIsNot(pm.pool, old_pool)
+
+        old_pool.close.assert_called_once()
+        old_pool.join.assert_called_once()
+        self.assertEqual(get_context.return_value.Pool.call_args.args[0], 4)
+        self.assertEqual(env_when_started, dict.fromkeys(pm.NATIVE_THREAD_ENV_VARS, "3"))
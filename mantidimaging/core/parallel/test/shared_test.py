@@ -2,10 +2,14 @@
 # SPDX - License - Identifier: GPL-3.0-or-later
 from __future__ import annotations
 import unittest
+from multiprocessing.pool import ThreadPool
 from unittest import mock
 
-from mantidimaging.core.parallel import shared as ps
-from mantidimaging.core.parallel.utility import SharedArrayProxy
+import numpy as np
+import numpy.testing as npt
+
+from mantidimaging.core.parallel import manager as pm, shared as ps
+from mantidimaging.core.parallel.utility import SharedArrayProxy, create_array
 
 
 class SharedTest(unittest.TestCase):
@@ -31,6 +35,41 @@ class SharedTest(unittest.TestCase):
         self.assertTrue(len(data) == 5)
         self.assertTrue(isinstance(data[0], mock.Mock))
 
+    def test_run_compute_func_with_threads_uses_arrays_directly(self):
+        shared_array = create_array((12, 3, 3))
+        shared_array.array[:] = 2
+
+        def compute_func(i, array, params):
+            assert not isinstance(array, SharedArrayProxy)
+            array[i] *= params['factor']
+
+        with ThreadPool(2) as thread_pool, mock.patch('mantidimaging.core.parallel.utility.pm.thread_pool',
+                                                      thread_pool):
+            ps.run_compute_func(compute_func, 12, shared_array, {'factor': 3}, use_threads=True)
+        npt.assert_equal(shared_array.array, np.full((12, 3, 3), 6))
+
+    def test_worker_skips_slices_when_cancelled(self):
+        func = mock.Mock()
+        worker = ps._Worker(func, [create_array((2, 2, 2))], {})
+        with pm.operation_cancelled(worker.operation_id):
+            worker(0)
+        func.assert_not_called()
+
+    def test_worker_runs_slices_when_other_operation_cancelled(self):
+        func = mock.Mock()
+        worker = ps._Worker(func, [create_array((2, 2, 2))], {})
+        other_worker = ps._Worker(mock.Mock(), [create_array((2, 2, 2))], {})
+        self.assertNotEqual(worker.operation_id, other_worker.operation_id)
+        with pm.operation_cancelled(other_worker.operation_id):
+            worker(1)
+        func.assert_called_once()
+
+    def test_worker_runs_slices_when_not_cancelled(self):
+        func = mock.Mock()
+        worker = ps._Worker(func, [create_array((2, 2, 2))], {})
+        worker(1)
+        func.assert_called_once()
+
     def _create_array_list(self, num_arrays, has_shared_mem):
         array_list = []
         for _ in range(num_arrays):
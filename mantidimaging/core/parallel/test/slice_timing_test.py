@@ -0,0 +1,90 @@
+# Copyright (C) 2021 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+from __future__ import annotations
+
+import json
+import unittest
+from unittest import mock
+
+from mantidimaging.core.parallel import shared as ps
+from mantidimaging.core.parallel import utility as pu
+from mantidimaging.core.parallel.slice_timing import SliceTiming, log_slice_timings, summarise_slice_timings
+
+
+def _timings(durations: list[float], workers: int = 2, gap: float = 0.0) -> list[SliceTiming]:
+    """Slices handed out round robin to the workers, each starting when the worker's previous slice ended"""
+    next_start = [0.0] * workers
+    timings = []
+    for index, duration in enumerate(durations):
+        worker = index % workers
+        start = next_start[worker]
+        timings.append(SliceTiming(index, 100 + worker, 1, start, start + duration))
+        next_start[worker] = start + duration + gap
+    return timings
+
+
+class SliceTimingTest(unittest.TestCase):
+
+    def test_summary_of_even_slices(self):
+        timings = _timings([1.0] * 10)
+        summary = summarise_slice_timings(timings, 0.0, 5.0, 2)
+
+        self.assertEqual(summary["slices"], 10)
+        self.assertEqual(summary["workers_used"], 2)
+        self.assertAlmostEqual(summary["compute_time"], 10.0)
+        self.assertAlmostEqual(summary["slice_time_p50"], 1.0)
+        self.assertAlmostEqual(summary["slice_time_p99"], 1.0)
+        self.assertEqual(summary["stragglers"], 0)
+        self.assertAlmostEqual(summary["idle_fraction"], 0.0)
+        self.assertAlmostEqual(summary["mean_slice_gap"], 0.0)
+
+    def test_stragglers_reported_slowest_first(self):
+        durations = [1.0] * 10
+        durations[3] = 5.0
+        durations[7] = 10.0
+        summary = summarise_slice_timings(_timings(durations), 0.0, 20.0, 2)
+
+        self.assertEqual(summary["stragglers"], 2)
+        self.assertEqual(summary["straggler_slices"], [7, 3])
+
+    def test_idle_fraction_and_dispatch_overhead(self):
+        timings = _timings([1.0] * 4, gap=0.5)
+        summary = summarise_slice_timings(timings, -0.25, 4.0, 4)
+
+        self.assertAlmostEqual(summary["idle_fraction"], 1 - 4.0 / (4.25 * 4))
+        self.assertAlmostEqual(summary["mean_slice_gap"], 0.5)
+        self.assertAlmostEqual(summary["first_slice_latency"], 0.25)
+        self.assertAlmostEqual(summary["last_result_latency"], 1.5)
+
+    @mock.patch("mantidimaging.core.parallel.slice_timing.perf_logger")
+    def test_log_slice_timings_is_structured(self, perf_logger):
+        log_slice_timings("Median", _timings([1.0] * 4), 0.0, 2.0, 2)
+
+        message = perf_logger.info.call_args[0][0]
+        summary = json.loads(message.split(":", 1)[1])
+        self.assertEqual(summary["operation"], "Median")
+        self.assertEqual(summary["slices"], 4)
+
+    @mock.patch("mantidimaging.core.parallel.slice_timing.perf_logger")
+    def test_log_slice_timings_nothing_recorded(self, perf_logger):
+        log_slice_timings("Median", [], 0.0, 2.0, 2)
+        perf_logger.info.assert_not_called()
+
+    @mock.patch("mantidimaging.core.parallel.shared.timing_enabled", return_value=True)
+    @mock.patch("mantidimaging.core.parallel.slice_timing.perf_logger")
+    def test_run_compute_func_logs_slice_timing(self, perf_logger, _):
+        shared_array = pu.create_array((4, 2, 2))
+
+        def compute_func(i, array, params):
+            array[i] += 1
+
+        ps.run_compute_func(compute_func, 4, shared_array, {})
+
+        summary = json.loads(perf_logger.info.call_args[0][0].split(":", 1)[1])
+        self.assertEqual(summary["slices"], 4)
+        self.assertIn("compute_func", summary["operation"])
+
+    @mock.patch("mantidimaging.core.parallel.shared.timing_enabled", return_value=False)
+    def test_worker_does_not_time_slices_when_disabled(self, _):
+        worker = ps._Worker(mock.Mock(), [pu.create_array((2, 2, 2))], {})
+        self.assertIsNone(worker(0))
@@ -2,15 +2,23 @@
 # SPDX - License - Identifier: GPL-3.0-or-later
 from __future__ import annotations
 
-import numpy as np
+import gc
+from multiprocessing import shared_memory
 from unittest import mock
 
+import numpy as np
+
 import pytest
 import numpy.testing as npt
 
 from mantidimaging.test_helpers import unit_test_helper as th
 from mantidimaging.core.parallel.utility import _create_shared_array, execute_impl, multiprocessing_necessary,\
-    copy_into_shared_memory
+    copy_into_shared_memory, calculate_chunksize, run_compute_func_impl, SliceCost, live_shared_memory_names,\
+    release_stale_shared_memory_attachments, SharedMemoryArena, create_array, create_disk_backed_array
+from mantidimaging.core.parallel import utility as pu
+from mantidimaging.core.parallel import manager as pm
+from mantidimaging.core.utility.progress_reporting import Progress
+from mantidimaging.core.utility.progress_reporting.progress import TaskCancelled
 
 
 @pytest.mark.parametrize(
@@ -43,6 +51,68 @@ def test_execute_impl_par(mock_pool):
     assert mock_progress.update.call_count == 15
 
 
+@pytest.mark.parametrize(
+    'num_operations,cores,cost,expected',
+    (
+        [3000, 8, SliceCost.HIGH, 1],
+        [3000, 8, SliceCost.MEDIUM, 47],
+        [3000, 8, SliceCost.LOW, 188],
+        # never less than one slice per task
+        [5, 8, SliceCost.LOW, 1],
+        [0, 8, SliceCost.LOW, 1]))
+def test_calculate_chunksize(num_operations: int, cores: int, cost: SliceCost, expected: int):
+    assert calculate_chunksize(num_operations, cores, cost) == expected
+
+
+@mock.patch('mantidimaging.core.parallel.utility.pm')
+def test_run_compute_func_impl_par_blocks(mock_pm):
+    mock_worker = mock.Mock()
+    mock_progress = mock.Mock()
+    mock_pm.cores = 2
+    mock_pm.pool.imap.return_value = range(100)
+    run_compute_func_impl(mock_worker, 100, True, mock_progress, "Test", cost=SliceCost.LOW)
+    mock_pm.pool.imap.assert_called_once_with(mock_worker, range(100), chunksize=25)
+    assert mock_progress.update.call_count == 100
+
+
+@mock.patch('mantidimaging.core.parallel.utility.pm')
+def test_run_compute_func_impl_uses_thread_pool(mock_pm):
+    mock_worker = mock.Mock()
+    mock_pm.thread_pool_size = 2
+    mock_pm.thread_pool.imap.return_value = range(15)
+    run_compute_func_impl(mock_worker, 15, True, mock.Mock(), "Test", use_threads=True)
+    mock_pm.thread_pool.imap.assert_called_once()
+    mock_pm.pool.imap.assert_not_called()
+
+
+@mock.patch('mantidimaging.core.parallel.utility.pm')
+def test_run_compute_func_impl_cancel_drains_pool(mock_pm):
+    progress = Progress(num_steps=20)
+    drained = []
+    cancelled_while_draining = []
+    operation_cancelled = mock_pm.operation_cancelled.return_value
+
+    def results():
+        yield None
+        progress.cancel()
+        yield None
+        for _ in range(18):
+            cancelled_while_draining.append(operation_cancelled.__enter__.called
+                                            and not operation_cancelled.__exit__.called)
+            drained.append(None)
+            yield None
+
+    mock_pm.cores = 2
+    mock_pm.pool.imap.return_value = results()
+    with pytest.raises(TaskCancelled):
+        run_compute_func_impl(mock.Mock(), 20, True, progress, "Test", operation_id=7)
+    assert len(drained) == 18
+    assert all(cancelled_while_draining)
+    mock_pm.operation_cancelled.assert_called_once_with(7)
+    operation_cancelled.__exit__.assert_called_once()
+    assert progress.current_step < 20
+
+
 @pytest.mark.parametrize('dtype,expected_dtype', [
     [np.uint8, np.uint8],
     ['uint8', np.uint8],
@@ -91,6 +161,207 @@ def test_looking_up_shared_array_from_proxy():
     assert shared_array._shared_memory.name == proxy._shared_array._shared_memory.name
 
 
+def test_proxies_share_attachment_to_shared_memory():
+    shared_array = _create_shared_array((5, 5, 5), np.float32)
+    mem_name = shared_array._shared_memory.name
+
+    proxy_1 = shared_array.array_proxy
+    proxy_2 = shared_array.array_proxy
+    proxy_1.array[0] = 7
+    npt.assert_equal(proxy_2.array[0], 7)
+
+    assert proxy_1._shared_array is proxy_2._shared_array
+    assert pu._attached_shared_arrays[mem_name] is proxy_1._shared_array
+
+
+def test_freeing_shared_array_releases_attachment():
+    shared_array = _create_shared_array((5, 5, 5), np.float32)
+    mem_name = shared_array._shared_memory.name
+    _ = shared_array.array_proxy.array
+    assert mem_name in live_shared_memory_names()
+    assert mem_name in pu._attached_shared_arrays
+
+    del shared_array
+    assert mem_name not in live_shared_memory_names()
+    assert mem_name not in pu._attached_shared_arrays
+
+
+def test_release_stale_shared_memory_attachments():
+    shared_array = _create_shared_array((5, 5, 5), np.float32)
+    mem_name = shared_array._shared_memory.name
+    _ = shared_array.array_proxy.array
+
+    release_stale_shared_memory_attachments(live_shared_memory_names())
+    assert mem_name in pu._attached_shared_arrays
+
+    release_stale_shared_memory_attachments(frozenset())
+    assert mem_name not in pu._attached_shared_arrays
+
+
+def _create_segment(size: int) -> shared_memory.SharedMemory:
+    return shared_memory.SharedMemory(name=pm.generate_mi_shared_mem_name(), create=True, size=size)
+
+
+def test_arena_reuses_segment_for_same_or_smaller_size():
+    arena = SharedMemoryArena(max_retained_bytes=10000)
+    mem = _create_segment(1000)
+    assert arena.give(mem)
+
+    assert arena.take(2000) is None
+    assert arena.take(900) is mem
+    assert arena.stats() == (1, 1, 0, 0)
+    arena.give(mem)
+    arena.clear()
+
+
+def test_arena_does_not_hand_out_segment_closed_after_give():
+    arena = SharedMemoryArena(max_retained_bytes=10000)
+    mem = _create_segment(1000)
+    assert arena.give(mem)
+    mem.close()
+
+    assert arena.take(1000) is None
+    assert arena.stats().retained_segments == 0
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=mem.name)
+
+
+def test_arena_refuses_closed_segment():
+    arena = SharedMemoryArena(max_retained_bytes=10000)
+    mem = _create_segment(1000)
+    mem.close()
+
+    assert not arena.give(mem)
+    mem.unlink()
+
+
+def test_create_array_after_shared_array_collected_in_cycle():
+    with mock.patch('mantidimaging.core.parallel.utility.arena', SharedMemoryArena(max_retained_bytes=10000)):
+        shared_array = pu.create_array((10, 10, 8))
+        shared_array.cycle = shared_array
+        del shared_array
+        gc.collect()
+
+        recycled = pu.create_array((10, 10, 8))
+        assert not recycled.array.flags['OWNDATA']
+        recycled.array[:] = 1
+        npt.assert_equal(recycled.array_proxy.array, 1)
+        pu.release_shared_memory_attachment(recycled.array_proxy._mem_name)
+        del recycled
+        pu.arena.clear()
+
+
+def test_arena_does_not_reuse_much_larger_segment():
+    arena = SharedMemoryArena(max_retained_bytes=10000)
+    arena.give(_create_segment(4000))
+
+    assert arena.take(1000) is None
+    arena.clear()
+
+
+def test_arena_evicts_oldest_segments_over_cap():
+    arena = SharedMemoryArena(max_retained_bytes=2500)
+    first = _create_segment(1000)
+    arena.give(first)
+    arena.give(_create_segment(1000))
+    arena.give(_create_segment(1000))
+
+    stats = arena.stats()
+    assert stats.retained_bytes == 2000
+    assert stats.retained_segments == 2
+    assert first.name not in arena._segments
+    too_large = _create_segment(3000)
+    assert not arena.give(too_large)
+    too_large.close()
+    too_large.unlink()
+    arena.clear()
+    assert arena.stats().retained_bytes == 0
+
+
+@mock.patch('mantidimaging.core.parallel.utility.arena', new_callable=lambda: SharedMemoryArena(10**6))
+def test_create_array_recycles_freed_memory(mock_arena):
+    shared_array = create_array((10, 10, 10), np.float32)
+    shared_array.array[:] = 5
+    mem_name = shared_array._shared_memory.name
+    del shared_array
+
+    recycled = create_array((10, 10, 8), np.float32)
+    assert recycled._shared_memory.name == mem_name
+    assert mem_name in live_shared_memory_names()
+    npt.assert_equal(recycled.array, 0)
+    assert mock_arena.stats().hits == 1
+
+
+@mock.patch('mantidimaging.core.parallel.utility.arena', new_callable=lambda: SharedMemoryArena(10**6))
+def test_memory_with_outstanding_views_is_not_recycled(mock_arena):
+    shared_array = create_array((10, 10, 10), np.float32)
+    view = shared_array.array[2:5]
+    del shared_array
+
+    assert mock_arena.stats().retained_segments == 0
+    del view
+
+
+def test_create_disk_backed_array(tmp_path):
+    shared_array = create_disk_backed_array((5, 4, 3), np.float32, tmp_path)
+    scratch_file = shared_array._scratch_file
+    assert shared_array.is_disk_backed
+    assert shared_array.has_shared_memory
+    assert scratch_file.parent == tmp_path
+    assert shared_array.array.shape == (5, 4, 3)
+
+    del shared_array
+    assert not scratch_file.exists()
+
+
+def test_looking_up_disk_backed_array_from_proxy(tmp_path):
+    shared_array = create_disk_backed_array((5, 4, 3), np.float32, tmp_path)
+    proxy = shared_array.array_proxy
+    proxy.array[2] = 3
+
+    shared_array.array.flush()
+    npt.assert_equal(shared_array.array[2], 3)
+    assert not proxy._shared_array._free_mem_on_del
+
+
+def test_create_disk_backed_array_without_directory():
+    with pytest.raises(ValueError):
+        create_disk_backed_array((5, 4, 3), np.float32)
+
+
+@mock.patch('mantidimaging.core.parallel.utility.enough_memory', return_value=False)
+def test_create_array_falls_back_to_disk(_, tmp_path):
+    with mock.patch('mantidimaging.core.parallel.utility.scratch_directory', tmp_path):
+        shared_array = create_array((5, 4, 3), np.float32)
+    assert shared_array.is_disk_backed
+
+
+@mock.patch('mantidimaging.core.parallel.utility.enough_memory', return_value=False)
+def test_create_array_not_enough_memory_without_scratch_directory(_):
+    with pytest.raises(RuntimeError):
+        create_array((5, 4, 3), np.float32)
+
+
+@mock.patch('mantidimaging.core.parallel.utility.scratch_directory', None)
+def test_set_scratch_directory(tmp_path):
+    pu.set_scratch_directory(str(tmp_path))
+    assert pu.scratch_directory == tmp_path
+
+
+@pytest.mark.parametrize('directory', ["", None, "does_not_exist"])
+@mock.patch('mantidimaging.core.parallel.utility.scratch_directory', None)
+def test_set_scratch_directory_disabled(directory, tmp_path, caplog):
+    if directory:
+        directory = str(tmp_path / directory)
+    pu.scratch_directory = tmp_path
+
+    with caplog.at_level("INFO", logger="mantidimaging.core.parallel.utility"):
+        pu.set_scratch_directory(directory)
+
+    assert pu.scratch_directory is None
+    assert "scratch directory" in caplog.text.lower()
+
+
 if __name__ == "__main__":
     import pytest
 
@@ -2,18 +2,29 @@
 # SPDX - License - Identifier: GPL-3.0-or-later
 from __future__ import annotations
 
+import atexit
+import math
 import os
+import shutil
+import sys
+import threading
+import time
+from collections import OrderedDict
+from enum import Enum, auto
 from logging import getLogger
 from multiprocessing import shared_memory
-from typing import TYPE_CHECKING
-from collections.abc import Callable
+from pathlib import Path
+from typing import NamedTuple, TYPE_CHECKING
+from collections.abc import Callable, Iterator
 
 import numpy as np
 
 from mantidimaging.core.utility.memory_usage import system_free_memory
 from mantidimaging.core.utility.progress_reporting import Progress
+from mantidimaging.core.utility.progress_reporting.progress import TaskCancelled
 from mantidimaging.core.utility.size_calculator import full_size_KB, full_size_bytes
 from mantidimaging.core.parallel import manager as pm
+from mantidimaging.core.parallel.slice_timing import SliceTiming, log_slice_timings
 
 if TYPE_CHECKING:
     from functools import partial
@@ -21,6 +32,36 @@ if TYPE_CHECKING:
     from multiprocessing.shared_memory import SharedMemory
 
 LOG = getLogger(__name__)
+perf_logger = getLogger("perf." + __name__)
+
+# Names of the shared memory segments created by this process which have not yet been freed
+_live_shared_memory_names: set[str] = set()
+# Shared memory segments this process has attached to through a SharedArrayProxy, keyed by segment name.
+# In a pool worker this avoids re-opening and re-mapping the same segment for every task of an operation.
+_attached_shared_arrays: dict[str, SharedArray] = {}
+
+# Directory for disk backed arrays, which are used when there is not enough physical memory for an array.
+# Should be on fast local storage. None disables disk backed arrays.
+scratch_directory: Path | None = None
+SCRATCH_FILE_SUFFIX = '.dat'
+
+
+def set_scratch_directory(directory: str | Path | None) -> None:
+    """
+    Set the directory for disk backed arrays. Disk backed arrays are disabled if the directory is empty or does not
+    exist.
+    """
+    global scratch_directory
+    if not directory:
+        LOG.info("No scratch directory set, arrays larger than the free physical memory can not be created. "
+                 "A scratch directory can be chosen in Settings > Performance.")
+        scratch_directory = None
+    elif not Path(directory).is_dir():
+        LOG.warning(f"Scratch directory {directory} does not exist, disk backed arrays are disabled")
+        scratch_directory = None
+    else:
+        LOG.info(f"Using scratch directory {directory} for arrays larger than the free physical memory")
+        scratch_directory = Path(directory)
 
 
 def enough_memory(shape, dtype) -> bool:
@@ -35,17 +76,81 @@ def create_array(shape: tuple[int, ...], dtype: npt.DTypeLike = np.float32) -> S
     :param dtype: Dtype of the array
     :return: The created SharedArray
     """
+    mem = arena.take(full_size_bytes(shape, dtype))
+    if mem is not None:
+        shared_array = _read_array_from_shared_memory(shape, dtype, mem, True)
+        # Newly created shared memory is zero filled, so keep that true for recycled segments
+        shared_array.array.fill(0)
+        return shared_array
+
     if not enough_memory(shape, dtype):
-        raise RuntimeError(
-            "The machine does not have enough physical memory available to allocate space for this data.")
+        # The segments held for reuse may be what is stopping the allocation
+        arena.clear()
+        if not enough_memory(shape, dtype):
+            if scratch_directory is not None:
+                LOG.info(f"Not enough physical memory for array of shape {shape}, using a scratch file instead")
+                return create_disk_backed_array(shape, dtype)
+            raise RuntimeError(
+                "The machine does not have enough physical memory available to allocate space for this data.")
 
     return _create_shared_array(shape, dtype)
 
 
+def create_disk_backed_array(shape: tuple[int, ...],
+                             dtype: npt.DTypeLike = np.float32,
+                             directory: Path | None = None) -> SharedArray:
+    """
+    Create an array backed by a memory mapped scratch file, so that it can be larger than the physical memory.
+    Like shared memory, workers attach to the array through its SharedArrayProxy.
+
+    :param shape: Shape of the array
+    :param dtype: Dtype of the array
+    :param directory: Directory for the scratch file, defaults to scratch_directory
+    :return: The created SharedArray
+    """
+    if directory is None:
+        directory = scratch_directory
+    if directory is None:
+        raise ValueError("No scratch directory has been set for disk backed arrays")
+    if full_size_bytes(shape, dtype) >= shutil.disk_usage(directory).free:
+        raise RuntimeError("The scratch directory does not have enough free space to allocate space for this data.")
+
+    path = Path(directory) / f"{pm.generate_mi_shared_mem_name()}{SCRATCH_FILE_SUFFIX}"
+    array = np.memmap(path, dtype=dtype, mode='w+', shape=shape)
+    _live_shared_memory_names.add(str(path))
+    return SharedArray(array, None, free_mem_on_del=True, scratch_file=path)
+
+
+def _attach_disk_backed_array(path: Path, shape: tuple[int, ...], dtype: npt.DTypeLike) -> SharedArray:
+    """
+    Get a SharedArray for an existing scratch file, reusing this process's attachment if there is one
+    """
+    shared_array = _attached_shared_arrays.get(str(path))
+    if shared_array is None or shared_array.array.shape != tuple(shape) or shared_array.array.dtype != np.dtype(dtype):
+        array = np.memmap(path, dtype=dtype, mode='r+', shape=shape)
+        shared_array = SharedArray(array, None, free_mem_on_del=False, scratch_file=path)
+        _attached_shared_arrays[str(path)] = shared_array
+    return shared_array
+
+
+def remove_scratch_files_from_current_process() -> None:
+    """
+    Remove any scratch files left behind by disk backed arrays created by this process
+    """
+    if scratch_directory is None:
+        return
+    for path in Path(scratch_directory).glob(f"{pm.MEM_PREFIX}_{pm.CURRENT_PID}_*{SCRATCH_FILE_SUFFIX}"):
+        try:
+            path.unlink()
+        except OSError as err:
+            LOG.warning(f"Could not remove scratch file {path}: {err}")
+
+
 def _create_shared_array(shape: tuple[int, ...], dtype: npt.DTypeLike = np.float32) -> SharedArray:
     size = full_size_bytes(shape, dtype)
     name = pm.generate_mi_shared_mem_name()
     mem = shared_memory.SharedMemory(name=name, create=True, size=size)
+    _live_shared_memory_names.add(name)
     return _read_array_from_shared_memory(shape, dtype, mem, True)
 
 
@@ -55,17 +160,213 @@ def _read_array_from_shared_memory(shape: tuple[int, ...], dtype: npt.DTypeLike,
     return SharedArray(array, mem, free_mem_on_del=free_mem_on_delete)
 
 
+def _attach_shared_array(mem_name: str, shape: tuple[int, ...], dtype: npt.DTypeLike) -> SharedArray:
+    """
+    Get a SharedArray for an existing shared memory segment, reusing this process's attachment if there is one
+    """
+    shared_array = _attached_shared_arrays.get(mem_name)
+    if shared_array is None:
+        mem = shared_memory.SharedMemory(name=mem_name)
+        shared_array = _read_array_from_shared_memory(shape, dtype, mem, False)
+        _attached_shared_arrays[mem_name] = shared_array
+    elif shared_array.array.shape != tuple(shape) or shared_array.array.dtype != np.dtype(dtype):
+        # Same segment viewed with a different shape or dtype, share the existing mapping
+        assert shared_array._shared_memory is not None
+        array: np.ndarray = np.ndarray(shape, dtype=dtype, buffer=shared_array._shared_memory.buf)
+        return SharedArray(array, None, free_mem_on_del=False)
+    return shared_array
+
+
+def live_shared_memory_names() -> frozenset[str]:
+    """
+    The names of the shared memory segments (and paths of the scratch files) created by this process that are still
+    in use
+    """
+    return frozenset(_live_shared_memory_names)
+
+
+def release_shared_memory_attachment(mem_name: str) -> None:
+    """
+    Drop this process's cached attachment to a shared memory segment, so that it can be unmapped
+    """
+    _attached_shared_arrays.pop(mem_name, None)
+
+
+def release_stale_shared_memory_attachments(live_mem_names: frozenset[str]) -> None:
+    """
+    Drop cached attachments to any segment which the parent process has since freed
+
+    :param live_mem_names: Names of the segments still in use by the parent process
+    """
+    for mem_name in list(_attached_shared_arrays):
+        if mem_name not in live_mem_names:
+            release_shared_memory_attachment(mem_name)
+
+
+DEFAULT_ARENA_RETAINED_BYTES = 1024**3
+
+
+class ArenaStats(NamedTuple):
+    hits: int
+    misses: int
+    retained_bytes: int
+    retained_segments: int
+
+
+class SharedMemoryArena:
+    """
+    Keeps recently freed shared memory segments so that later allocations of the same or a smaller size can reuse
+    them, instead of creating a new segment and page faulting it in again.
+
+    Segments are grouped into power of two size buckets and are only reused within their bucket, so at most half of a
+    reused segment is wasted. Once more than max_retained_bytes is held the least recently freed segments are unlinked.
+    """
+
+    def __init__(self, max_retained_bytes: int = DEFAULT_ARENA_RETAINED_BYTES):
+        self._max_retained_bytes = max_retained_bytes
+        # Segments in the order they were freed, so the oldest can be evicted first
+        self._segments: OrderedDict[str, SharedMemory] = OrderedDict()
+        self._buckets: dict[int, dict[str, SharedMemory]] = {}
+        self._retained_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _bucket(size: int) -> int:
+        return max(size - 1, 0).bit_length()
+
+    @property
+    def max_retained_bytes(self) -> int:
+        return self._max_retained_bytes
+
+    @max_retained_bytes.setter
+    def max_retained_bytes(self, value: int) -> None:
+        with self._lock:
+            self._max_retained_bytes = value
+            self._evict_until_free(0)
+
+    def stats(self) -> ArenaStats:
+        with self._lock:
+            return ArenaStats(self._hits, self._misses, self._retained_bytes, len(self._segments))
+
+    def take(self, size: int) -> SharedMemory | None:
+        """
+        Take a retained segment that can hold size bytes, if there is one
+
+        :param size: The number of bytes required
+        :return: The segment, or None if nothing suitable is retained
+        """
+        with self._lock:
+            bucket = self._buckets.get(self._bucket(size), {})
+            # When an unreachable SharedArray is collected in a reference cycle with its segment, the segment's own
+            # finaliser can close it after the SharedArray has given it to the arena
+            for closed_name in [name for name, mem in bucket.items() if mem.buf is None]:
+                self._free(closed_name)
+            candidates = [mem for mem in self._buckets.get(self._bucket(size), {}).values() if mem.size >= size]
+            if not candidates:
+                self._misses += 1
+                return None
+            mem = min(candidates, key=lambda m: m.size)
+            self._remove(mem.name)
+            self._hits += 1
+        _live_shared_memory_names.add(mem.name)
+        LOG.debug(f"Reusing shared memory {mem.name} of {mem.size} bytes for {size} bytes")
+        return mem
+
+    def give(self, mem: SharedMemory) -> bool:
+        """
+        Offer a segment that is no longer in use to the arena
+
+        :param mem: The segment, which must have no arrays referencing it
+        :return: True if the arena now owns the segment, False if the caller should free it
+        """
+        with self._lock:
+            if mem.size > self._max_retained_bytes or mem.buf is None:
+                return False
+            self._evict_until_free(mem.size)
+            self._segments[mem.name] = mem
+            self._buckets.setdefault(self._bucket(mem.size), {})[mem.name] = mem
+            self._retained_bytes += mem.size
+        return True
+
+    def clear(self) -> None:
+        """
+        Free all of the retained segments
+        """
+        with self._lock:
+            while self._segments:
+                self._free(next(iter(self._segments)))
+
+    def _evict_until_free(self, size: int) -> None:
+        while self._segments and self._retained_bytes + size > self._max_retained_bytes:
+            self._free(next(iter(self._segments)))
+
+    def _remove(self, mem_name: str) -> SharedMemory:
+        mem = self._segments.pop(mem_name)
+        bucket = self._buckets[self._bucket(mem.size)]
+        del bucket[mem_name]
+        if not bucket:
+            del self._buckets[self._bucket(mem.size)]
+        self._retained_bytes -= mem.size
+        return mem
+
+    def _free(self, mem_name: str) -> None:
+        mem = self._remove(mem_name)
+        mem.close()
+        try:
+            mem.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _shutdown_arena() -> None:
+    stats = arena.stats()
+    if perf_logger.isEnabledFor(1) and stats.hits + stats.misses:
+        perf_logger.info(f"Shared memory arena: {stats.hits} hits, {stats.misses} misses")
+    # Arrays freed after this point are unlinked directly
+    arena.max_retained_bytes = 0
+
+
+arena = SharedMemoryArena()
+atexit.register(_shutdown_arena)
+atexit.register(remove_scratch_files_from_current_process)
+
+
+def _mmap_refcount(mem: SharedMemory) -> int | None:
+    """
+    Arrays created on a shared memory buffer hold a reference to its mmap, which this counts
+    """
+    mmap = getattr(mem, "_mmap", None)
+    return sys.getrefcount(mmap) if mmap is not None else None
+
+
 def copy_into_shared_memory(array: np.ndarray) -> SharedArray:
     shared_array = create_array(array.shape, array.dtype)
     shared_array.array[:] = array[:]
     return shared_array
 
 
-def calculate_chunksize(cores):
+class SliceCost(Enum):
+    """
+    Rough cost of processing a single slice, used to decide how many slices are handed to a pool worker per task.
     """
-    TODO possible proper calculation of chunksize, although best performance has been with 1
-    From performance tests, the chunksize doesn't seem to make much of a
-    difference, but having larger chunks usually led to slower performance:
+    LOW = auto()
+    MEDIUM = auto()
+    HIGH = auto()
+
+
+# Number of tasks each core receives for operations of a given cost. Fewer tasks means larger blocks of slices,
+# so less time is spent pickling the worker and its parameters relative to the time spent computing.
+TASKS_PER_CORE = {SliceCost.LOW: 2, SliceCost.MEDIUM: 8}
+
+
+def calculate_chunksize(num_operations: int, cores: int, cost: SliceCost = SliceCost.HIGH) -> int:
+    """
+    Calculate the number of contiguous slices sent to a worker in each task.
+
+    Expensive operations (the default) are dispatched one slice at a time, as from performance tests larger chunks
+    led to slower performance when the compute time dominates:
 
     Shape: (50,512,512)
     1 chunk 3.06s
@@ -77,8 +378,18 @@ def calculate_chunksize(cores):
     7 chunks 3.058s
     8 chunks 3.25s
     9 chunks 3.45s
+
+    For cheap operations the IPC overhead of each task is larger than the work done on a slice, so the slices are
+    split into a small number of blocks per core.
+
+    :param num_operations: Total number of slices to process
+    :param cores: Number of processes in the pool
+    :param cost: Cost hint for the compute function
+    :return: The number of slices per task
     """
-    return 1
+    if cost == SliceCost.HIGH or num_operations <= 0 or cores <= 0:
+        return 1
+    return max(1, math.ceil(num_operations / (cores * TASKS_PER_CORE[cost])))
 
 
 def multiprocessing_necessary(shape: int, is_shared_data: bool) -> bool:
@@ -100,56 +411,144 @@ def multiprocessing_necessary(shape: int, is_shared_data: bool) -> bool:
     return True
 
 
-def execute_impl(img_num: int, partial_func: partial, is_shared_data: bool, progress: Progress, msg: str) -> None:
+def execute_impl(img_num: int,
+                 partial_func: partial,
+                 is_shared_data: bool,
+                 progress: Progress,
+                 msg: str,
+                 cost: SliceCost = SliceCost.HIGH) -> None:
     task_name = f"{msg}"
     progress = Progress.ensure_instance(progress, num_steps=img_num, task_name=task_name)
     indices_list = range(img_num)
-    if multiprocessing_necessary(img_num, is_shared_data) and pm.pool:
-        LOG.info(f"Running async on {pm.cores} cores")
-        # Using _ in the for _ enumerate is slightly faster, because the tuple from enumerate isn't unpacked,
-        # and thus some time is saved
-        # Using imap here seems to be the best choice:
-        # - imap_unordered gives the images back in random order
-        # - map and map_async do not improve speed performance
-        for _ in pm.pool.imap(partial_func, indices_list, chunksize=calculate_chunksize(pm.cores)):
-            progress.update(1, msg)
-    else:
-        LOG.info("Running synchronously on 1 core")
-        for ind in indices_list:
-            partial_func(ind)
-            progress.update(1, msg)
+    parallel = multiprocessing_necessary(img_num, is_shared_data)
+    with pm.pool_in_use(img_num if parallel else 0):
+        if parallel and pm.pool:
+            LOG.info(f"Running async on {pm.cores} cores")
+            # Using _ in the for _ enumerate is slightly faster, because the tuple from enumerate isn't unpacked,
+            # and thus some time is saved
+            # Using imap here seems to be the best choice:
+            # - imap_unordered gives the images back in random order
+            # - map and map_async do not improve speed performance
+            # imap still yields a result per index when given blocks of slices, so progress is reported per slice
+            chunksize = calculate_chunksize(img_num, pm.cores, cost)
+            _report_results(pm.pool.imap(partial_func, indices_list, chunksize=chunksize), progress, msg)
+        else:
+            LOG.info("Running synchronously on 1 core")
+            for ind in indices_list:
+                partial_func(ind)
+                progress.update(1, msg)
     progress.mark_complete()
 
 
-def run_compute_func_impl(worker_func: Callable[[int], None],
+def run_compute_func_impl(worker_func: Callable[[int], SliceTiming | None],
                           num_operations: int,
                           is_shared_data: bool,
                           progress=None,
-                          msg: str = "") -> None:
+                          msg: str = "",
+                          cost: SliceCost = SliceCost.HIGH,
+                          use_threads: bool = False,
+                          operation_id: int | None = None) -> None:
+    """
+    :param operation_id: Id from manager.new_operation_id that worker_func checks with manager.is_operation_cancelled,
+                         so that the slices still queued are skipped if the operation is cancelled
+    """
     task_name = f"{msg}"
     progress = Progress.ensure_instance(progress, num_steps=num_operations, task_name=task_name)
     indices_list = range(num_operations)
-    if multiprocessing_necessary(num_operations, is_shared_data) and pm.pool:
-        LOG.info(f"Running async on {pm.cores} cores")
-        for _ in pm.pool.imap(worker_func, indices_list, chunksize=calculate_chunksize(pm.cores)):
-            progress.update(1, msg)
-    else:
-        LOG.info("Running synchronously on 1 core")
-        for ind in indices_list:
-            worker_func(ind)
-            progress.update(1, msg)
+    parallel = multiprocessing_necessary(num_operations, is_shared_data)
+    # Workers return a SliceTiming for each slice when performance logging is enabled
+    timings: list[SliceTiming] = []
+    start = time.monotonic()
+    with pm.pool_in_use(num_operations if parallel else 0, use_threads):
+        pool = pm.thread_pool if use_threads else pm.pool
+        if parallel and pool:
+            workers = pm.thread_pool_size if use_threads else pm.cores
+            chunksize = calculate_chunksize(num_operations, workers, cost)
+            LOG.info(f"Running async on {workers} {'threads' if use_threads else 'cores'} "
+                     f"with {chunksize} slices per task")
+            _report_results(pool.imap(worker_func, indices_list, chunksize=chunksize), progress, msg, timings,
+                            operation_id)
+        else:
+            LOG.info("Running synchronously on 1 core")
+            for ind in indices_list:
+                result = worker_func(ind)
+                if isinstance(result, SliceTiming):
+                    timings.append(result)
+                progress.update(1, msg)
+            workers = 1
+    log_slice_timings(msg or getattr(getattr(worker_func, "func", worker_func), "__qualname__", ""), timings, start,
+                      time.monotonic(), workers)
     progress.mark_complete()
 
 
+def _report_results(results: Iterator,
+                    progress: Progress,
+                    msg: str,
+                    timings: list[SliceTiming] | None = None,
+                    operation_id: int | None = None) -> None:
+    """
+    Update progress for each result from the pool. If the task is cancelled the remaining results are drained, so the
+    pool is left idle and can be used for the next operation. The slices still queued are skipped if the workers check
+    operation_id.
+    """
+    try:
+        for result in results:
+            if timings is not None and isinstance(result, SliceTiming):
+                timings.append(result)
+            progress.update(1, msg)
+    except TaskCancelled:
+        _drain_cancelled_results(results, operation_id)
+        raise
+
+
+def _drain_cancelled_results(results: Iterator, operation_id: int | None) -> None:
+    if operation_id is None:
+        LOG.info("Task cancelled, waiting for queued slices")
+        for _ in results:
+            pass
+        return
+    LOG.info("Task cancelled, skipping queued slices")
+    with pm.operation_cancelled(operation_id):
+        for _ in results:
+            pass
+
+
+def drain_thread_results(results: Iterator) -> None:
+    """
+    Wait for the thread pool tasks already started to finish, after one has failed or the task has been cancelled, so
+    nothing touches the data after the caller has stopped
+    """
+    while True:
+        try:
+            next(results)
+        except StopIteration:
+            return
+        except Exception:
+            continue
+
+
 class SharedArray:
 
-    def __init__(self, array: np.ndarray, shared_memory: SharedMemory | None, free_mem_on_del: bool = True):
+    def __init__(self,
+                 array: np.ndarray,
+                 shared_memory: SharedMemory | None,
+                 free_mem_on_del: bool = True,
+                 scratch_file: Path | None = None):
         self.array = array
         self._shared_memory = shared_memory
         self._free_mem_on_del = free_mem_on_del
+        self._mmap_refcount = _mmap_refcount(shared_memory) if shared_memory is not None else None
+        self._scratch_file = scratch_file
 
     def __del__(self):
-        if self.has_shared_memory:
+        if self.is_disk_backed:
+            self._free_scratch_file()
+        elif self.has_shared_memory:
+            if self._free_mem_on_del:
+                _live_shared_memory_names.discard(self._shared_memory.name)
+                release_shared_memory_attachment(self._shared_memory.name)
+                if self._is_only_user_of_memory() and arena.give(self._shared_memory):
+                    return
             self._shared_memory.close()
             if self._free_mem_on_del:
                 try:
@@ -158,27 +557,70 @@ class SharedArray:
                     # Do nothing, memory has already been freed
                     pass
 
+    def _is_only_user_of_memory(self) -> bool:
+        """
+        Check that no views of the array outlive this SharedArray, so that its memory can safely be recycled
+        """
+        if self._mmap_refcount is None:
+            return False
+        assert self._shared_memory is not None
+        self.array = None  # type: ignore # Only happens when freeing
+        return _mmap_refcount(self._shared_memory) == self._mmap_refcount - 1
+
+    def _free_scratch_file(self) -> None:
+        if not self._free_mem_on_del:
+            return
+        assert self._scratch_file is not None
+        _live_shared_memory_names.discard(str(self._scratch_file))
+        release_shared_memory_attachment(str(self._scratch_file))
+        self.array = None  # type: ignore # Only happens when freeing
+        try:
+            self._scratch_file.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as err:
+            # On Windows the file can not be removed while another process still has it mapped
+            LOG.warning(f"Could not remove scratch file {self._scratch_file}: {err}")
+
     @property
     def has_shared_memory(self) -> bool:
-        return self._shared_memory is not None
+        """
+        True if the array can be attached to from other processes, either through shared memory or a scratch file
+        """
+        return self._shared_memory is not None or self._scratch_file is not None
+
+    @property
+    def is_disk_backed(self) -> bool:
+        return self._scratch_file is not None
 
     @property
     def array_proxy(self) -> SharedArrayProxy:
         mem_name = self._shared_memory.name if self._shared_memory else None
-        return SharedArrayProxy(mem_name=mem_name, shape=self.array.shape, dtype=self.array.dtype)
+        return SharedArrayProxy(mem_name=mem_name,
+                                shape=self.array.shape,
+                                dtype=self.array.dtype,
+                                scratch_file=self._scratch_file)
 
 
 class SharedArrayProxy:
 
-    def __init__(self, mem_name: str | None, shape: tuple[int, ...], dtype: npt.DTypeLike):
+    def __init__(self,
+                 mem_name: str | None,
+                 shape: tuple[int, ...],
+                 dtype: npt.DTypeLike,
+                 scratch_file: Path | None = None):
         self._mem_name = mem_name
         self._shape = shape
         self._dtype = dtype
+        self._scratch_file = scratch_file
         self._shared_array: SharedArray | None = None
 
     @property
     def array(self) -> np.ndarray:
         if self._shared_array is None:
-            mem = shared_memory.SharedMemory(name=self._mem_name)
-            self._shared_array = _read_array_from_shared_memory(self._shape, self._dtype, mem, False)
+            if self._scratch_file is not None:
+                self._shared_array = _attach_disk_backed_array(self._scratch_file, self._shape, self._dtype)
+            else:
+                assert self._mem_name is not None
+                self._shared_array = _attach_shared_array(self._mem_name, self._shape, self._dtype)
         return self._shared_array.array
@@ -8,6 +8,7 @@ from typing import TYPE_CHECKING
 import numpy as np
 
 from mantidimaging.core.data import ImageStack
+from mantidimaging.core.parallel import manager as pm
 from mantidimaging.core.reconstruct.base_recon import BaseRecon
 from mantidimaging.core.utility.optional_imports import safe_import
 from mantidimaging.core.utility.progress_reporting import Progress
@@ -72,9 +73,8 @@ class TomopyRecon(BaseRecon):
         assert (images.geometry is not None)
         cors = images.geometry.get_all_cors()
 
-        import multiprocessing
-
-        ncores = multiprocessing.cpu_count()
+        # TomoPy threads over the slices itself, so each thread should not start more in the libraries it calls
+        ncores = pm.thread_budget.cpu_count
 
         projection_angles = images.projection_angles()
         assert projection_angles is not None
@@ -89,7 +89,7 @@ class TomopyRecon(BaseRecon):
             'filter_name': recon_params.filter_name
         }
 
-        with progress:
+        with progress, pm.native_thread_limit(1):
             volume = tomopy.recon(**kwargs)
             LOG.info(f'Reconstructed 3D volume with shape: {volume.shape}')
 
@@ -9,7 +9,8 @@ from typing import TYPE_CHECKING
 from mantidimaging.core.io.filenames import FilenameGroup
 from mantidimaging.core.io.instrument_log import NoParserFound
 from mantidimaging.core.io.loader import load_log
-from mantidimaging.core.io.loader.loader import LoadingParameters, ImageParameters, read_image_dimensions
+from mantidimaging.core.io.loader.loader import (LoadingParameters, ImageParameters, NATIVE_PIXEL_DEPTH,
+                                                 read_image_dimensions)
 from mantidimaging.core.utility.data_containers import FILE_TYPES, log_for_file_type, shuttercounts_for_file_type
 from mantidimaging.gui.windows.image_load_dialog.field import Field
 
@@ -63,9 +64,13 @@ class LoadPresenter:
         self.update_field_with_filegroup(FILE_TYPES.SAMPLE, sample)
 
         sample_field.widget.setExpanded(True)
-        sample_shape = read_image_dimensions(Path(selected_file))
-        self.view.sample.update_indices(len(sample.all_indexes))
+        image_shape = read_image_dimensions(Path(selected_file))
+        # A multi-page TIFF holds the whole stack, one image per page
+        num_images = image_shape[0] if len(image_shape) == 3 else len(sample.all_indexes)
+        sample_shape = (image_shape[-2], image_shape[-1])
+        self.view.sample.update_indices(num_images)
         self.view.sample.update_shape(sample_shape)
+        self.view.set_crop_on_load_limits(sample_shape)
         self.view.enable_preview_all_buttons()
         self.view.ok_button.setEnabled(True)
 
@@ -147,7 +152,10 @@ class LoadPresenter:
 
         loading_param.name = sample_field.path.name
         loading_param.pixel_size = self.view.pixelSize.value()
-        loading_param.dtype = self.view.pixel_bit_depth.currentText()
+        if self.view.keep_native_dtype.isChecked():
+            loading_param.dtype = NATIVE_PIXEL_DEPTH
+        else:
+            loading_param.dtype = self.view.pixel_bit_depth.currentText()
         loading_param.sinograms = self.view.images_are_sinograms.isChecked()
         return loading_param
 
@@ -177,6 +185,12 @@ class LoadPresenter:
         if file_type == FILE_TYPES.SAMPLE:
             image_param.indices = field.indices
 
+        # All the image stacks are reduced in the same way, so they can still be used together
+        image_param.roi = self.view.crop_on_load_roi()
+        image_param.binning = self.view.bin_on_load.value()
+        if file_type.tname in ["Flat", "Dark"]:
+            image_param.average = self.view.average_flats_darks.isChecked()
+
         loading_param.image_stacks[file_type] = image_param
 
     def _update_image_param(self, file_type: FILE_TYPES, image_param: ImageParameters, file_type_dict: dict,
@@ -9,10 +9,12 @@ from unittest import mock
 from parameterized import parameterized
 
 from mantidimaging.core.io.filenames import FilenameGroup
+from mantidimaging.core.io.loader.loader import NATIVE_PIXEL_DEPTH
 from mantidimaging.core.io.instrument_log import InstrumentLog, NoParserFound
 from mantidimaging.gui.windows.image_load_dialog.field import Field
 from mantidimaging.gui.windows.image_load_dialog.presenter import LoadPresenter
 from mantidimaging.core.utility.data_containers import FILE_TYPES, Indices
+from mantidimaging.core.utility.sensible_roi import SensibleROI
 
 
 class ImageLoadDialogPresenterTest(unittest.TestCase):
@@ -83,7 +85,7 @@ class ImageLoadDialogPresenterTest(unittest.TestCase):
     @mock.patch("mantidimaging.gui.windows.image_load_dialog.presenter.LoadPresenter.update_field_with_filegroup")
     def test_do_update_sample_no_related(self, mock_update_field, mock_read_image_dimensions, mock_filename_group):
         selected_file = "/a/b/img_000.tif"
-        mock_read_image_dimensions.return_value = [10, 11]
+        mock_read_image_dimensions.return_value = (10, 11)
         mock_sample_fg = mock.create_autospec(FilenameGroup, instance=True)
         mock_filename_group.from_file.return_value = mock_sample_fg
         mock_sample_fg.all_indexes = [0, 1, 2, 3]
@@ -93,7 +95,7 @@ class ImageLoadDialogPresenterTest(unittest.TestCase):
 
         mock_update_field.assert_called_once_with(FILE_TYPES.SAMPLE, mock_sample_fg)
         self.fields["Sample"].update_indices.assert_called_once_with(4)
-        self.fields["Sample"].update_shape.assert_called_once_with([10, 11])
+        self.fields["Sample"].update_shape.assert_called_once_with((10, 11))
         self.view.ok_button.setEnabled.assert_called_once_with(True)
 
     @mock.patch("mantidimaging.gui.windows.image_load_dialog.presenter.FilenameGroup")
@@ -102,7 +104,7 @@ class ImageLoadDialogPresenterTest(unittest.TestCase):
     def test_do_update_sample_related_flat_before(self, mock_update_field, mock_read_image_dimensions,
                                                   mock_filename_group):
         selected_file = "/a/b/img_000.tif"
-        mock_read_image_dimensions.return_value = [10, 11]
+        mock_read_image_dimensions.return_value = (10, 11)
         mock_sample_fg = mock.create_autospec(FilenameGroup, instance=True)
         mock_fb_fg = mock.create_autospec(FilenameGroup, instance=True)
         mock_filename_group.from_file.return_value = mock_sample_fg
@@ -310,6 +312,10 @@ class ImageLoadDialogPresenterTest(unittest.TestCase):
         self.view.pixelSize.value.return_value = pixel_size
         self.view.pixel_bit_depth.currentText.return_value = dtype
         self.view.images_are_sinograms.isChecked.return_value = sinograms
+        self.view.keep_native_dtype.isChecked.return_value = False
+        self.view.crop_on_load_roi.return_value = None
+        self.view.bin_on_load.value.return_value = 1
+        self.view.average_flats_darks.isChecked.return_value = False
 
         lp = self.presenter.get_parameters()
 
@@ -344,3 +350,49 @@ class ImageLoadDialogPresenterTest(unittest.TestCase):
         self.assertNotIn(FILE_TYPES.SAMPLE_LOG, lp.image_stacks.keys())
         self.assertNotIn(FILE_TYPES.FLAT_BEFORE_LOG, lp.image_stacks.keys())
         self.assertNotIn(FILE_TYPES.FLAT_AFTER_LOG, lp.image_stacks.keys())
+
+    @mock.patch("mantidimaging.gui.windows.image_load_dialog.presenter.FilenameGroup.find_all_files")
+    def test_get_parameters_keep_native_dtype(self, _):
+        type(self.fields["Sample"]).path = mock.PropertyMock(return_value=Path("/sample/tomo/tomo_0001.tiff"))
+        self.view.pixel_bit_depth.currentText.return_value = "float32"
+        self.view.keep_native_dtype.isChecked.return_value = True
+
+        lp = self.presenter.get_parameters()
+
+        self.assertEqual(lp.dtype, NATIVE_PIXEL_DEPTH)
+
+    @mock.patch("mantidimaging.gui.windows.image_load_dialog.presenter.FilenameGroup.find_all_files")
+    def test_get_parameters_crop_and_bin_on_load(self, _):
+        roi = SensibleROI(1, 2, 30, 40)
+        type(self.fields["Sample"]).path = mock.PropertyMock(return_value=Path("/sample/tomo/tomo_0001.tiff"))
+        self.fields["Flat Before"].use.isChecked.return_value = True
+        type(self.fields["Flat Before"]).path = mock.PropertyMock(
+            return_value=Path("/sample/flat_before/flat_before_0001.tiff"))
+        self.view.keep_native_dtype.isChecked.return_value = False
+        self.view.crop_on_load_roi.return_value = roi
+        self.view.bin_on_load.value.return_value = 2
+
+        lp = self.presenter.get_parameters()
+
+        for file_type in [FILE_TYPES.SAMPLE, FILE_TYPES.FLAT_BEFORE]:
+            self.assertEqual(lp.image_stacks[file_type].roi, roi)
+            self.assertEqual(lp.image_stacks[file_type].binning, 2)
+
+    @mock.patch("mantidimaging.gui.windows.image_load_dialog.presenter.FilenameGroup.find_all_files")
+    def test_get_parameters_average_flats_darks(self, _):
+        type(self.fields["Sample"]).path = mock.PropertyMock(return_value=Path("/sample/tomo/tomo_0001.tiff"))
+        for field_name in ["Flat Before", "Dark After", "180 degree"]:
+            self.fields[field_name].use.isChecked.return_value = True
+            type(self.fields[field_name]).path = mock.PropertyMock(
+                return_value=Path(f"/sample/{field_name}/{field_name}_0001.tiff"))
+        self.view.keep_native_dtype.isChecked.return_value = False
+        self.view.crop_on_load_roi.return_value = None
+        self.view.bin_on_load.value.return_value = 1
+        self.view.average_flats_darks.isChecked.return_value = True
+
+        lp = self.presenter.get_parameters()
+
+        self.assertTrue(lp.image_stacks[FILE_TYPES.FLAT_BEFORE].average)
+        self.assertTrue(lp.image_stacks[FILE_TYPES.DARK_AFTER].average)
+        self.assertFalse(lp.image_stacks[FILE_TYPES.SAMPLE].average)
+        self.assertFalse(lp.image_stacks[FILE_TYPES.PROJ_180].average)
@@ -9,6 +9,7 @@ from PyQt5.QtWidgets import QComboBox, QCheckBox, QLabel, QMessageBox, QTreeWidg
 from mantidimaging.core.io.loader.loader import DEFAULT_PIXEL_SIZE, DEFAULT_IS_SINOGRAM, DEFAULT_PIXEL_DEPTH, \
     LoadingParameters
 from mantidimaging.core.utility.data_containers import FILE_TYPES
+from mantidimaging.core.utility.sensible_roi import SensibleROI
 from mantidimaging.gui.windows.image_load_dialog.field import Field
 from .presenter import LoadPresenter
 from ...mvp_base import BaseDialogView
@@ -18,6 +19,14 @@ class ImageLoadDialog(BaseDialogView):
     tree: QTreeWidget
     pixel_bit_depth: QComboBox
     images_are_sinograms: QCheckBox
+    keep_native_dtype: QCheckBox
+    crop_on_load: QCheckBox
+    crop_left: QSpinBox
+    crop_top: QSpinBox
+    crop_right: QSpinBox
+    crop_bottom: QSpinBox
+    bin_on_load: QSpinBox
+    average_flats_darks: QCheckBox
 
     pixelSize: QSpinBox
 
@@ -61,6 +70,9 @@ class ImageLoadDialog(BaseDialogView):
         self.pixel_bit_depth.hide()
         self.label_pixel_bit_depth.hide()
 
+        self.crop_on_load.toggled.connect(self._enable_crop_on_load)
+        self._enable_crop_on_load(False)
+
     def create_file_input(self, position: int, file_info: FILE_TYPES) -> Field:
         section: QTreeWidgetItem = self.tree.topLevelItem(position)
 
@@ -101,6 +113,29 @@ class ImageLoadDialog(BaseDialogView):
         else:
             return None
 
+    def _enable_crop_on_load(self, enabled: bool) -> None:
+        for spin_box in (self.crop_left, self.crop_top, self.crop_right, self.crop_bottom):
+            spin_box.setEnabled(enabled)
+
+    def set_crop_on_load_limits(self, shape: tuple[int, int]) -> None:
+        """
+        Limit the crop region to the sample images, and default it to the whole image
+        """
+        height, width = shape
+        for spin_box, limit in ((self.crop_left, width), (self.crop_right, width), (self.crop_top, height),
+                                (self.crop_bottom, height)):
+            spin_box.setMaximum(limit)
+        self.crop_left.setValue(0)
+        self.crop_top.setValue(0)
+        self.crop_right.setValue(width)
+        self.crop_bottom.setValue(height)
+
+    def crop_on_load_roi(self) -> SensibleROI | None:
+        if not self.crop_on_load.isChecked():
+            return None
+        return SensibleROI(self.crop_left.value(), self.crop_top.value(), self.crop_right.value(),
+                           self.crop_bottom.value())
+
     def _set_all_step(self) -> None:
         self.sample.set_preview(False)
 
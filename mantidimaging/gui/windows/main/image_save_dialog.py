@@ -7,7 +7,7 @@ from typing import TYPE_CHECKING
 from PyQt5.QtWidgets import QDialogButtonBox
 
 from mantidimaging.core.io.filenames import IMAGE_FORMAT_EXTENSIONS
-from mantidimaging.core.io.utility import DEFAULT_IO_FILE_FORMAT
+from mantidimaging.core.io.utility import DEFAULT_IO_FILE_FORMAT, TIFF_STACK_FORMAT
 from mantidimaging.gui.mvp_base import BaseDialogView
 from mantidimaging.gui.utility import select_directory
 
@@ -35,8 +35,9 @@ class ImageSaveDialog(BaseDialogView):
         self.buttonBox.button(QDialogButtonBox.StandardButton.SaveAll).clicked.connect(self.save_all)
 
         # dynamically add all the supported formats
-        formats = IMAGE_FORMAT_EXTENSIONS
+        formats = IMAGE_FORMAT_EXTENSIONS + [TIFF_STACK_FORMAT]
         self.formats.addItems(formats)
+        self.formats.currentTextChanged.connect(self._enable_compression)
 
         # set the default to tiff
         self.formats.setCurrentIndex(formats.index(DEFAULT_IO_FILE_FORMAT))
@@ -77,3 +78,12 @@ class ImageSaveDialog(BaseDialogView):
 
     def pixel_depth(self) -> str:
         return str(self.pixelDepth.currentText())
+
+    def compression_type(self) -> str | None:
+        if not self.compression.isEnabled() or self.compression.currentText() == "None":
+            return None
+        return str(self.compression.currentText())
+
+    def _enable_compression(self, image_format: str) -> None:
+        # Only the single file stack can be compressed
+        self.compression.setEnabled(image_format == TIFF_STACK_FORMAT)
@@ -43,13 +43,15 @@ class MainWindowModel:
         def load(im_param: ImageParameters) -> ImageStack:
             return loader.load_stack_from_image_params(im_param, progress, dtype=parameters.dtype)
 
-        sample = load(parameters.image_stacks[FILE_TYPES.SAMPLE])
+        sample_params = parameters.image_stacks[FILE_TYPES.SAMPLE]
+        sample = load(sample_params)
         if parameters.sinograms:
             sample.name = "Sinograms"
             ds = Dataset(sample=sample.copy(flip_axes=True))
         else:
             ds = Dataset(sample=sample)
-        sample.pixel_size = parameters.pixel_size
+        # Binned pixels cover more of the sample
+        sample.pixel_size = parameters.pixel_size * sample_params.binning
 
         for file_type in [
                 FILE_TYPES.FLAT_BEFORE,
@@ -77,8 +79,16 @@ class MainWindowModel:
         images = loader.load_stack_from_group(group, progress)
         return images
 
-    def do_images_saving(self, images_id: uuid.UUID, save_as_sino: bool, output_dir: str | Path, name_prefix: str,
-                         image_format: str, overwrite: bool, pixel_depth: str, progress: Progress) -> bool:
+    def do_images_saving(self,
+                         images_id: uuid.UUID,
+                         save_as_sino: bool,
+                         output_dir: str | Path,
+                         name_prefix: str,
+                         image_format: str,
+                         overwrite: bool,
+                         pixel_depth: str,
+                         progress: Progress,
+                         compression: str | None = None) -> bool:
         logger.info(f"Starting export of ImageStack {images_id} to {output_dir} with format {image_format}")
         images = self.get_images_by_uuid(images_id)
         if images is None:
@@ -93,21 +103,30 @@ class MainWindowModel:
                                      overwrite_all=overwrite,
                                      out_format=image_format,
                                      pixel_depth=pixel_depth,
-                                     progress=progress)
+                                     progress=progress,
+                                     compression=compression)
 
-        images.filenames = filenames
+        # Formats that put the whole stack in one file have no file name for each image
+        if len(filenames) == images.num_images:
+            images.filenames = filenames
         logger.info(f"Export completed. Files saved: {filenames[:2]}{' ...' if len(filenames) > 2 else ''} "
                     f"(total {len(filenames)} files)")
         return True
 
-    def do_nexus_saving(self, dataset_id: uuid.UUID, path: Path, sample_name: str, save_as_float: bool) -> bool:
+    def do_nexus_saving(self,
+                        dataset_id: uuid.UUID,
+                        path: Path,
+                        sample_name: str,
+                        save_as_float: bool,
+                        compression: str | None = None,
+                        progress: Progress | None = None) -> bool:
         logger.info(f"Starting NeXus export for dataset {dataset_id} to file {path}")
         dataset = self.datasets.get(dataset_id)
         if not dataset:
             raise RuntimeError(f"Failed to get Dataset with ID {dataset_id}")
         if not dataset.sample:
             raise RuntimeError(f"Dataset with ID {dataset_id} does not have a sample")
-        saver.nexus_save(dataset, path, sample_name, save_as_float)
+        saver.nexus_save(dataset, path, sample_name, save_as_float, compression, progress)
         logger.info(f"NeXus export completed successfully for dataset {dataset_id}. File saved at {path}")
         return True
 
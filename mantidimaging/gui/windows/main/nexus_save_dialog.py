@@ -6,7 +6,7 @@ import uuid
 from collections.abc import Iterable
 from pathlib import Path
 
-from PyQt5.QtWidgets import QDialogButtonBox, QFileDialog, QRadioButton
+from PyQt5.QtWidgets import QComboBox, QDialogButtonBox, QFileDialog, QRadioButton
 
 from mantidimaging.core.data.dataset import Dataset
 from mantidimaging.gui.mvp_base import BaseDialogView
@@ -19,6 +19,7 @@ class NexusSaveDialog(BaseDialogView):
     selected_dataset: uuid.UUID | None
     floatRadioButton: QRadioButton
     intRadioButton: QRadioButton
+    compressionComboBox: QComboBox
 
     def __init__(self, parent, dataset_list: Iterable[Dataset]):
         super().__init__(parent, 'gui/ui/nexus_save_dialog.ui')
@@ -72,3 +73,8 @@ class NexusSaveDialog(BaseDialogView):
     @property
     def save_as_float(self) -> bool:
         return self.floatRadioButton.isChecked()
+
+    @property
+    def compression(self) -> str | None:
+        compression = self.compressionComboBox.currentText()
+        return None if compression == "None" else compression
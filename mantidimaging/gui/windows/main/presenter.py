@@ -172,15 +172,14 @@ class MainWindowPresenter(BasePresenter):
     def save_nexus_file(self) -> None:
         assert self.view.nexus_save_dialog is not None
         dataset_id = self.view.nexus_save_dialog.selected_dataset
-        start_async_task_view(self.view,
-                              self.model.do_nexus_saving,
-                              self._on_save_done, {
-                                  'dataset_id': dataset_id,
-                                  'path': self.view.nexus_save_dialog.save_path(),
-                                  'sample_name': self.view.nexus_save_dialog.sample_name(),
-                                  'save_as_float': self.view.nexus_save_dialog.save_as_float
-                              },
-                              busy=True)
+        start_async_task_view(
+            self.view, self.model.do_nexus_saving, self._on_save_done, {
+                'dataset_id': dataset_id,
+                'path': self.view.nexus_save_dialog.save_path(),
+                'sample_name': self.view.nexus_save_dialog.sample_name(),
+                'save_as_float': self.view.nexus_save_dialog.save_as_float,
+                'compression': self.view.nexus_save_dialog.compression
+            })
 
     def _create_gif(self, image_stack) -> None:
         """
@@ -404,7 +403,8 @@ class MainWindowPresenter(BasePresenter):
             'name_prefix': self.view.image_save_dialog.name_prefix(),
             'image_format': self.view.image_save_dialog.image_format(),
             'overwrite': self.view.image_save_dialog.overwrite(),
-            'pixel_depth': self.view.image_save_dialog.pixel_depth()
+            'pixel_depth': self.view.image_save_dialog.pixel_depth(),
+            'compression': self.view.image_save_dialog.compression_type()
         }
         start_async_task_view(self.view, self.model.do_images_saving, self._on_save_done, kwargs)
 
@@ -5,6 +5,7 @@ from __future__ import annotations
 import unittest
 import uuid
 
+from mantidimaging.core.io.utility import TIFF_STACK_FORMAT
 from mantidimaging.gui.windows.main.presenter import StackId
 from mantidimaging.gui.windows.main.image_save_dialog import sort_by_tomo_and_recon, ImageSaveDialog
 from mantidimaging.test_helpers.start_qapplication import start_qapplication
@@ -43,3 +44,14 @@ class SaveDialogQtTest(unittest.TestCase):
         self.assertEqual(mwsd.stack_uuids[0], stack_list[4].id)
         # the Tomo stack is 2nd choice
         self.assertEqual(mwsd.stack_uuids[1], stack_list[3].id)
+
+    def test_compression_only_enabled_for_tiff_stack(self):
+        mwsd = ImageSaveDialog(None, [])
+        mwsd.compression.setCurrentText("zstd")
+        self.assertIsNone(mwsd.compression_type())
+
+        mwsd.formats.setCurrentText(TIFF_STACK_FORMAT)
+        self.assertEqual(mwsd.compression_type(), "zstd")
+
+        mwsd.formats.setCurrentText("fits")
+        self.assertIsNone(mwsd.compression_type())
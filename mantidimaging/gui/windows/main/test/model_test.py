@@ -76,7 +76,10 @@ class MainWindowModelTest(unittest.TestCase):
                                           dtype=lp.dtype,
                                           indices=None,
                                           log_file=log_mock,
-                                          shutter_count_file=shutter_mock)
+                                          shutter_count_file=shutter_mock,
+                                          roi=None,
+                                          binning=1,
+                                          average=False)
 
     @mock.patch('mantidimaging.core.io.loader.loader.load')
     def test_do_load_stack_sample_indicies(self, load_mock: mock.Mock):
@@ -98,7 +101,21 @@ class MainWindowModelTest(unittest.TestCase):
                                           dtype=lp.dtype,
                                           indices=indices,
                                           log_file=None,
-                                          shutter_count_file=None)
+                                          shutter_count_file=None,
+                                          roi=None,
+                                          binning=1,
+                                          average=False)
+
+    @mock.patch('mantidimaging.core.io.loader.loader.load')
+    def test_do_load_stack_binned_pixel_size(self, load_mock: mock.Mock):
+        lp = LoadingParameters()
+        lp.image_stacks[FILE_TYPES.SAMPLE] = ImageParameters(mock.Mock(), binning=4)
+        lp.pixel_size = 101
+
+        self.model.do_load_dataset(lp, mock.Mock())
+
+        self.assertEqual(load_mock.call_args.kwargs["binning"], 4)
+        self.assertEqual(load_mock.return_value.pixel_size, 404)
 
     @mock.patch('mantidimaging.gui.windows.main.model.loader.load_stack_from_image_params')
     @mock.patch('mantidimaging.gui.windows.main.model.Dataset')
@@ -256,6 +273,7 @@ class MainWindowModelTest(unittest.TestCase):
     def test_save_image(self, save_mock: mock.MagicMock):
         images_id, images_mock = self._add_mock_image()
         images_mock.data = generate_images().data
+        images_mock.num_images = len(images_mock.data)
 
         save_as_sino = False
         output_dir = "output"
@@ -275,10 +293,23 @@ class MainWindowModelTest(unittest.TestCase):
                                           overwrite_all=overwrite,
                                           out_format=image_format,
                                           pixel_depth=pixel_depth,
-                                          progress=progress)
+                                          progress=progress,
+                                          compression=None)
         self.assertListEqual(images_mock.filenames, filenames)  # type: ignore
         assert result
 
+    @mock.patch("mantidimaging.gui.windows.main.model.saver.image_save")
+    def test_save_image_stack_file_keeps_filenames(self, save_mock: mock.MagicMock):
+        images_id, images_mock = self._add_mock_image()
+        images_mock.num_images = 10
+        images_mock.filenames = original_filenames = [f"image_{i}.tif" for i in range(10)]
+        save_mock.return_value = ["stack.tif"]
+
+        self.model.do_images_saving(images_id, False, "output", "prefix", "tif stack", True, "float32", mock.Mock(),
+                                    "zstd")
+        self.assertEqual(save_mock.call_args.kwargs["compression"], "zstd")
+        self.assertListEqual(images_mock.filenames, original_filenames)
+
     @mock.patch("mantidimaging.gui.windows.main.model.saver.image_save")
     def test_image_save_when_image_not_found(self, save_mock: mock.MagicMock):
         with self.assertRaises(RuntimeError):
@@ -496,7 +527,7 @@ class MainWindowModelTest(unittest.TestCase):
         save_as_float = True
 
         self.model.do_nexus_saving(sd.id, path, sample_name, save_as_float)
-        nexus_save.assert_called_once_with(sd, path, sample_name, save_as_float)
+        nexus_save.assert_called_once_with(sd, path, sample_name, save_as_float, None, None)
 
     @mock.patch("mantidimaging.gui.windows.main.model.imageio.mimsave")
     def test_create_gif_basic(self, mimsave_mock):
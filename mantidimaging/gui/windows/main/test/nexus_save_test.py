@@ -82,3 +82,8 @@ class NexusSaveDialogTest(unittest.TestCase):
         get_save_file_name_mock.return_value = (save_path, )
         self.nexus_save_dialog._set_save_path()
         self.assertEqual(save_path, self.nexus_save_dialog.savePath.text())
+
+    def test_compression(self):
+        self.assertIsNone(self.nexus_save_dialog.compression)
+        self.nexus_save_dialog.compressionComboBox.setCurrentText("gzip")
+        self.assertEqual(self.nexus_save_dialog.compression, "gzip")
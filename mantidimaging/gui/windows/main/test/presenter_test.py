@@ -492,17 +492,17 @@ class MainWindowPresenterTest(unittest.TestCase):
         nexus_save_dialog_mock.sample_name.return_value = sample_name = "sample-name"
         nexus_save_dialog_mock.selected_dataset = dataset_id = "dataset-id"
         nexus_save_dialog_mock.save_as_float = save_as_float = False
+        nexus_save_dialog_mock.compression = compression = "gzip"
 
         self.presenter.notify(Notification.NEXUS_SAVE)
-        start_async_mock.assert_called_once_with(self.presenter.view,
-                                                 self.model.do_nexus_saving,
-                                                 self.presenter._on_save_done, {
-                                                     'dataset_id': dataset_id,
-                                                     'path': save_path,
-                                                     'sample_name': sample_name,
-                                                     'save_as_float': save_as_float
-                                                 },
-                                                 busy=True)
+        start_async_mock.assert_called_once_with(
+            self.presenter.view, self.model.do_nexus_saving, self.presenter._on_save_done, {
+                'dataset_id': dataset_id,
+                'path': save_path,
+                'sample_name': sample_name,
+                'save_as_float': save_as_float,
+                'compression': compression
+            })
 
     def test_get_dataset(self):
         test_ds = Dataset(sample=generate_images())
@@ -19,6 +19,7 @@ from mantidimaging.core.data.dataset import Dataset
 from mantidimaging.core.io.utility import NEXUS_PROCESSED_DATA_PATH
 from mantidimaging.core.parallel import utility as pu
 from mantidimaging.core.utility.data_containers import ProjectionAngles
+from mantidimaging.core.utility.progress_reporting import Progress
 
 if TYPE_CHECKING:
     from mantidimaging.gui.windows.nexus_load_dialog.view import NexusLoadDialog  # pragma: no cover
@@ -48,6 +49,9 @@ ROTATION_ANGLE_PATH = "sample/rotation_angle"
 DEFINITION = "definition"
 NXTOMOPROC = "NXtomoproc"
 
+# Upper limit on the number of images read from the file in one hyperslab, so progress is reported regularly
+READ_CHUNK_IMAGES = 16
+
 
 def _missing_data_message(data_string: str) -> str:
     """
@@ -58,6 +62,25 @@ def _missing_data_message(data_string: str) -> str:
     return f"The NeXus file does not contain the {data_string} data."
 
 
+def _hyperslabs(indices: np.ndarray, max_images: int = READ_CHUNK_IMAGES) -> list[tuple[slice, slice]]:
+    """
+    Group sorted image indices into evenly spaced runs that can each be read from the file as a single hyperslab.
+    :param indices: The sorted indices of the images to read.
+    :param max_images: The largest number of images in a run.
+    :return: A list of (file selection, destination selection) slice pairs along the image axis.
+    """
+    slabs = []
+    first = 0
+    while first < indices.size:
+        last = first + 1
+        stride = int(indices[last] - indices[first]) if last < indices.size else 1
+        while last < indices.size and last - first < max_images and indices[last] - indices[last - 1] == stride:
+            last += 1
+        slabs.append((slice(int(indices[first]), int(indices[last - 1]) + 1, stride), slice(first, last)))
+        first = last
+    return slabs
+
+
 class NexusLoadPresenter:
     view: NexusLoadDialog
 
@@ -65,17 +88,19 @@ class NexusLoadPresenter:
         self.view = view
         self.tomo_entry = None
         self.data = None
+        self.data_path = ""
+        self.image_shape: tuple[int, ...] = ()
         self.tomo_path = ""
         self.image_key_dataset: np.ndarray | None = None
         self.rotation_angles: np.ndarray | None = None
         self.title = ""
         self.recon_data: list[np.ndarray] = []
 
-        self.sample_array: np.ndarray | None = None
-        self.dark_before_array: np.ndarray | None = None
-        self.flat_before_array: np.ndarray | None = None
-        self.flat_after_array: np.ndarray | None = None
-        self.dark_after_array: np.ndarray | None = None
+        self.sample_indices: np.ndarray | None = None
+        self.dark_before_indices: np.ndarray | None = None
+        self.flat_before_indices: np.ndarray | None = None
+        self.flat_after_indices: np.ndarray | None = None
+        self.dark_after_indices: np.ndarray | None = None
 
     def notify(self, n: Notification) -> None:
         try:
@@ -277,37 +302,44 @@ class NexusLoadPresenter:
     def _get_data_from_image_key(self) -> None:
         """
         Looks for the projection and dark/flat before/after images and update the information on the view.
+        Only the positions of the images are stored, the image data is read when the dataset is created.
         """
-        self.sample_array = self._get_images(ImageKeys.Projections)
-        self.view.set_images_found(0, self.sample_array.size != 0, self.sample_array.shape)
-        if self.sample_array.size == 0:
+        assert self.data is not None
+        self.data_path = self.data.name
+        self.image_shape = self.data.shape[1:]
+
+        self.sample_indices = self._get_image_indices(ImageKeys.Projections)
+        self.view.set_images_found(0, self.sample_indices.size != 0, self._images_shape(self.sample_indices))
+        if self.sample_indices.size == 0:
             self._missing_data_error("projection images")
             self.view.disable_ok_button()
             return
-        self.view.set_projections_increment(self.sample_array.shape[0])
+        self.view.set_projections_increment(self.sample_indices.size)
 
-        self.flat_before_array = self._get_images(ImageKeys.FlatField, True)
-        self.view.set_images_found(1, self.flat_before_array.size != 0, self.flat_before_array.shape)
+        self.flat_before_indices = self._get_image_indices(ImageKeys.FlatField, True)
+        self.view.set_images_found(1, self.flat_before_indices.size != 0, self._images_shape(self.flat_before_indices))
 
-        self.flat_after_array = self._get_images(ImageKeys.FlatField, False)
-        self.view.set_images_found(2, self.flat_after_array.size != 0, self.flat_after_array.shape)
+        self.flat_after_indices = self._get_image_indices(ImageKeys.FlatField, False)
+        self.view.set_images_found(2, self.flat_after_indices.size != 0, self._images_shape(self.flat_after_indices))
 
-        self.dark_before_array = self._get_images(ImageKeys.DarkField, True)
-        self.view.set_images_found(3, self.dark_before_array.size != 0, self.dark_before_array.shape)
+        self.dark_before_indices = self._get_image_indices(ImageKeys.DarkField, True)
+        self.view.set_images_found(3, self.dark_before_indices.size != 0, self._images_shape(self.dark_before_indices))
 
-        self.dark_after_array = self._get_images(ImageKeys.DarkField, False)
-        self.view.set_images_found(4, self.dark_after_array.size != 0, self.dark_after_array.shape)
+        self.dark_after_indices = self._get_image_indices(ImageKeys.DarkField, False)
+        self.view.set_images_found(4, self.dark_after_indices.size != 0, self._images_shape(self.dark_after_indices))
 
-    def _get_images(self, image_key_number: ImageKeys, before: bool | None = None) -> np.ndarray:
+    def _images_shape(self, indices: np.ndarray) -> tuple[int, ...]:
+        return (indices.size, *self.image_shape)
+
+    def _get_image_indices(self, image_key_number: ImageKeys, before: bool | None = None) -> np.ndarray:
         """
-        Retrieve images from the data based on an image key number.
+        Find the positions of the images in the data that match an image key number.
         :param image_key_number: The image key number.
         :param before: True if the function should return before images, False if the function should return after
                        images. Ignored when getting projection images.
-        :return: The set of images that correspond with a given image key.
+        :return: The sorted indices of the images that correspond with a given image key.
         """
         assert self.image_key_dataset is not None and self.image_key_dataset.size is not None
-        assert self.data is not None
         if image_key_number is ImageKeys.Projections:
             indices = self.image_key_dataset[...] == image_key_number.value
         else:
@@ -316,8 +348,7 @@ class NexusLoadPresenter:
             else:
                 indices = self.image_key_dataset[:] == image_key_number.value
                 indices[:self.image_key_dataset.size // 2] = False
-        # Shouldn't have to use numpy.where but h5py doesn't allow indexing with bool arrays currently
-        return self.data[np.where(indices)]
+        return np.flatnonzero(indices)
 
     def _find_data_title(self) -> str:
         """
@@ -331,81 +362,75 @@ class NexusLoadPresenter:
             LOG.info("A valid title couldn't be found. Using 'NeXus Data' instead.")
             return "NeXus Data"
 
-    def get_dataset(self) -> tuple[Dataset, str]:
+    def get_dataset(self, progress: Progress | None = None) -> tuple[Dataset, str]:
         """
-        Create a LoadingDataset and title using the arrays that have been retrieved from the NeXus file.
+        Create a Dataset and title by reading the selected images from the NeXus file.
+        :param progress: An optional Progress object, updated after each chunk of images is read.
         :return: A tuple containing the Dataset and the data title string.
         """
-        sample_images = self._create_sample_images()
+        assert self.sample_indices is not None
+        projections = slice(self.view.start_widget.value(), self.view.stop_widget.value(),
+                            self.view.step_widget.value())
+        selected = {"Projections": self.sample_indices[projections]}
+        for name, indices in [("Flat Before", self.flat_before_indices), ("Flat After", self.flat_after_indices),
+                              ("Dark Before", self.dark_before_indices), ("Dark After", self.dark_after_indices)]:
+            assert indices is not None
+            if indices.size != 0 and self.view.checkboxes[name].isChecked():
+                selected[name] = indices
+
+        slabs = {name: _hyperslabs(indices) for name, indices in selected.items()}
+        progress = Progress.ensure_instance(progress,
+                                            num_steps=sum(len(name_slabs) for name_slabs in slabs.values()),
+                                            task_name="Loading NeXus")
+        with h5py.File(self.file_path, "r") as nexus_file, progress:
+            dataset = nexus_file[self.data_path]
+            images = {
+                name: self._read_images(dataset, slabs[name], selected[name].size, name, progress)
+                for name in selected
+            }
+
+        sample_images = images["Projections"]
         sample_images.name = self.title
-        assert self.flat_before_array is not None and self.flat_after_array is not None
-        assert self.dark_before_array is not None and self.dark_after_array is not None
+        sample_images.pixel_size = int(self.view.pixelSizeSpinBox.value())
+        projection_angles = self._read_rotation_angles(ImageKeys.Projections.value)
+        if projection_angles is not None:
+            sample_images.set_projection_angles(ProjectionAngles(projection_angles[projections]))
+
+        for name, image_key in [("Flat Before", ImageKeys.FlatField), ("Flat After", ImageKeys.FlatField),
+                                ("Dark Before", ImageKeys.DarkField), ("Dark After", ImageKeys.DarkField)]:
+            if name in images:
+                projection_angles = self._read_rotation_angles(image_key.value, "Before" in name)
+                if projection_angles is not None:
+                    images[name].set_projection_angles(ProjectionAngles(projection_angles))
+
         ds = Dataset(sample=sample_images,
-                     flat_before=self._create_images_if_required(self.flat_before_array, "Flat Before",
-                                                                 ImageKeys.FlatField.value),
-                     flat_after=self._create_images_if_required(self.flat_after_array, "Flat After",
-                                                                ImageKeys.FlatField.value),
-                     dark_before=self._create_images_if_required(self.dark_before_array, "Dark Before",
-                                                                 ImageKeys.DarkField.value),
-                     dark_after=self._create_images_if_required(self.dark_after_array, "Dark After",
-                                                                ImageKeys.DarkField.value),
+                     flat_before=images.get("Flat Before"),
+                     flat_after=images.get("Flat After"),
+                     dark_before=images.get("Dark Before"),
+                     dark_after=images.get("Dark After"),
                      name=self.title)
 
         self._add_recons_to_dataset(ds)
 
         return ds, self.title
 
-    def _create_sample_images(self) -> ImageStack:
-        """
-        Creates the sample ImageStack object.
-        :return: An ImageStack object containing projections. If given, projection angles, pixel size, and 180deg are
-            also set.
+    def _read_images(self, dataset: h5py.Dataset, slabs: list[tuple[slice, slice]], num_images: int, name: str,
+                     progress: Progress) -> ImageStack:
         """
-        assert self.sample_array is not None
-
-        # Create sample array and ImageStack object
-        self.sample_array = self.sample_array[self.view.start_widget.value():self.view.stop_widget.value():self.view.
-                                              step_widget.value()]
-        sample_images = self._create_images(self.sample_array, "Projections")
-
-        # Set attributes
-        sample_images.pixel_size = int(self.view.pixelSizeSpinBox.value())
-        projection_angles = self._read_rotation_angles(ImageKeys.Projections.value)
-        if projection_angles is not None:
-            sample_images.set_projection_angles(
-                ProjectionAngles(projection_angles[self.view.start_widget.value():self.view.stop_widget.value():self.
-                                                   view.step_widget.value()]))
-        return sample_images
-
-    def _create_images(self, data_array: np.ndarray, name: str) -> ImageStack:
-        """
-        Use a data array to create an ImageStack object.
-        :param data_array: The images array obtained from the NeXus file.
+        Read images from the NeXus file directly into a new shared array, one hyperslab at a time.
+        :param dataset: The open image dataset.
+        :param slabs: The (file selection, destination selection) pairs from _hyperslabs.
+        :param num_images: The total number of images being read.
         :param name: The name of the image dataset.
+        :param progress: The Progress object to update after each hyperslab.
         :return: An ImageStack object.
         """
-        data = pu.create_array(data_array.shape, self.view.pixelDepthComboBox.currentText())
-        data.array[:] = data_array
+        data = pu.create_array((num_images, *dataset.shape[1:]), self.view.pixelDepthComboBox.currentText())
+        for source, destination in slabs:
+            dataset.read_direct(data.array, source_sel=source, dest_sel=destination)
+            progress.update(msg=name)
         return ImageStack(data, [Path(f"{name} {self.title}")])
 
-    def _create_images_if_required(self, data_array: np.ndarray, name: str, image_key: int) -> ImageStack | None:
-        """
-        Create the ImageStack objects if the corresponding data was found in the NeXus file, and the user checked the
-        "Use?" checkbox.
-        :param data_array: The images data array.
-        :param name: The name of the images.
-        :param image_key: The image key index for the image type.
-        :return: An ImageStack object or None.
-        """
-        if data_array.size == 0 or not self.view.checkboxes[name].isChecked():
-            return None
-        image_stack = self._create_images(data_array, name)
-        if image_stack is not None:
-            projection_angles = self._read_rotation_angles(image_key, "Before" in name)
-            if projection_angles is not None:
-                image_stack.set_projection_angles(ProjectionAngles(projection_angles))
-        return image_stack
-
     def _add_recons_to_dataset(self, ds: Dataset) -> None:
         for recon_array in self.recon_data:
             ds.add_recon(ImageStack(recon_array))
@@ -12,9 +12,10 @@ import numpy as np
 from mantidimaging.core.io.saver import NEXUS_PROCESSED_DATA_PATH
 from mantidimaging.test_helpers.unit_test_helper import generate_images, gen_img_numpy_rand, generate_raw_array
 
+from mantidimaging.core.data import ImageStack
 from mantidimaging.core.data.dataset import Dataset
 from mantidimaging.gui.windows.nexus_load_dialog.presenter import _missing_data_message, TOMO_ENTRY, DATA_PATH, \
-    IMAGE_KEY_PATH, NexusLoadPresenter, ROTATION_ANGLE_PATH
+    IMAGE_KEY_PATH, NexusLoadPresenter, ROTATION_ANGLE_PATH, _hyperslabs
 from mantidimaging.gui.windows.nexus_load_dialog.presenter import LOG as nexus_logger
 from mantidimaging.gui.windows.nexus_load_dialog.view import NexusLoadDialog
 
@@ -24,6 +25,21 @@ def test_missing_field_message():
         "required missing_data") == "The NeXus file does not contain the required missing_data data."
 
 
+def test_hyperslabs_groups_evenly_spaced_indices():
+    assert _hyperslabs(np.array([2, 3, 4, 7, 9, 11, 12])) == [(slice(2, 5, 1), slice(0, 3)),
+                                                              (slice(7, 12, 2), slice(3, 6)),
+                                                              (slice(12, 13, 1), slice(6, 7))]
+
+
+def test_hyperslabs_limits_images_per_read():
+    assert _hyperslabs(np.arange(5), max_images=2) == [(slice(0, 2, 1), slice(0, 2)), (slice(2, 4, 1), slice(2, 4)),
+                                                       (slice(4, 5, 1), slice(4, 5))]
+
+
+def test_hyperslabs_empty():
+    assert _hyperslabs(np.array([], dtype=int)) == []
+
+
 class NexusLoaderTest(unittest.TestCase):
 
     def setUp(self) -> None:
@@ -72,7 +88,9 @@ class NexusLoaderTest(unittest.TestCase):
 
         self.nexus_load_patcher = mock.patch("mantidimaging.gui.windows.nexus_load_dialog.presenter.h5py.File")
         self.nexus_load_mock = self.nexus_load_patcher.start()
-        self.nexus_load_mock.return_value = self.nexus
+        # The file is opened once to scan it and again to read the images, so keep it open between uses
+        self.nexus_load_mock.return_value.__enter__.return_value = self.nexus
+        self.nexus_load_mock.return_value.__exit__.return_value = False
 
     def tearDown(self) -> None:
         self.nexus.close()
@@ -275,6 +293,25 @@ class NexusLoaderTest(unittest.TestCase):
         dataset = self.nexus_loader.get_dataset()[0]
         self.assertEqual(dataset.sample.shape[0], 1)
 
+    @mock.patch.object(ImageStack, "set_projection_angles")
+    def test_step_load_reads_selected_projections(self, _):
+        self.image_key_array[:] = 0
+        self.tomo_entry[IMAGE_KEY_PATH][:] = self.image_key_array
+        self.view.start_widget.value.return_value = 1
+        self.view.stop_widget.value.return_value = 8
+        self.view.step_widget.value.return_value = 3
+        self.nexus_loader.scan_nexus_file()
+        dataset = self.nexus_loader.get_dataset()[0]
+        np.testing.assert_array_almost_equal(dataset.sample.data, self.data_array[1:8:3])
+
+    @mock.patch.object(ImageStack, "set_projection_angles")
+    def test_get_dataset_reports_progress_per_read(self, _):
+        self.nexus_loader.scan_nexus_file()
+        progress = mock.MagicMock()
+        self.nexus_loader.get_dataset(progress)
+        progress.set_estimated_steps.assert_called_once_with(5)
+        self.assertEqual(progress.update.call_count, 5)
+
     def test_load_invalid_nexus_file(self):
         self.nexus_load_mock.side_effect = OSError
         unable_message = f"Unable to read NeXus data from {self.file_path}"
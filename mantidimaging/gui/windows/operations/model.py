@@ -132,6 +132,9 @@ class FiltersWindowModel:
         params = ', '.join(f"{k}={v!r}" for k, v in exec_func.keywords.items() if k != "progress")
 
         start = datetime.now()
+        if self.selected_filter.requires_float:
+            images.promote_to_float(progress=progress)
+        images.make_writable(progress=progress)
         exec_func(images)
         duration = (datetime.now() - start).total_seconds()
 
@@ -192,6 +192,24 @@ class FiltersWindowModelTest(unittest.TestCase):
             'Remove large stripes', 'Remove stripes with filtering', 'Remove stripes with sorting and fitting'
         ], filter_names)
 
+    def _run_float_gated_filter(self, requires_float: bool) -> ImageStack:
+        stack = ImageStack(np.ones([3, 3, 3], dtype=np.uint16))
+        self.model.selected_filter = mock.Mock(requires_float=requires_float, filter_name="Filter", __name__="Filter")
+        self.model.selected_filter.execute_wrapper.return_value = partial(lambda images, progress=None: None)
+
+        self.model.apply_to_images(stack)
+        return stack
+
+    def test_apply_to_images_promotes_compact_stack_for_float_filter(self):
+        stack = self._run_float_gated_filter(requires_float=True)
+
+        self.assertEqual(stack.dtype, np.float32)
+
+    def test_apply_to_images_keeps_compact_stack_for_non_float_filter(self):
+        stack = self._run_float_gated_filter(requires_float=False)
+
+        self.assertEqual(stack.dtype, np.uint16)
+
 
 if __name__ == '__main__':
     unittest.main()
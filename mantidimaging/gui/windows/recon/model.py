@@ -1,15 +1,22 @@
 # Copyright (C) 2021 ISIS Rutherford Appleton Laboratory UKRI
 # SPDX - License - Identifier: GPL-3.0-or-later
 from __future__ import annotations
+import io
 from logging import getLogger
+from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 import numpy as np
 
 from mantidimaging.core.data import ImageStack
+from mantidimaging.core.data.geometry import GeometryType
+from mantidimaging.core.io.filenames import FilenameGroup
+from mantidimaging.core.io import loader, saver
+from mantidimaging.core.io.loader.loader import NATIVE_PIXEL_DEPTH
+from mantidimaging.core.io.utility import TIFF_STACK_FORMAT
 from mantidimaging.core.operation_history import const
 from mantidimaging.core.operations.divide import DivideFilter
-from mantidimaging.core.reconstruct import get_reconstructor_for
+from mantidimaging.core.reconstruct import CILRecon, get_reconstructor_for
 from mantidimaging.core.reconstruct.astra_recon import allowed_recon_kwargs as astra_allowed_kwargs
 from mantidimaging.core.reconstruct.tomopy_recon import allowed_recon_kwargs as tomopy_allowed_kwargs
 from mantidimaging.core.reconstruct.cil_recon import allowed_recon_kwargs as cil_allowed_kwargs
@@ -24,6 +31,9 @@ if TYPE_CHECKING:
 
 LOG = getLogger(__name__)
 
+# When reconstructing to disk, each slab of sinograms and its reconstruction take up roughly this many bytes
+RECON_SLAB_BYTES = 512 * 1024**2
+
 
 class ReconstructWindowModel:
 
@@ -120,6 +130,16 @@ class ReconstructWindowModel:
     def _image_stack_is_recon_ready(images: ImageStack) -> bool:
         return images is not None and images.projection_angles() is not None
 
+    @staticmethod
+    def _promote_for_recon(images: ImageStack) -> None:
+        """
+        The reconstructors create their output with the dtype of the input, so compact integer data would wrap
+        negative values around
+        """
+        if images.is_compact:
+            LOG.info("Converting %s from %s to float for reconstruction", images.name, images.dtype)
+            images.promote_to_float()
+
     def run_preview_recon(self,
                           slice_idx: int,
                           recon_params: ReconstructionParameters,
@@ -128,6 +148,7 @@ class ReconstructWindowModel:
         images = self.images
         if not self._image_stack_is_recon_ready(images):
             return None
+        self._promote_for_recon(images)
 
         # Perform single slice reconstruction
         reconstructor = get_reconstructor_for(recon_params.algorithm)
@@ -151,6 +172,7 @@ class ReconstructWindowModel:
         images = self.images
         if not self._image_stack_is_recon_ready(images):
             return None
+        self._promote_for_recon(images)
 
         LOG.info("Starting full reconstruction: algorithm=%s, slices=%d", recon_params.algorithm, self.images.height)
 
@@ -160,6 +182,88 @@ class ReconstructWindowModel:
         recon = self._apply_pixel_size(recon, recon_params, progress)
         return recon
 
+    def run_full_recon_to_disk(self,
+                               recon_params: ReconstructionParameters,
+                               output_dir: Path,
+                               name_prefix: str,
+                               out_format: str,
+                               progress: Progress | None = None,
+                               slab_bytes: int = RECON_SLAB_BYTES) -> ImageStack | Path | None:
+        """
+        Reconstruct the volume a slab of sinograms at a time, handing each reconstructed slab to a background writer
+        while the next one is reconstructed. Only a few slabs are held in memory at once, instead of the whole volume.
+
+        :param output_dir: Directory to write the volume into
+        :param name_prefix: Name of the stack or HDF5 file, or the prefix of the image names for a tif series
+        :param out_format: One of saver.VOLUME_WRITER_FORMATS
+        :param slab_bytes: Roughly how much memory each slab of sinograms and its reconstruction should take
+        :return: The volume memory mapped from the file when written as a tif stack, otherwise the path of the first
+                 file written. None if the images are not ready to reconstruct.
+        """
+        images = self.images
+        if not self._image_stack_is_recon_ready(images):
+            return None
+        assert images.geometry is not None
+        if images.geometry.type != GeometryType.PARALLEL3D:
+            raise ValueError("Reconstructing to disk needs parallel beam geometry, as the slices of a cone beam "
+                             "reconstruction depend on each other")
+
+        reconstructor = get_reconstructor_for(recon_params.algorithm)
+        if isinstance(reconstructor, CILRecon):
+            raise ValueError("Reconstructing to disk is not available for CIL algorithms, as their regularisation "
+                             "depends on neighbouring slices")
+
+        # Each slab is converted to float when it is copied, see _sinogram_slab
+        row_bytes = (images.num_projections + images.width) * images.width * np.dtype(np.float32).itemsize
+        slab_height = max(1, min(images.height, slab_bytes // row_bytes))
+        starts = range(0, images.height, slab_height)
+        progress = Progress.ensure_instance(progress, num_steps=len(starts), task_name="Reconstruct to disk")
+        LOG.info("Starting reconstruction to disk: algorithm=%s, slices=%d, slabs=%d, format=%s",
+                 recon_params.algorithm, images.height, len(starts), out_format)
+
+        def reconstruct_slab(start: int) -> ImageStack:
+            slab = self._sinogram_slab(images, start, min(start + slab_height, images.height))
+            recon = self._apply_pixel_size(reconstructor.full(slab, recon_params), recon_params)
+            progress.update(msg=f"Reconstructed slices {start} to {start + slab.height - 1}")
+            return recon
+
+        with progress:
+            recon = reconstruct_slab(0)
+            metadata = io.StringIO()
+            recon.save_metadata(metadata)
+            shape = (images.height, images.width, images.width)
+            with saver.VolumeWriter(output_dir, name_prefix, out_format, shape, recon.dtype,
+                                    metadata.getvalue()) as writer:
+                writer.write(recon)
+                del recon
+                for start in starts[1:]:
+                    writer.write(reconstruct_slab(start))
+
+        if out_format == TIFF_STACK_FORMAT:
+            # Memory mapped, so opening the volume does not need the memory it was written to avoid
+            group = FilenameGroup.from_file(writer.filenames[0])
+            group.find_all_files()
+            return loader.load(group, dtype=NATIVE_PIXEL_DEPTH)
+        return writer.filenames[0]
+
+    @staticmethod
+    def _sinogram_slab(images: ImageStack, start: int, stop: int) -> ImageStack:
+        """
+        Copy the rows from start to stop of every projection, with a geometry for that part of the detector. Compact
+        integer data is converted to float as it is copied, so the reconstructed slab is float too.
+        """
+        assert images.geometry is not None
+        projection_angles = images.projection_angles()
+        assert projection_angles is not None
+        rows = images.data[:, start:stop]
+        if images.is_compact:
+            rows = rows.astype(np.float32)
+        slab = ImageStack(rows, metadata=images.metadata)
+        slab.create_geometry(projection_angles)
+        assert slab.geometry is not None
+        slab.geometry.set_geometry_from_cor_tilt(images.geometry.get_cor_at_slice_index(start), images.geometry.tilt)
+        return slab
+
     @staticmethod
     def _apply_pixel_size(recon: ImageStack, recon_params: ReconstructionParameters, progress=None) -> ImageStack:
         if recon_params.pixel_size > 0.:
@@ -40,6 +40,7 @@ class AutoCorMethod(Enum):
 
 class Notifications(Enum):
     RECONSTRUCT_VOLUME = auto()
+    RECONSTRUCT_VOLUME_TO_DISK = auto()
     RECONSTRUCT_PREVIEW_SLICE = auto()
     RECONSTRUCT_PREVIEW_USER_CLICK = auto()
     RECONSTRUCT_STACK_SLICE = auto()
@@ -89,6 +90,8 @@ class ReconstructWindowPresenter(BasePresenter):
         try:
             if notification == Notifications.RECONSTRUCT_VOLUME:
                 self.do_reconstruct_volume()
+            elif notification == Notifications.RECONSTRUCT_VOLUME_TO_DISK:
+                self.do_reconstruct_volume_to_disk()
             elif notification == Notifications.RECONSTRUCT_PREVIEW_SLICE:
                 self.do_preview_reconstruct_slice()
             elif notification == Notifications.RECONSTRUCT_PREVIEW_USER_CLICK:
@@ -277,6 +280,32 @@ class ReconstructWindowPresenter(BasePresenter):
                               tracker=self.async_tracker,
                               cancelable=True)
 
+    def do_reconstruct_volume_to_disk(self) -> None:
+        if not self.model.has_results:
+            raise ValueError("Fit is not performed on the data, therefore the CoR cannot be found for each slice.")
+
+        if self.model.images.geometry is None:
+            self.view.show_status_message(NO_GEOMETRY_MESSAGE)
+            return
+
+        output = self.view.get_recon_to_disk_output()
+        if output is None:
+            return
+        output_dir, name_prefix, out_format = output
+
+        self.recon_is_running = True
+        self.view.set_recon_buttons_enabled(False)
+        start_async_task_view(self.view,
+                              self.model.run_full_recon_to_disk,
+                              self._on_volume_recon_to_disk_done, {
+                                  'recon_params': self.view.recon_params(),
+                                  'output_dir': output_dir,
+                                  'name_prefix': name_prefix,
+                                  'out_format': out_format
+                              },
+                              tracker=self.async_tracker,
+                              cancelable=True)
+
     def _get_reconstruct_slice(self, slice_idx: int, call_back: Callable[[TaskWorkerThread], None]) -> None:
         start_async_task_view(
             self.view,
@@ -413,6 +442,21 @@ class ReconstructWindowPresenter(BasePresenter):
         finally:
             self.view.set_recon_buttons_enabled(True)
 
+    def _on_volume_recon_to_disk_done(self, task: TaskWorkerThread) -> None:
+        self.recon_is_running = False
+        try:
+            if task.error is not None:
+                self.view.show_error_dialog(f"Encountered error while trying to reconstruct to disk: {str(task.error)}")
+            elif isinstance(task.result, ImageStack):
+                # The volume is memory mapped read-only from the file, so it is shown as written
+                assert self.model.stack_id is not None
+                task.result.name = self.create_recon_output_filename("Recon_Vol")
+                self.view.show_recon_volume(task.result, self.model.stack_id)
+            elif task.result is not None:
+                self.view.show_info_dialog(f"Reconstructed volume written to {task.result}")
+        finally:
+            self.view.set_recon_buttons_enabled(True)
+
     def do_clear_all_cors(self) -> None:
         self.view.clear_cor_table()
         self.model.reset_selected_row()
@@ -2,13 +2,20 @@
 # SPDX - License - Identifier: GPL-3.0-or-later
 from __future__ import annotations
 
+import tempfile
 import unittest
+from pathlib import Path
 
 from unittest import mock
 
+import h5py
 import numpy as np
+import numpy.testing as npt
 
 from mantidimaging.core.data import ImageStack
+from mantidimaging.core.data.geometry import GeometryType
+from mantidimaging.core.io.saver import HDF5_VOLUME_PATH
+from mantidimaging.core.io.utility import TIFF_STACK_FORMAT
 from mantidimaging.core.operation_history import const
 from mantidimaging.core.reconstruct.astra_recon import allowed_recon_kwargs as astra_allowed_kwargs
 from mantidimaging.core.reconstruct.tomopy_recon import allowed_recon_kwargs as tomopy_allowed_kwargs
@@ -117,6 +124,124 @@ class ReconWindowModelTest(unittest.TestCase):
         mock_get_reconstructor_for.assert_called_once_with(expected_recon_params.algorithm)
         assert_called_once_with(mock_reconstructor.single_sino, self.model.images, expected_idx, expected_recon_params)
 
+    def _select_compact_data(self) -> ImageStack:
+        images = ImageStack(np.full((10, 12, 16), 1000, dtype=np.uint16))
+        images.set_projection_angles(generate_angles(360, images.num_projections))
+        self.model.initial_select_data(images)
+        return images
+
+    @mock.patch('mantidimaging.gui.windows.recon.model.get_reconstructor_for')
+    def test_run_full_recon_promotes_compact_stack(self, mock_get_reconstructor_for):
+        images = self._select_compact_data()
+        input_dtypes = []
+
+        def full(recon_images, recon_params, progress):
+            input_dtypes.append(recon_images.dtype)
+            return generate_images()
+
+        mock_get_reconstructor_for.return_value.full.side_effect = full
+
+        self.model.run_full_recon(ReconstructionParameters("FBP_CUDA", "ram-lak"), mock.MagicMock())
+
+        self.assertEqual(input_dtypes, [np.float32])
+        self.assertEqual(images.dtype, np.float32)
+        npt.assert_array_equal(images.data, 1000)
+
+    @mock.patch('mantidimaging.gui.windows.recon.model.get_reconstructor_for')
+    def test_run_preview_recon_promotes_compact_stack(self, mock_get_reconstructor_for):
+        images = self._select_compact_data()
+        mock_get_reconstructor_for.return_value.single_sino.return_value = np.full((16, 16), -1.5)
+
+        recon = self.model.run_preview_recon(5, ReconstructionParameters("FBP_CUDA", "ram-lak"))
+
+        self.assertEqual(images.dtype, np.float32)
+        self.assertEqual(recon.dtype, np.float32)
+        npt.assert_array_equal(recon.data, -1.5)
+
+    @mock.patch('mantidimaging.gui.windows.recon.model.get_reconstructor_for')
+    def test_run_full_recon_to_disk_converts_compact_slabs(self, mock_get_reconstructor_for):
+        images = self._select_compact_data()
+        mock_reconstructor = mock_get_reconstructor_for.return_value
+        mock_reconstructor.full.side_effect = self._slice_numbers_recon
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            self.model.run_full_recon_to_disk(ReconstructionParameters("FBP_CUDA", "ram-lak"), Path(output_dir),
+                                              "recon", "h5")
+
+        slabs = [call.args[0] for call in mock_reconstructor.full.call_args_list]
+        self.assertTrue(all(slab.dtype == np.float32 for slab in slabs))
+        # Only the slabs are converted, not the whole stack
+        self.assertEqual(images.dtype, np.uint16)
+
+    def _select_recon_to_disk_data(self) -> ImageStack:
+        images = ImageStack(np.tile(np.arange(12, dtype=np.float32)[None, :, None], (10, 1, 16)))
+        images.set_projection_angles(generate_angles(360, images.num_projections))
+        assert images.geometry is not None
+        images.geometry.set_geometry_from_cor_tilt(ScalarCoR(7), 2.0)
+        self.model.initial_select_data(images)
+        return images
+
+    @staticmethod
+    def _slice_numbers_recon(slab: ImageStack, _) -> ImageStack:
+        # Each reconstructed slice is filled with the number of the row it came from
+        return ImageStack(np.ones((slab.height, slab.width, slab.width), dtype=np.float32) * slab.data[0, :, :1, None])
+
+    @mock.patch('mantidimaging.gui.windows.recon.model.get_reconstructor_for')
+    def test_run_full_recon_to_disk_writes_every_slab(self, mock_get_reconstructor_for):
+        images = self._select_recon_to_disk_data()
+        mock_reconstructor = mock_get_reconstructor_for.return_value
+        mock_reconstructor.full.side_effect = self._slice_numbers_recon
+        row_bytes = (10 + 16) * 16 * 4
+        progress = mock.MagicMock()
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            path = self.model.run_full_recon_to_disk(ReconstructionParameters("FBP_CUDA", "ram-lak"),
+                                                     Path(output_dir),
+                                                     "recon",
+                                                     "h5",
+                                                     progress=progress,
+                                                     slab_bytes=5 * row_bytes)
+
+            self.assertEqual(path, Path(output_dir).resolve() / "recon.h5")
+            with h5py.File(path, "r") as nexus_file:
+                volume = nexus_file[HDF5_VOLUME_PATH][:]
+        npt.assert_array_equal(volume, np.ones((12, 16, 16)) * np.arange(12)[:, None, None])
+
+        slabs = [call.args[0] for call in mock_reconstructor.full.call_args_list]
+        self.assertEqual([slab.height for slab in slabs], [5, 5, 2])
+        for start, slab in zip([0, 5, 10], slabs, strict=True):
+            self.assertAlmostEqual(slab.geometry.cor.value, images.geometry.get_cor_at_slice_index(start).value)
+            self.assertAlmostEqual(slab.geometry.tilt, images.geometry.tilt)
+        self.assertEqual(progress.update.call_count, 3)
+
+    @mock.patch('mantidimaging.gui.windows.recon.model.get_reconstructor_for')
+    def test_run_full_recon_to_disk_opens_tiff_stack_memory_mapped(self, mock_get_reconstructor_for):
+        self._select_recon_to_disk_data()
+        mock_get_reconstructor_for.return_value.full.side_effect = self._slice_numbers_recon
+        recon_params = ReconstructionParameters("FBP_CUDA", "ram-lak", pixel_size=2)
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            recon = self.model.run_full_recon_to_disk(recon_params, Path(output_dir), "recon", TIFF_STACK_FORMAT)
+
+            self.assertIsInstance(recon.data, np.memmap)
+            npt.assert_array_almost_equal(recon.data, np.ones((12, 16, 16)) * np.arange(12)[:, None, None] / 2e-4)
+            self.assertEqual(recon.pixel_size, 2)
+            del recon
+
+    def test_run_full_recon_to_disk_rejects_cone_beam(self):
+        images = self._select_recon_to_disk_data()
+        images.create_geometry(generate_angles(360, images.num_projections), GeometryType.CONE3D)
+
+        with self.assertRaisesRegex(ValueError, "parallel beam"):
+            self.model.run_full_recon_to_disk(ReconstructionParameters("FBP_CUDA", "ram-lak"), Path(), "recon", "h5")
+
+    def test_run_full_recon_to_disk_rejects_cil(self):
+        self._select_recon_to_disk_data()
+
+        with self.assertRaisesRegex(ValueError, "CIL"):
+            self.model.run_full_recon_to_disk(ReconstructionParameters("CIL: PDHG-TV", "ram-lak"), Path(), "recon",
+                                              "h5")
+
     def test_apply_pixel_size(self):
         images = generate_images()
 
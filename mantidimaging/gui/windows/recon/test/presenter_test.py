@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import unittest
+from pathlib import Path
 
 from unittest import mock
 from unittest.mock import PropertyMock
@@ -221,6 +222,63 @@ class ReconWindowPresenterTest(unittest.TestCase):
                                                 tracker=self.presenter.async_tracker,
                                                 cancelable=True)
 
+    @mock.patch('mantidimaging.gui.windows.recon.presenter.start_async_task_view')
+    def test_do_reconstruct_volume_to_disk(self, mock_async_task):
+        self.view.get_recon_to_disk_output.return_value = (Path("/output"), "recon", "h5")
+
+        self.presenter.do_reconstruct_volume_to_disk()
+
+        self.view.set_recon_buttons_enabled.assert_called_once_with(False)
+        mock_async_task.assert_called_once_with(self.view,
+                                                self.presenter.model.run_full_recon_to_disk,
+                                                self.presenter._on_volume_recon_to_disk_done, {
+                                                    'recon_params': self.view.recon_params(),
+                                                    'output_dir': Path("/output"),
+                                                    'name_prefix': "recon",
+                                                    'out_format': "h5"
+                                                },
+                                                tracker=self.presenter.async_tracker,
+                                                cancelable=True)
+
+    @mock.patch('mantidimaging.gui.windows.recon.presenter.start_async_task_view')
+    def test_do_reconstruct_volume_to_disk_cancelled(self, mock_async_task):
+        self.view.get_recon_to_disk_output.return_value = None
+
+        self.presenter.do_reconstruct_volume_to_disk()
+
+        mock_async_task.assert_not_called()
+        self.view.set_recon_buttons_enabled.assert_not_called()
+
+    def test_on_volume_recon_to_disk_done_shows_memory_mapped_volume(self):
+        task = mock.Mock()
+        task.error = None
+        task.result = ImageStack(np.ones((2, 4, 4), dtype=np.float32))
+
+        self.presenter._on_volume_recon_to_disk_done(task)
+
+        self.view.show_recon_volume.assert_called_once_with(task.result, self.presenter.model.stack_id)
+        self.view.set_recon_buttons_enabled.assert_called_once_with(True)
+
+    def test_on_volume_recon_to_disk_done_reports_written_file(self):
+        task = mock.Mock()
+        task.error = None
+        task.result = Path("/output/recon.h5")
+
+        self.presenter._on_volume_recon_to_disk_done(task)
+
+        self.view.show_recon_volume.assert_not_called()
+        self.view.show_info_dialog.assert_called_once_with(f"Reconstructed volume written to {task.result}")
+        self.view.set_recon_buttons_enabled.assert_called_once_with(True)
+
+    def test_on_volume_recon_to_disk_done_shows_error(self):
+        task = mock.Mock()
+        task.error = RuntimeError("disk full")
+
+        self.presenter._on_volume_recon_to_disk_done(task)
+
+        self.view.show_error_dialog.assert_called_once()
+        self.view.set_recon_buttons_enabled.assert_called_once_with(True)
+
     @mock.patch('mantidimaging.gui.windows.recon.presenter.CORInspectionDialogView')
     def test_do_refine_selected_cor_declined(self, mock_corview):
         self.presenter.model.last_cor = ScalarCoR(314)
@@ -3,14 +3,17 @@
 from __future__ import annotations
 
 import unittest
+from pathlib import Path
 from unittest import mock
 
 from PyQt5.QtWidgets import QWidget
 
+from mantidimaging.core.io.utility import TIFF_STACK_FORMAT
 from mantidimaging.core.net.help_pages import SECTION_USER_GUIDE
 from mantidimaging.core.utility.data_containers import ScalarCoR, Degrees, Slope
 from mantidimaging.gui.utility.qt_helpers import INPUT_DIALOG_FLAGS
 from mantidimaging.gui.windows.recon import ReconstructWindowView
+from mantidimaging.gui.windows.recon.view import RECON_TO_DISK_FILTERS
 from mantidimaging.gui.windows.recon.image_view import ReconImagesView
 from mantidimaging.gui.windows.recon.presenter import AutoCorMethod, Notifications
 from mantidimaging.test_helpers import start_qapplication
@@ -333,11 +336,24 @@ class ReconstructWindowViewTest(unittest.TestCase):
         self.view.change_refine_iterations()
         refine_iterations_button_mock.setEnabled.assert_called_once_with(False)
 
+    @mock.patch("mantidimaging.gui.windows.recon.view.QFileDialog.getSaveFileName")
+    def test_get_recon_to_disk_output(self, get_save_file_name):
+        get_save_file_name.return_value = ("/output/recon.tif", list(RECON_TO_DISK_FILTERS)[1])
+
+        self.assertEqual(self.view.get_recon_to_disk_output(), (Path("/output"), "recon", TIFF_STACK_FORMAT))
+
+    @mock.patch("mantidimaging.gui.windows.recon.view.QFileDialog.getSaveFileName")
+    def test_get_recon_to_disk_output_cancelled(self, get_save_file_name):
+        get_save_file_name.return_value = ("", "")
+
+        self.assertIsNone(self.view.get_recon_to_disk_output())
+
     def test_set_recon_buttons_enabled(self):
 
         def assert_button_state_is_correct(is_enabled):
             self.assertEqual(self.view.reconstructSliceButton.isEnabled(), is_enabled)
             self.assertEqual(self.view.reconstructVolumeButton.isEnabled(), is_enabled)
+            self.assertEqual(self.view.reconstructToDiskButton.isEnabled(), is_enabled)
 
         assert_button_state_is_correct(is_enabled=True)
 
@@ -2,15 +2,17 @@
 # SPDX - License - Identifier: GPL-3.0-or-later
 from __future__ import annotations
 from logging import getLogger
+from pathlib import Path
 from typing import TYPE_CHECKING, cast
 
 import numpy as np
 from PyQt5.QtWidgets import (QAbstractItemView, QComboBox, QDoubleSpinBox, QInputDialog, QPushButton, QSpinBox,
-                             QVBoxLayout, QWidget, QTextEdit, QLabel, QApplication, QStyle, QCheckBox)
+                             QVBoxLayout, QWidget, QTextEdit, QLabel, QApplication, QStyle, QCheckBox, QFileDialog)
 from PyQt5.QtCore import QSignalBlocker
 
 from mantidimaging.core.data import ImageStack
 from mantidimaging.core.data.geometry import GeometryType
+from mantidimaging.core.io.utility import DEFAULT_IO_FILE_FORMAT, TIFF_STACK_FORMAT
 from mantidimaging.core.reconstruct import get_reconstructor_for
 from mantidimaging.core.net.help_pages import SECTION_USER_GUIDE, open_help_webpage
 from mantidimaging.core.utility.cuda_check import CudaChecker
@@ -32,6 +34,13 @@ if TYPE_CHECKING:
 
 LOG = getLogger(__name__)
 
+# File dialog filters for reconstructing to disk, and the format each one writes
+RECON_TO_DISK_FILTERS = {
+    "TIFF series (*.tif)": DEFAULT_IO_FILE_FORMAT,
+    "TIFF stack, opened without loading into memory (*.tif)": TIFF_STACK_FORMAT,
+    "Chunked HDF5 (*.h5)": "h5",
+}
+
 
 class ReconstructWindowView(BaseMainWindowView):
 
@@ -85,6 +94,7 @@ class ReconstructWindowView(BaseMainWindowView):
 
     reconstructSliceButton: QPushButton
     reconstructVolumeButton: QPushButton
+    reconstructToDiskButton: QPushButton
 
     # ----------------
     # Preview section
@@ -196,6 +206,7 @@ class ReconstructWindowView(BaseMainWindowView):
         self.refineIterationsButton.clicked.connect(lambda: self.presenter.notify(PresN.REFINE_ITERS))
         self.calculateCorsButton.clicked.connect(lambda: self.presenter.notify(PresN.CALCULATE_CORS_FROM_MANUAL_TILT))
         self.reconstructVolumeButton.clicked.connect(lambda: self.presenter.notify(PresN.RECONSTRUCT_VOLUME))
+        self.reconstructToDiskButton.clicked.connect(lambda: self.presenter.notify(PresN.RECONSTRUCT_VOLUME_TO_DISK))
         self.reconstructSliceButton.clicked.connect(lambda: self.presenter.notify(PresN.RECONSTRUCT_STACK_SLICE))
 
         self.correlateButton.clicked.connect(lambda: self.presenter.notify(PresN.AUTO_FIND_COR_CORRELATE))
@@ -511,6 +522,19 @@ class ReconstructWindowView(BaseMainWindowView):
     def show_recon_volume(self, data: ImageStack, stack_id: UUID) -> None:
         self.main_window.add_recon_to_dataset(data, stack_id)
 
+    def get_recon_to_disk_output(self) -> tuple[Path, str, str] | None:
+        """
+        Ask where to write a reconstruction to disk, and in which format.
+
+        :return: The output directory, the name prefix and the format, or None if the user cancelled
+        """
+        path, selected_filter = QFileDialog.getSaveFileName(self, "Reconstruct to Disk", "",
+                                                            ";;".join(RECON_TO_DISK_FILTERS))
+        if not path:
+            return None
+        output_path = Path(path)
+        return output_path.parent, output_path.stem, RECON_TO_DISK_FILTERS.get(selected_filter, DEFAULT_IO_FILE_FORMAT)
+
     def hide_tilt(self) -> None:
         self.image_view.hide_cor_line()
 
@@ -581,6 +605,7 @@ class ReconstructWindowView(BaseMainWindowView):
     def set_recon_buttons_enabled(self, enabled: bool) -> None:
         self.reconstructSliceButton.setEnabled(enabled)
         self.reconstructVolumeButton.setEnabled(enabled)
+        self.reconstructToDiskButton.setEnabled(enabled)
 
     def set_max_projection_index(self, max_index: int) -> None:
         self.previewProjectionIndexSpinBox.setMaximum(max_index)
@@ -7,6 +7,7 @@ from typing import TYPE_CHECKING
 
 from PyQt5.QtCore import QSettings, QSignalBlocker
 
+from mantidimaging.core.parallel import manager as pm, utility as pu
 from mantidimaging.gui.mvp_base import BasePresenter
 from mantidimaging.helper import initialise_logging
 
@@ -95,6 +96,23 @@ class SettingsWindowPresenter(BasePresenter):
 
     def set_processes_value(self) -> None:
         settings.setValue('multiprocessing/process_count', self.view.current_processes_value)
+        self.update_thread_budget()
+
+    def set_native_threads_value(self) -> None:
+        settings.setValue('multiprocessing/native_threads', self.view.current_native_threads_value)
+        self.update_thread_budget()
+
+    def set_scratch_directory(self, directory: str) -> None:
+        settings.setValue('multiprocessing/scratch_directory', directory)
+        pu.set_scratch_directory(directory)
+
+    def update_thread_budget(self) -> None:
+        budget = pm.calculate_thread_budget(self.view.current_processes_value, self.view.current_native_threads_value)
+        text = (f"{budget.processes} processes x {budget.threads_per_process} threads "
+                f"on {budget.cpu_count} CPUs")
+        if budget.processes * budget.threads_per_process > budget.cpu_count:
+            text += " (oversubscribed)"
+        self.view.set_thread_budget_text(text)
 
     def set_log_directory(self, directory: str) -> None:
         settings = QSettings()
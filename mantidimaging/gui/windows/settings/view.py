@@ -34,6 +34,12 @@ class SettingsWindowView(BaseMainWindowView, QtStyleTools):
 
     processesLabel: QLabel
     processesSpinBox: QSpinBox
+    nativeThreadsLabel: QLabel
+    nativeThreadsSpinBox: QSpinBox
+    threadBudgetLabel: QLabel
+    scratchDirectoryLabel: QLabel
+    scratchDirectoryLineEdit: QLineEdit
+    scratchDirectoryButton: QPushButton
 
     def __init__(self, main_window: MainWindowView):
         super().__init__(None, 'gui/ui/settings_window.ui')
@@ -69,6 +75,16 @@ class SettingsWindowView(BaseMainWindowView, QtStyleTools):
         self.processesSpinBox.setMaximum(128)
         self.processesSpinBox.setValue(settings.value("multiprocessing/process_count", 8, type=int))
         self.processesSpinBox.valueChanged.connect(self.presenter.set_processes_value)
+        self.nativeThreadsSpinBox.setMinimum(0)
+        self.nativeThreadsSpinBox.setMaximum(128)
+        self.nativeThreadsSpinBox.setSpecialValueText("Automatic")
+        self.nativeThreadsSpinBox.setValue(settings.value("multiprocessing/native_threads", 0, type=int))
+        self.nativeThreadsSpinBox.valueChanged.connect(self.presenter.set_native_threads_value)
+        self.presenter.update_thread_budget()
+        self.scratchDirectoryLineEdit.setText(settings.value("multiprocessing/scratch_directory", "", type=str))
+        self.scratchDirectoryLineEdit.editingFinished.connect(
+            lambda: self.presenter.set_scratch_directory(self.scratchDirectoryLineEdit.text()))
+        self.scratchDirectoryButton.clicked.connect(self.select_scratch_directory)
 
     def _create_logging_tab(self) -> None:
         settings = QSettings()
@@ -139,6 +155,12 @@ class SettingsWindowView(BaseMainWindowView, QtStyleTools):
             self.logDirectoryLineEdit.setText(directory)
             self.presenter.set_log_directory(directory)
 
+    def select_scratch_directory(self) -> None:
+        directory = QFileDialog.getExistingDirectory(self, "Select Scratch Directory")
+        if directory:
+            self.scratchDirectoryLineEdit.setText(directory)
+            self.presenter.set_scratch_directory(directory)
+
     @property
     def current_theme(self) -> str:
         return self.themeName.currentText()
@@ -150,3 +172,10 @@ class SettingsWindowView(BaseMainWindowView, QtStyleTools):
     @property
     def current_processes_value(self) -> int:
         return self.processesSpinBox.value()
+
+    @property
+    def current_native_threads_value(self) -> int:
+        return self.nativeThreadsSpinBox.value()
+
+    def set_thread_budget_text(self, text: str) -> None:
+        self.threadBudgetLabel.setText(text)
@@ -338,7 +338,10 @@ class SpectrumViewerWindowModel:
         left, top, right, bottom = roi
         sample = self._stack.data[:, top:bottom, left:right]
         open_beam = self._normalise_stack.data[:, top:bottom, left:right]
-        safe_divide = np.divide(sample, open_beam, out=np.zeros_like(sample), where=open_beam != 0)
+        safe_divide = np.divide(sample,
+                                open_beam,
+                                out=np.zeros(sample.shape, np.result_type(sample.dtype, np.float32)),
+                                where=open_beam != 0)
         if normalise_with_shuttercount:
             average_shuttercount = self.get_shuttercount_normalised_correction_parameter()
             safe_divide = safe_divide / average_shuttercount
@@ -16,6 +16,7 @@ from PyQt5 import QtCore
 from PyQt5.QtGui import QGuiApplication, QFont, QFontInfo
 
 import mantidimaging.core.parallel.manager as pm
+import mantidimaging.core.parallel.utility as pu
 
 from mantidimaging import helper as h
 from mantidimaging.core.utility.command_line_arguments import CommandLineArguments
@@ -114,11 +115,20 @@ def main() -> None:
 
     h.initialise_logging(args.log_level)
     process_count = settings.value("multiprocessing/process_count", 8, type=int)
+    native_threads = settings.value("multiprocessing/native_threads", 0, type=int)
+    pool_idle_timeout = settings.value("multiprocessing/pool_idle_timeout", pm.DEFAULT_IDLE_TIMEOUT, type=float)
+    prewarm_pool = settings.value("multiprocessing/prewarm_pool", False, type=bool)
+    pu.arena.max_retained_bytes = settings.value(
+        "multiprocessing/arena_max_retained_mb", pu.DEFAULT_ARENA_RETAINED_BYTES // 1024**2, type=int) * 1024**2
+    pu.set_scratch_directory(settings.value("multiprocessing/scratch_directory", "", type=str))
     settings.setValue("app/last_shutdown_clean", False)
 
     from mantidimaging import gui
     try:
-        pm.create_and_start_pool(process_count)
+        # The pool is started when first needed, as many sessions never run a parallel operation
+        pm.configure_pool(process_count, native_threads, pool_idle_timeout)
+        if prewarm_pool:
+            pm.prewarm_pool()
         gui.execute()
         result = q_application.exec_()
         settings.setValue("app/last_shutdown_clean", True)